@@ -0,0 +1,48 @@
+"""add composite indexes for exports, listings and ownership checks
+
+Existing deployments created their tables with Base.metadata.create_all(),
+so this first revision assumes the baseline schema is already present and
+only adds the indexes. Fresh databases get the same indexes from the
+models and should simply be stamped (`alembic stamp 0001`).
+
+Indexes are built CONCURRENTLY so trial uploads keep writing while the
+migration runs on a populated database.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_reaction_trials_session_id_trial_number", "reaction_trials", ("session_id", "trial_number")),
+    ("ix_tympani_readings_session_id_reading_number", "tympani_readings", ("session_id", "reading_number")),
+    ("ix_vital_readings_session_id_reading_number", "vital_readings", ("session_id", "reading_number")),
+    ("ix_sessions_operator_id_created_at", "sessions", ("operator_id", "created_at")),
+    ("ix_sessions_operator_id_status", "sessions", ("operator_id", "status")),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} ({', '.join(columns)})"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _columns in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
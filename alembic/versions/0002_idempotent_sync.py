@@ -0,0 +1,101 @@
+"""make trial and reading uploads idempotent
+
+Turns the (session_id, trial/reading number) indexes from 0001 into unique
+indexes so re-sent items are skipped with ON CONFLICT DO NOTHING, and adds
+the sync_batches ledger that answers retried batches by batch_id.
+
+Rows duplicated by earlier client retries are removed first (the earliest
+copy is kept) and sessions.trials_completed is lowered by the number of
+duplicate trials dropped, since each retry had counted them again.
+Fresh databases created from the models should be stamped with `head`.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (old index, unique index, table, number column)
+INDEXES = [
+    ("ix_reaction_trials_session_id_trial_number", "uq_reaction_trials_session_id_trial_number",
+     "reaction_trials", "trial_number"),
+    ("ix_tympani_readings_session_id_reading_number", "uq_tympani_readings_session_id_reading_number",
+     "tympani_readings", "reading_number"),
+    ("ix_vital_readings_session_id_reading_number", "uq_vital_readings_session_id_reading_number",
+     "vital_readings", "reading_number"),
+]
+
+DUPLICATES_SQL = """
+    SELECT id, session_id FROM (
+        SELECT id, session_id,
+               row_number() OVER (
+                   PARTITION BY session_id, {number}
+                   ORDER BY created_at, id
+               ) AS copy
+        FROM {table}
+    ) numbered
+    WHERE copy > 1
+"""
+
+
+def upgrade() -> None:
+    op.execute(f"""
+        WITH removed AS (
+            DELETE FROM reaction_trials
+            WHERE id IN (SELECT id FROM ({DUPLICATES_SQL.format(table='reaction_trials', number='trial_number')}) d)
+            RETURNING session_id
+        ), per_session AS (
+            SELECT session_id, count(*) AS removed FROM removed GROUP BY session_id
+        )
+        UPDATE sessions
+        SET trials_completed = GREATEST(sessions.trials_completed - per_session.removed, 0)
+        FROM per_session
+        WHERE sessions.id = per_session.session_id
+    """)
+    for _old, _unique, table, number in INDEXES[1:]:
+        op.execute(f"""
+            DELETE FROM {table}
+            WHERE id IN (SELECT id FROM ({DUPLICATES_SQL.format(table=table, number=number)}) d)
+        """)
+
+    op.create_table(
+        'sync_batches',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sessions.id'), nullable=False),
+        sa.Column('stream', sa.String(30), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('recorded', sa.Integer(), nullable=False),
+        sa.Column('duplicates', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    # Commit the cleanup before building the unique indexes concurrently
+    with op.get_context().autocommit_block():
+        for old, unique, table, number in INDEXES:
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {unique} "
+                f"ON {table} (session_id, {number})"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for old, unique, table, number in reversed(INDEXES):
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {old} "
+                f"ON {table} (session_id, {number})"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {unique}")
+
+    op.drop_table('sync_batches')
@@ -0,0 +1,52 @@
+"""add (created_at, id) keyset indexes for cursor-paginated listings
+
+Session, respondent and operator listings page by the (created_at, id)
+key of the last row seen. Each listing gets an index on its owner column
+followed by that key, so any page is a short index range scan. The
+sessions index replaces ix_sessions_operator_id_created_at, which it
+covers for the date-range exports too.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_sessions_operator_id_created_at_id", "sessions", ("operator_id", "created_at", "id")),
+    ("ix_respondents_created_by_created_at_id", "respondents", ("created_by", "created_at", "id")),
+    ("ix_users_created_by_created_at_id", "users", ("created_by", "created_at", "id")),
+]
+
+REPLACED = ("ix_sessions_operator_id_created_at", "sessions", ("operator_id", "created_at"))
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} ({', '.join(columns)})"
+            )
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {REPLACED[0]}")
+
+
+def downgrade() -> None:
+    name, table, columns = REPLACED
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON {table} ({', '.join(columns)})"
+        )
+        for name, _table, _columns in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,57 @@
+"""add trigram and university-prefix indexes for respondent search
+
+Respondent search matched guest_name with ILIKE '%term%', a sequential scan
+over every respondent an operator created, on each keystroke. A pg_trgm GIN
+index serves both that substring match and similarity (typo) matching, and
+an expression index on lower(university) with text_pattern_ops serves the
+university prefix match.
+
+The trigram index needs the pg_trgm contrib extension (shipped with the
+postgres images); where it can't be created the migration skips that index
+and search falls back to a plain ILIKE.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        EXCEPTION WHEN undefined_file OR feature_not_supported OR undefined_object OR insufficient_privilege THEN
+            RAISE NOTICE 'pg_trgm unavailable, respondent search will not use a trigram index';
+        END
+        $$
+    """)
+    with op.get_context().autocommit_block():
+        has_trgm = op.get_bind().execute(
+            sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).scalar() is not None
+        if has_trgm:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_respondents_guest_name_trgm "
+                "ON respondents USING gin (guest_name gin_trgm_ops)"
+            )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_respondents_created_by_lower_university "
+            "ON respondents (created_by, lower(university) text_pattern_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_respondents_created_by_lower_university")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_respondents_guest_name_trgm")
@@ -0,0 +1,137 @@
+"""partition tympani_readings and vital_readings by month of reading_time
+
+Each table is rebuilt as a RANGE-partitioned table with monthly partitions
+(see app/database/partitions.py) and the rows are copied across. Unique
+keys on a partitioned table must contain the partition key, so the primary
+key becomes (id, reading_time) and the idempotency index becomes
+(session_id, reading_number, reading_time). Readings without a
+reading_time take their created_at.
+
+sessions.readings_first_at / readings_last_at record each session's
+reading_time range so reading queries can prune to the partitions that
+hold it; they are backfilled here.
+
+The copy holds ACCESS EXCLUSIVE locks on both reading tables; run it in a
+maintenance window.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.config import settings
+from app.database.partitions import create_partitions, month_start
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+# table -> its columns besides id, session_id, reading_time and created_at
+# (a function, since a Column can only belong to one Table)
+TABLES = {
+    "tympani_readings": lambda: [
+        sa.Column('temperature', sa.DECIMAL(4, 2), nullable=False),
+        sa.Column('reading_number', sa.Integer(), nullable=False),
+        sa.Column('measurement_phase', sa.String(50)),
+        sa.Column('body_position', sa.String(50)),
+        sa.Column('environment_temp', sa.DECIMAL(4, 1)),
+    ],
+    "vital_readings": lambda: [
+        sa.Column('heart_rate', sa.Integer()),
+        sa.Column('heart_rate_variability', sa.DECIMAL(5, 2)),
+        sa.Column('spo2', sa.Integer()),
+        sa.Column('reading_number', sa.Integer(), nullable=False),
+        sa.Column('measurement_phase', sa.String(50)),
+        sa.Column('activity_context', sa.String(50)),
+        sa.Column('body_position', sa.String(50)),
+    ],
+}
+
+
+def _create_table(table, partitioned):
+    columns = [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sessions.id'), nullable=False),
+        *TABLES[table](),
+        sa.Column('reading_time', sa.DateTime(timezone=True), server_default=sa.func.now(),
+                  nullable=not partitioned),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ]
+    if partitioned:
+        op.create_table(
+            table, *columns,
+            sa.PrimaryKeyConstraint('id', 'reading_time', name=f'{table}_pkey'),
+            postgresql_partition_by='RANGE (reading_time)'
+        )
+        op.create_index(f'uq_{table}_session_id_reading_number', table,
+                        ['session_id', 'reading_number', 'reading_time'], unique=True)
+    else:
+        op.create_table(table, *columns, sa.PrimaryKeyConstraint('id', name=f'{table}_pkey'))
+        op.create_index(f'uq_{table}_session_id_reading_number', table,
+                        ['session_id', 'reading_number'], unique=True)
+
+
+def _set_aside(table):
+    op.rename_table(table, f'{table}_old')
+    op.execute(f'ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey')
+    op.execute(f'ALTER INDEX uq_{table}_session_id_reading_number RENAME TO uq_{table}_old_session_id_reading_number')
+
+
+def upgrade() -> None:
+    op.add_column('sessions', sa.Column('readings_first_at', sa.DateTime(timezone=True)))
+    op.add_column('sessions', sa.Column('readings_last_at', sa.DateTime(timezone=True)))
+
+    conn = op.get_bind()
+    today = datetime.now(timezone.utc).date()
+    for table, columns in TABLES.items():
+        names = ', '.join(['id', 'session_id', *[column.name for column in columns()], 'reading_time', 'created_at'])
+        _set_aside(table)
+        _create_table(table, partitioned=True)
+
+        oldest = conn.execute(sa.text(
+            f"SELECT min(coalesce(reading_time, created_at)) FROM {table}_old"
+        )).scalar()
+        first = month_start((oldest or datetime.now(timezone.utc)).astimezone(timezone.utc).date())
+        create_partitions(conn, first, month_start(today, settings.READINGS_PARTITION_MONTHS_AHEAD), [table])
+
+        op.execute(f"""
+            INSERT INTO {table} ({names})
+            SELECT {names.replace('reading_time', 'coalesce(reading_time, created_at, now())')}
+            FROM {table}_old
+        """)
+        op.drop_table(f'{table}_old')
+
+    op.execute("""
+        UPDATE sessions
+        SET readings_first_at = bounds.first_at, readings_last_at = bounds.last_at
+        FROM (
+            SELECT session_id, min(reading_time) AS first_at, max(reading_time) AS last_at
+            FROM (
+                SELECT session_id, reading_time FROM tympani_readings
+                UNION ALL
+                SELECT session_id, reading_time FROM vital_readings
+            ) readings
+            GROUP BY session_id
+        ) bounds
+        WHERE sessions.id = bounds.session_id
+    """)
+
+
+def downgrade() -> None:
+    for table, columns in TABLES.items():
+        names = ', '.join(['id', 'session_id', *[column.name for column in columns()], 'reading_time', 'created_at'])
+        _set_aside(table)
+        _create_table(table, partitioned=False)
+        op.execute(f"INSERT INTO {table} ({names}) SELECT {names} FROM {table}_old")
+        # Dropping the parent drops every partition with it
+        op.drop_table(f'{table}_old')
+
+    op.drop_column('sessions', 'readings_last_at')
+    op.drop_column('sessions', 'readings_first_at')
@@ -0,0 +1,59 @@
+"""add session_stimulus_stats running reaction-time aggregates
+
+One row per (session, stimulus_type, stimulus_category), merged with each
+ingested trial batch (see app/services/stimulus_stats.py). Backfilled from
+reaction_trials here; `python -m app.services.stimulus_stats` verifies and
+rebuilds them later.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'session_stimulus_stats',
+        sa.Column('session_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('sessions.id'), primary_key=True),
+        sa.Column('stimulus_type', postgresql.ENUM(name='stimulustype', create_type=False), primary_key=True),
+        sa.Column('stimulus_category', postgresql.ENUM(name='stimuluscategory', create_type=False), primary_key=True),
+        sa.Column('trial_count', sa.Integer(), nullable=False),
+        sa.Column('mean_response_time', sa.Float(), nullable=False),
+        sa.Column('m2', sa.Float(), nullable=False),
+        sa.Column('min_response_time', sa.Integer(), nullable=False),
+        sa.Column('max_response_time', sa.Integer(), nullable=False),
+        sa.Column('correct', sa.Integer(), nullable=False),
+        sa.Column('incorrect', sa.Integer(), nullable=False),
+        sa.Column('timeout', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+    op.execute("""
+        INSERT INTO session_stimulus_stats (
+            session_id, stimulus_type, stimulus_category, trial_count, mean_response_time, m2,
+            min_response_time, max_response_time, correct, incorrect, timeout
+        )
+        SELECT session_id, stimulus_type, stimulus_category, count(*),
+               avg(response_time)::float8, (var_pop(response_time) * count(*))::float8,
+               min(response_time), max(response_time),
+               count(*) FILTER (WHERE reaction_type = 'correct'),
+               count(*) FILTER (WHERE reaction_type = 'incorrect'),
+               count(*) FILTER (WHERE reaction_type = 'timeout')
+        FROM reaction_trials
+        GROUP BY session_id, stimulus_type, stimulus_category
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('session_stimulus_stats')
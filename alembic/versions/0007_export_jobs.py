@@ -0,0 +1,52 @@
+"""add export_jobs for background admin exports
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+KINDS = ('RAW_DATA_ZIP', 'SESSIONS_PARQUET', 'SESSIONS_ARROW')
+STATUSES = ('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', 'EXPIRED')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'export_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('requested_by', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('kind', sa.Enum(*KINDS, name='exportjobkind'), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('params_hash', sa.String(64), nullable=False),
+        sa.Column('status', sa.Enum(*STATUSES, name='exportjobstatus'), nullable=False),
+        sa.Column('rows_processed', sa.Integer(), nullable=False),
+        sa.Column('rows_total', sa.Integer()),
+        sa.Column('file_path', sa.String(500)),
+        sa.Column('file_size', sa.BigInteger()),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime(timezone=True)),
+        sa.Column('finished_at', sa.DateTime(timezone=True)),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'uq_export_jobs_active', 'export_jobs', ['requested_by', 'params_hash'], unique=True,
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_export_jobs_active', table_name='export_jobs')
+    op.drop_table('export_jobs')
+    sa.Enum(name='exportjobstatus').drop(op.get_bind())
+    sa.Enum(name='exportjobkind').drop(op.get_bind())
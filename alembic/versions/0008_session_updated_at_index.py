@@ -0,0 +1,36 @@
+"""add (operator_id, updated_at) index for conditional session listings
+
+GET /mobile/sessions derives its ETag from the operator's session count
+and latest updated_at, and updated_since filters on updated_at. Both read
+this index instead of the operator's session rows.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+INDEX = ("ix_sessions_operator_id_updated_at", "sessions", ("operator_id", "updated_at"))
+
+
+def upgrade() -> None:
+    name, table, columns = INDEX
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+            f"ON {table} ({', '.join(columns)})"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX[0]}")
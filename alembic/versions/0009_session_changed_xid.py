@@ -0,0 +1,49 @@
+"""stamp sessions with the id of the transaction that last wrote them
+
+GET /mobile/sessions built its ETag from max(updated_at) and filtered
+updated_since on updated_at. updated_at is now(), the transaction's start:
+a trial batch that began before another change but committed after a poll
+left max(updated_at) unchanged (a stale 304) and fell below the client's
+watermark for good. changed_xid (pg_current_xact_id()) is compared with the
+snapshot a listing was read at instead, and the ETag sums it.
+
+Existing rows are stamped with this migration's transaction.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+
+
+def upgrade() -> None:
+    op.add_column("sessions", sa.Column("changed_xid", sa.BigInteger(), nullable=True))
+    op.execute(f"UPDATE sessions SET changed_xid = {CURRENT_XID}")
+    op.alter_column("sessions", "changed_xid", nullable=False, server_default=sa.text(CURRENT_XID))
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sessions_operator_id_changed_xid "
+            "ON sessions (operator_id, changed_xid)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sessions_operator_id_updated_at")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sessions_operator_id_updated_at "
+            "ON sessions (operator_id, updated_at)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sessions_operator_id_changed_xid")
+    op.drop_column("sessions", "changed_xid")
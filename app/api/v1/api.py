@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, admin, sessions, respondents, trials, export
+from app.api.v1 import websocket
+from app.api.v1.endpoints import auth, admin, sessions, respondents, trials, export, export_jobs, metrics
 
 api_router = APIRouter()
 
@@ -14,6 +15,13 @@ api_router.include_router(trials.router, prefix="/mobile", tags=["trials"])
 # Admin web endpoints
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 api_router.include_router(export.router, prefix="/admin", tags=["export"])
+api_router.include_router(export_jobs.router, prefix="/admin", tags=["export-jobs"])
 
 # Common endpoints (both mobile and web)
-api_router.include_router(export.router, prefix="/export", tags=["export"])
\ No newline at end of file
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+
+# Live session channel (admin dashboards and operators)
+api_router.include_router(websocket.router, tags=["live"])
+
+# Operational endpoints
+api_router.include_router(metrics.router, prefix="/internal", tags=["metrics"])
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.database.database import get_db
-from app.core.auth import require_admin, require_web_platform, get_current_user, get_password_hash
+from app.database.database import get_async_db, get_read_db
+from app.core.auth import require_admin, require_web_platform, async_get_password_hash, principal_cache
+from app.core.principal_cache import Principal
+from app.core.pagination import NEXT_CURSOR_HEADER, paginate, split_page
 from app.schemas.users import UserCreate, UserResponse, UserRegisterResponse, UserStatusUpdate
 from app.database.models import User, UserRole, UserStatus, UserRegistrationLog
 from app.api.v1.endpoints.auth import generate_temporary_password
@@ -14,14 +17,15 @@ router = APIRouter()
 @router.post("/users/register", response_model=UserRegisterResponse)
 async def register_operator(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-    admin: User = Depends(require_admin),
-    platform_check: User = Depends(require_web_platform)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
 ):
     # Check if username or email already exists
-    existing_user = db.query(User).filter(
+    result = await db.execute(select(User).where(
         (User.username == user_data.username) | (User.email == user_data.email)
-    ).first()
+    ))
+    existing_user = result.scalars().first()
     
     if existing_user:
         raise HTTPException(
@@ -36,7 +40,7 @@ async def register_operator(
     user = User(
         username=user_data.username,
         email=user_data.email,
-        password_hash=get_password_hash(temporary_password),
+        password_hash=await async_get_password_hash(temporary_password),
         full_name=user_data.full_name,
         university=user_data.university,
         role=user_data.role,
@@ -47,8 +51,8 @@ async def register_operator(
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     # Log the registration
     log = UserRegistrationLog(
@@ -59,7 +63,7 @@ async def register_operator(
         ip_address="127.0.0.1"
     )
     db.add(log)
-    db.commit()
+    await db.commit()
     
     return UserRegisterResponse(
         id=str(user.id),  # Convert UUID to string
@@ -73,20 +77,25 @@ async def register_operator(
 
 @router.get("/users", response_model=List[UserResponse])
 async def get_managed_operators(
-    db: Session = Depends(get_db),
-    admin: User = Depends(require_admin),
-    platform_check: User = Depends(require_web_platform),
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform),
     status_filter: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100)
 ):
     # Get operators managed by this admin
-    query = db.query(User).filter(User.created_by == admin.id, User.role == UserRole.OPERATOR)
+    query = select(User).where(User.created_by == admin.id, User.role == UserRole.OPERATOR)
     
     if status_filter:
-        query = query.filter(User.status == UserStatus(status_filter))
+        query = query.where(User.status == UserStatus(status_filter))
     
-    users = query.offset((page - 1) * limit).limit(limit).all()
+    result = await db.execute(paginate(query, User, cursor, limit, page))
+    users, next_cursor = split_page(result.scalars().all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     # Convert to response models
     return [UserResponse(
@@ -106,16 +115,17 @@ async def get_managed_operators(
 async def update_operator_status(
     user_id: str,
     status_data: UserStatusUpdate,
-    db: Session = Depends(get_db),
-    admin: User = Depends(require_admin),
-    platform_check: User = Depends(require_web_platform)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
 ):
     # Check if operator exists and is managed by this admin
-    operator = db.query(User).filter(
+    result = await db.execute(select(User).where(
         User.id == uuid.UUID(user_id),
         User.created_by == admin.id,
         User.role == UserRole.OPERATOR
-    ).first()
+    ))
+    operator = result.scalars().first()
     
     if not operator:
         raise HTTPException(
@@ -136,22 +146,25 @@ async def update_operator_status(
         ip_address="127.0.0.1"
     )
     db.add(log)
-    db.commit()
+    await db.commit()
+    # Suspensions must take effect on the operator's next request
+    principal_cache.invalidate(operator.id)
     
     return {"success": True, "message": f"Operator status updated to {status_data.status}"}
 
 @router.post("/users/{user_id}/reset-password")
 async def reset_operator_password(
     user_id: str,
-    db: Session = Depends(get_db),
-    admin: User = Depends(require_admin),
-    platform_check: User = Depends(require_web_platform)
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
 ):
-    operator = db.query(User).filter(
+    result = await db.execute(select(User).where(
         User.id == uuid.UUID(user_id),
         User.created_by == admin.id,
         User.role == UserRole.OPERATOR
-    ).first()
+    ))
+    operator = result.scalars().first()
     
     if not operator:
         raise HTTPException(
@@ -161,7 +174,7 @@ async def reset_operator_password(
     
     # Generate new temporary password
     temporary_password = generate_temporary_password()
-    operator.password_hash = get_password_hash(temporary_password)
+    operator.password_hash = await async_get_password_hash(temporary_password)
     operator.initial_password = True
     operator.updated_at = datetime.utcnow()
     
@@ -174,7 +187,8 @@ async def reset_operator_password(
         ip_address="127.0.0.1"
     )
     db.add(log)
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(operator.id)
     
     return {
         "success": True,
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.core.auth import authenticate_user, create_access_token, get_password_hash, verify_password, get_current_user
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_async_db
+from app.core.auth import authenticate_user, create_access_token, async_get_password_hash, async_verify_password, get_current_user, principal_cache
 from app.schemas.auth import LoginRequest, Token, ChangePasswordRequest
 from app.schemas.users import UserResponse
-from app.database.models import User
+from app.database.models import User, UserStatus, UserRegistrationLog
 from datetime import timedelta
 import secrets
 import string
@@ -15,8 +16,8 @@ router = APIRouter()
 security = HTTPBearer()
 
 @router.post("/login", response_model=Token)
-async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db, login_data.username, login_data.password, login_data.platform)
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, login_data.username, login_data.password, login_data.platform)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,16 +41,17 @@ async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 @router.post("/change-password-initial")
 async def change_password_initial(
     password_data: ChangePasswordRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change password for first-time login (without requiring authentication)
     """
     # Find user by temporary password
-    user = db.query(User).filter(
+    result = await db.execute(select(User).where(
         User.initial_password == True,
         User.status.in_([UserStatus.ACTIVE, UserStatus.PENDING])
-    ).first()
+    ))
+    user = result.scalars().first()
     
     if not user:
         raise HTTPException(
@@ -58,14 +60,14 @@ async def change_password_initial(
         )
     
     # Verify temporary password
-    if not verify_password(password_data.temporary_password, user.password_hash):
+    if not await async_verify_password(password_data.temporary_password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid temporary password"
         )
     
     # Update password
-    user.password_hash = get_password_hash(password_data.new_password)
+    user.password_hash = await async_get_password_hash(password_data.new_password)
     user.initial_password = False
     user.status = UserStatus.ACTIVE  # Aktifkan user setelah ganti password
     
@@ -78,7 +80,8 @@ async def change_password_initial(
         ip_address="127.0.0.1"
     )
     db.add(log)
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(user.id)
     
     # Generate new token after password change
     access_token_expires = timedelta(minutes=60 * 24)
@@ -96,7 +99,7 @@ async def change_password_initial(
 @router.post("/change-password")
 async def change_password(
     password_data: ChangePasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -104,23 +107,24 @@ async def change_password(
     """
     # For initial password change, verify the temporary password
     if current_user.initial_password:
-        if not verify_password(password_data.temporary_password, current_user.password_hash):
+        if not await async_verify_password(password_data.temporary_password, current_user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid temporary password"
             )
     else:
         # For regular password change, verify current password
-        if not verify_password(password_data.temporary_password, current_user.password_hash):
+        if not await async_verify_password(password_data.temporary_password, current_user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid current password"
             )
     
     # Update password
-    current_user.password_hash = get_password_hash(password_data.new_password)
+    current_user.password_hash = await async_get_password_hash(password_data.new_password)
     current_user.initial_password = False
-    db.commit()
+    await db.commit()
+    principal_cache.invalidate(current_user.id)
     
     # Generate new token
     access_token_expires = timedelta(minutes=60 * 24)
@@ -1,25 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload
+from typing import AsyncIterator, Callable, List, Optional, Union
 import csv
 import io
-from datetime import datetime, date
-from app.database.database import get_db
-from app.core.auth import get_current_user, require_admin, require_web_platform
-from app.database.models import Session, ReactionTrial, TympaniReading, VitalReading, User
+from datetime import date
+from app.database.database import get_read_db
+from app.core.auth import get_current_principal, require_admin, require_web_platform
+from app.core.conditional import etag_matches
+from app.core.principal_cache import Principal
+from app.core.ranges import ranged_file_response
+from app.database.models import Session, User
+from app.schemas.export import OperatorPerformance
+from app.services.export_cache import cache_key, cacheable, export_cache, validators
+from app.services.export_service import COLUMNAR_MEDIA_TYPES, ColumnarFormat, ExportService
 import uuid
 
 router = APIRouter()
 
-@router.get("/sessions/{session_id}/export.csv")
-async def export_session_data(
-    session_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    # Verify session access
-    session = db.query(Session).filter(Session.id == uuid.UUID(session_id)).first()
+async def _exportable_session(db: AsyncSession, session_id: str, current_user: Principal) -> Session:
+    """The session, if the user may export it: its operator or the operator's admin"""
+    result = await db.execute(
+        select(Session).options(joinedload(Session.operator)).where(Session.id == uuid.UUID(session_id))
+    )
+    session = result.scalars().first()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
@@ -30,89 +36,109 @@ async def export_session_data(
     else:
         if session.operator_id != current_user.id:
             raise HTTPException(status_code=403, detail="Access denied")
+    return session
+
+def _session_export_response(
+    request: Request,
+    session: Session,
+    extension: str,
+    media_type: str,
+    filename: str,
+    chunks: Callable[[], AsyncIterator[Union[str, bytes]]]
+) -> Response:
+    """Stream the export; a completed session's is cached and revalidated by ETag.
+
+    A repeat download of an unchanged completed session is a 304 or the
+    cached file, without touching its rows again.
+    """
+    if not cacheable(session):
+        return StreamingResponse(
+            chunks(),
+            media_type=media_type,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+    
+    key = cache_key(session, extension)
+    headers = validators(key, session)
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    path = export_cache.get(key, extension)
+    if path is not None:
+        return ranged_file_response(path, media_type, filename, request.headers.get("range"), headers=headers)
+    return StreamingResponse(
+        export_cache.fill(key, extension, chunks()),
+        media_type=media_type,
+        headers={**headers, "Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/sessions/{session_id}/export.csv")
+async def export_session_data(
+    session_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    session = await _exportable_session(db, session_id, current_user)
     
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header based on session type
-    if session.test_type == "reaction_time":
-        writer.writerow(["Trial Number", "Stimulus Type", "Stimulus Category", "Response Time (ms)", "Reaction Type", "Timestamp"])
-        
-        trials = db.query(ReactionTrial).filter(ReactionTrial.session_id == session.id).order_by(ReactionTrial.trial_number).all()
-        for trial in trials:
-            writer.writerow([
-                trial.trial_number,
-                trial.stimulus_type,
-                trial.stimulus_category,
-                trial.response_time,
-                trial.reaction_type,
-                trial.created_at.isoformat()
-            ])
-    
-    elif session.test_type == "tympanic":
-        writer.writerow(["Reading Number", "Temperature (°C)", "Measurement Phase", "Body Position", "Environment Temp", "Timestamp"])
-        
-        readings = db.query(TympaniReading).filter(TympaniReading.session_id == session.id).order_by(TympaniReading.reading_number).all()
-        for reading in readings:
-            writer.writerow([
-                reading.reading_number,
-                float(reading.temperature),
-                reading.measurement_phase,
-                reading.body_position,
-                float(reading.environment_temp) if reading.environment_temp else "",
-                reading.reading_time.isoformat()
-            ])
-    
-    elif session.test_type == "vitals":
-        writer.writerow(["Reading Number", "Heart Rate (BPM)", "HRV", "SpO2 (%)", "Measurement Phase", "Activity Context", "Body Position", "Timestamp"])
-        
-        readings = db.query(VitalReading).filter(VitalReading.session_id == session.id).order_by(VitalReading.reading_number).all()
-        for reading in readings:
-            writer.writerow([
-                reading.reading_number,
-                reading.heart_rate,
-                float(reading.heart_rate_variability) if reading.heart_rate_variability else "",
-                reading.spo2,
-                reading.measurement_phase,
-                reading.activity_context,
-                reading.body_position,
-                reading.reading_time.isoformat()
-            ])
+    # Stream rows straight from a server-side cursor instead of building the CSV in memory
+    export_service = ExportService(db)
+    filename = export_service.session_export_filename(session, "csv")
     
-    output.seek(0)
+    return _session_export_response(
+        request, session, "csv", "text/csv", filename,
+        lambda: export_service.stream_session_csv(session)
+    )
+
+@router.get("/sessions/{session_id}/export.{file_format}")
+async def export_session_data_columnar(
+    session_id: str,
+    file_format: ColumnarFormat,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """Typed raw data as Parquet or Arrow IPC, one row group per server-side fetch"""
+    session = await _exportable_session(db, session_id, current_user)
     
-    filename = f"{session.session_code}_{session.test_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    export_service = ExportService(db)
+    if not export_service.has_raw_data(session):
+        raise HTTPException(status_code=400, detail="Combined sessions have no single raw-data table")
+    filename = export_service.session_export_filename(session, file_format.value)
     
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    return _session_export_response(
+        request, session, file_format.value, COLUMNAR_MEDIA_TYPES[file_format], filename,
+        lambda: export_service.stream_session_columnar(session, file_format)
     )
 
-@router.get("/admin/export/sessions.csv")
+@router.get("/export/sessions.csv")
 async def export_sessions_data(
     start_date: date = Query(...),
     end_date: date = Query(...),
     operator_id: Optional[str] = Query(None),
     test_type: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    admin: User = Depends(require_admin),
-    platform_check: User = Depends(require_web_platform)
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
 ):
     # Build query for sessions managed by this admin
-    query = db.query(Session).join(User).filter(User.created_by == admin.id)
+    # Operator and respondent names come from the same round trip, not two lazy loads per row
+    query = select(Session).join(User, Session.operator_id == User.id).options(
+        contains_eager(Session.operator),
+        joinedload(Session.respondent)
+    ).where(User.created_by == admin.id)
     
     # Apply filters
-    query = query.filter(Session.created_at >= start_date, Session.created_at <= end_date)
+    query = query.where(Session.created_at >= start_date, Session.created_at <= end_date)
     
     if operator_id:
-        query = query.filter(Session.operator_id == uuid.UUID(operator_id))
+        query = query.where(Session.operator_id == uuid.UUID(operator_id))
     
     if test_type:
-        query = query.filter(Session.test_type == test_type)
+        query = query.where(Session.test_type == test_type)
     
-    sessions = query.order_by(Session.created_at).all()
+    result = await db.execute(query.order_by(Session.created_at))
+    sessions = result.scalars().all()
     
     # Create CSV
     output = io.StringIO()
@@ -140,4 +166,84 @@ async def export_sessions_data(
         iter([output.getvalue()]),
         media_type="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
\ No newline at end of file
+    )
+
+@router.get("/export/raw-data.zip")
+async def export_sessions_raw_data(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    operator_id: Optional[str] = Query(None),
+    test_type: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    """Raw trials/readings of every matching session in one streamed ZIP"""
+    chunks = ExportService(db).stream_sessions_zip(
+        admin.id,
+        start_date,
+        end_date,
+        operator_id=uuid.UUID(operator_id) if operator_id else None,
+        test_type=test_type
+    )
+    filename = f"raw_data_{start_date}_{end_date}.zip"
+    
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/export/sessions.{file_format}")
+async def export_sessions_data_columnar(
+    file_format: ColumnarFormat,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    operator_id: Optional[str] = Query(None),
+    test_type: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    """Session metadata of a date range as Parquet or Arrow IPC"""
+    chunks = ExportService(db).stream_sessions_columnar(
+        admin.id,
+        start_date,
+        end_date,
+        file_format,
+        operator_id=uuid.UUID(operator_id) if operator_id else None,
+        test_type=test_type
+    )
+    filename = f"sessions_export_{start_date}_{end_date}.{file_format.value}"
+    
+    return StreamingResponse(
+        chunks,
+        media_type=COLUMNAR_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/reports/operator-performance.csv")
+async def export_operator_performance(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    csv_content, filename = await ExportService(db).export_operator_performance(admin.id, start_date, end_date)
+    
+    return StreamingResponse(
+        iter([csv_content]),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@router.get("/reports/operator-performance", response_model=List[OperatorPerformance])
+async def get_operator_performance(
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    db: AsyncSession = Depends(get_read_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    return await ExportService(db).operator_performance(admin.id, start_date, end_date)
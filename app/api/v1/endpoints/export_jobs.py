@@ -0,0 +1,106 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database.database import get_async_db
+from app.core.auth import require_admin, require_web_platform
+from app.core.principal_cache import Principal
+from app.core.ranges import ranged_file_response
+from app.database.models import ExportJob, ExportJobStatus
+from app.schemas.export import ExportJobCreate, ExportJobResponse
+from app.services.export_jobs import (
+    MEDIA_TYPES, ExportJobService, export_filename, export_job_runner, job_params, retention_cutoff
+)
+import os
+import uuid
+
+router = APIRouter()
+
+def _job_response(job: ExportJob) -> ExportJobResponse:
+    progress = None
+    if job.status == ExportJobStatus.COMPLETED:
+        progress = 1.0
+    elif job.rows_total:
+        progress = min(job.rows_processed / job.rows_total, 1.0)
+    return ExportJobResponse(
+        id=str(job.id),
+        kind=job.kind.value,
+        status=job.status.value,
+        rows_processed=job.rows_processed,
+        rows_total=job.rows_total,
+        progress=progress,
+        file_size=job.file_size,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at
+    )
+
+async def _get_job(db: AsyncSession, job_id: str, admin: Principal) -> ExportJob:
+    job = await ExportJobService(db).get(uuid.UUID(job_id), admin.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    return job
+
+@router.post("/export-jobs", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    job_data: ExportJobCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    """Queue an export; the same request again returns the existing job"""
+    params = job_params(job_data.start_date, job_data.end_date, job_data.operator_id, job_data.test_type)
+    job, created = await ExportJobService(db).submit(admin.id, job_data.kind, params)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A matching export is being queued, try again"
+        )
+    await db.commit()
+    await db.refresh(job)
+    
+    if created:
+        export_job_runner.submit(job.id)
+    else:
+        response.status_code = status.HTTP_200_OK
+    
+    return _job_response(job)
+
+@router.get("/export-jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    return _job_response(await _get_job(db, job_id, admin))
+
+@router.get("/export-jobs/{job_id}/download")
+async def download_export_job(
+    job_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: AsyncSession = Depends(get_async_db),
+    admin: Principal = Depends(require_admin),
+    platform_check: Principal = Depends(require_web_platform)
+):
+    """The finished file; honours a single byte Range for resumed downloads"""
+    job = await _get_job(db, job_id, admin)
+    
+    if job.status in (ExportJobStatus.PENDING, ExportJobStatus.RUNNING):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Export is not finished yet"
+        )
+    # Files are purged periodically, so one may outlive its retention for a while
+    expired = job.finished_at is not None and job.finished_at < retention_cutoff()
+    if job.status != ExportJobStatus.COMPLETED or expired or not job.file_path or not os.path.exists(job.file_path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Export file is not available"
+        )
+    
+    return ranged_file_response(job.file_path, MEDIA_TYPES[job.kind], export_filename(job), range_header)
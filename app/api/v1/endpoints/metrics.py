@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from app.api.v1.websocket import manager
+from app.core.auth import principal_cache, require_admin
+from app.core.principal_cache import Principal
+from app.database.database import pool_stats
+from app.services.export_cache import export_cache
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics(admin: Principal = Depends(require_admin)):
+    """Process-local counters: caches, connection pools and live sockets"""
+    return {
+        "principal_cache": principal_cache.stats(),
+        "export_cache": export_cache.stats(),
+        "db_pools": pool_stats(),
+        "live_channel": manager.stats()
+    }
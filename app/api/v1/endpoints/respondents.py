@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from app.database.database import get_db
-from app.core.auth import get_current_user, require_mobile_platform
+from app.database.database import get_async_db
+from app.core.auth import get_current_principal, require_mobile_platform
+from app.core.principal_cache import Principal
+from app.core.serialization import columns, rows_response
+from app.core.pagination import NEXT_CURSOR_HEADER, paginate, split_page
 from app.schemas.respondents import RespondentCreate, RespondentResponse
-from app.database.models import Respondent, User
+from app.database.models import Respondent
+from app.services.respondent_service import RespondentService
 import uuid
 
 router = APIRouter()
@@ -12,9 +17,9 @@ router = APIRouter()
 @router.post("/respondents", response_model=RespondentResponse)
 async def create_respondent(
     respondent_data: RespondentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
     respondent = Respondent(
         guest_name=respondent_data.guest_name,
@@ -28,39 +33,45 @@ async def create_respondent(
     )
     
     db.add(respondent)
-    db.commit()
-    db.refresh(respondent)
+    await db.commit()
+    await db.refresh(respondent)
     
     return respondent
 
 @router.get("/respondents", response_model=List[RespondentResponse])
 async def get_respondents(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform),
     search: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100)
 ):
-    query = db.query(Respondent).filter(Respondent.created_by == current_user.id)
+    if search and search.strip():
+        # Ranked search results page by offset; cursors apply to the plain listing
+        return await RespondentService(db).search(current_user.id, search, page, limit)
     
-    if search:
-        query = query.filter(Respondent.guest_name.ilike(f"%{search}%"))
-    
-    respondents = query.order_by(Respondent.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
-    return respondents
+    query = select(*columns(RespondentResponse, Respondent)).where(Respondent.created_by == current_user.id)
+    result = await db.execute(paginate(query, Respondent, cursor, limit, page))
+    respondents, next_cursor = split_page(result.all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows_response(respondents, response)
 
 @router.get("/respondents/{respondent_id}", response_model=RespondentResponse)
 async def get_respondent(
     respondent_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    respondent = db.query(Respondent).filter(
+    result = await db.execute(select(Respondent).where(
         Respondent.id == uuid.UUID(respondent_id),
         Respondent.created_by == current_user.id
-    ).first()
+    ))
+    respondent = result.scalars().first()
     
     if not respondent:
         raise HTTPException(
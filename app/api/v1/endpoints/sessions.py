@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
-from app.database.database import get_db
-from app.core.auth import get_current_user, require_mobile_platform, require_admin, require_web_platform
+from app.api.v1.websocket import publish_session_update
+from app.database.database import get_async_db
+from app.core.auth import get_current_principal, require_mobile_platform, require_admin, require_web_platform
+from app.core.conditional import CACHE_CONTROL, SYNC_TOKEN_HEADER, changed_since, not_modified, unseen, weak_etag
+from app.core.principal_cache import Principal
+from app.core.serialization import columns, rows_response
+from app.core.pagination import NEXT_CURSOR_HEADER, paginate, split_page
 from app.schemas.sessions import SessionCreate, SessionResponse, SessionConfigCreate, SessionUpdate
-from app.database.models import Session, SessionConfig, SessionStatus, User, Respondent
+from app.database.models import Session, SessionConfig, SessionStatus, Respondent
+from app.schemas.trials import SessionStatisticsResponse
+from app.services.trial_service import TrialService
 import uuid
 from datetime import datetime
 import random
@@ -21,15 +29,16 @@ def generate_session_code():
 @router.post("/sessions", response_model=SessionResponse)
 async def create_session(
     session_data: SessionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
     # Verify respondent exists and belongs to current user
-    respondent = db.query(Respondent).filter(
+    result = await db.execute(select(Respondent).where(
         Respondent.id == uuid.UUID(session_data.respondent_id),
         Respondent.created_by == current_user.id
-    ).first()
+    ))
+    respondent = result.scalars().first()
     
     if not respondent:
         raise HTTPException(
@@ -52,8 +61,8 @@ async def create_session(
     )
     
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
     
     return session
 
@@ -61,14 +70,15 @@ async def create_session(
 async def add_session_config(
     session_id: str,
     config_data: SessionConfigCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -89,21 +99,22 @@ async def add_session_config(
     )
     
     db.add(config)
-    db.commit()
+    await db.commit()
     
     return {"success": True, "message": "Configuration added"}
 
 @router.patch("/sessions/{session_id}/start")
 async def start_session(
     session_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -119,21 +130,23 @@ async def start_session(
     
     session.status = SessionStatus.ACTIVE
     session.started_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    publish_session_update(session.id, "started", {"status": SessionStatus.ACTIVE.value})
     
     return {"success": True, "message": "Session started"}
 
 @router.patch("/sessions/{session_id}/complete")
 async def complete_session(
     session_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -143,7 +156,8 @@ async def complete_session(
     
     session.status = SessionStatus.COMPLETED
     session.ended_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
+    publish_session_update(session.id, "completed", {"status": SessionStatus.COMPLETED.value})
     
     return {"success": True, "message": "Session completed"}
 
@@ -151,14 +165,15 @@ async def complete_session(
 async def update_local_data(
     session_id: str,
     local_data: Dict[str, Any],
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -168,43 +183,111 @@ async def update_local_data(
     
     session.local_data = local_data
     session.updated_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {"success": True, "message": "Local data updated"}
 
 @router.get("/sessions", response_model=List[SessionResponse])
 async def get_my_sessions(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform),
     status: Optional[str] = Query(None),
+    since: Optional[str] = Query(None, description="X-Sync-Token of an earlier listing: only sessions changed after it"),
+    cursor: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100)
 ):
-    query = db.query(Session).filter(Session.operator_id == current_user.id)
+    """The operator's sessions, newest first.
+
+    The weak ETag covers the operator's whole session set (row count and
+    the sum of the rows' changed_xid, which any committed write changes), so
+    an unchanged poll is answered with a 304 after one index-only aggregate.
+    The X-Sync-Token header is the snapshot that aggregate was read at;
+    clients keep the one of a listing's first page and pass it as since to
+    fetch only what changed.
+    """
+    owned = Session.operator_id == current_user.id
+    version = await db.execute(select(
+        func.count(), func.sum(Session.changed_xid), cast(func.pg_current_snapshot(), Text)
+    ).where(owned))
+    count, stamps, token = version.one()
+    etag = weak_etag(current_user.id, count, stamps, request.url.query)
+    unchanged = not_modified(request, response, etag)
+    if unchanged:
+        return unchanged
+    response.headers[SYNC_TOKEN_HEADER] = token
+    
+    query = select(*columns(SessionResponse, Session)).where(owned)
     
     if status:
-        query = query.filter(Session.status == SessionStatus(status))
+        query = query.where(Session.status == SessionStatus(status))
+    
+    if since:
+        query = query.where(changed_since(Session.changed_xid, since))
     
-    sessions = query.order_by(Session.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
-    return sessions
+    result = await db.execute(paginate(query, Session, cursor, limit, page))
+    sessions, next_cursor = split_page(result.all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows_response(sessions, response)
 
 @router.get("/sessions/{session_id}", response_model=SessionResponse)
 async def get_session(
     session_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(None, description="304 unless changed after this X-Sync-Token"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session, cast(func.pg_current_snapshot(), Text)).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    row = result.first()
     
-    if not session:
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    session, token = row
+    
+    etag = weak_etag(session.id, session.changed_xid)
+    unchanged = not_modified(request, response, etag)
+    if unchanged:
+        return unchanged
+    if since and not unseen(session.changed_xid, since):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+    response.headers[SYNC_TOKEN_HEADER] = token
+    
+    return session
+
+@router.get("/sessions/{session_id}/statistics", response_model=SessionStatisticsResponse)
+async def get_session_statistics(
+    session_id: str,
+    percentiles: bool = Query(True, description="false serves only the running aggregates, for polling"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
+):
+    result = await db.execute(select(Session.id).where(
+        Session.id == uuid.UUID(session_id),
+        Session.operator_id == current_user.id
+    ))
+    session_uuid = result.scalar()
+    
+    if not session_uuid:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found"
         )
     
-    return session
\ No newline at end of file
+    return await TrialService(db).session_statistics(session_uuid, percentiles)
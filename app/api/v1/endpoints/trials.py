@@ -1,28 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database.database import get_db
-from app.core.auth import get_current_user, require_mobile_platform
-from app.schemas.trials import ReactionTrialBatchCreate, TympaniReadingCreate, VitalReadingCreate
-from app.database.models import ReactionTrial, TympaniReading, VitalReading, Session, SessionStatus, User
+from app.api.v1.websocket import publish_stream_data
+from app.database.database import get_async_db
+from app.core.auth import get_current_principal, require_mobile_platform
+from app.core.principal_cache import Principal
+from app.schemas.trials import (
+    ReactionTrialBatchCreate, TympaniReadingCreate, TympaniReadingBatchCreate,
+    VitalReadingCreate, VitalReadingBatchCreate, SyncStateResponse
+)
+from app.database.models import Session, SessionStatus
+from app.services.trial_service import TrialService
 import uuid
 from datetime import datetime
 
 router = APIRouter()
 
+async def _ingest(db: AsyncSession, session: Session, stream: str, items, batch_id):
+    """Run one idempotent batch upload, commit it and publish it to live subscribers"""
+    session_id = session.id
+    try:
+        outcome, inserted = await TrialService(db).ingest_batch(session, stream, items, batch_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    await db.commit()
+    publish_stream_data(session_id, stream, inserted)
+    return outcome
+
 @router.post("/sessions/{session_id}/trials/batch")
 async def create_reaction_trials_batch(
     session_id: str,
     trials_data: ReactionTrialBatchCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
     # Verify session exists and belongs to current user
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -30,39 +52,24 @@ async def create_reaction_trials_batch(
             detail="Session not found"
         )
     
-    # Create trials
-    trials = []
-    for trial_data in trials_data.trials:
-        trial = ReactionTrial(
-            session_id=session.id,
-            stimulus_type=trial_data.stimulus_type,
-            stimulus_category=trial_data.stimulus_category,
-            response_time=trial_data.response_time,
-            trial_number=trial_data.trial_number,
-            reaction_type=trial_data.reaction_type
-        )
-        trials.append(trial)
-    
-    db.add_all(trials)
-    
-    # Update session progress
-    session.trials_completed += len(trials_data.trials)
-    db.commit()
+    # Bulk insert trials and update session progress in one transaction
+    outcome = await _ingest(db, session, "reaction_trials", trials_data.trials, trials_data.batch_id)
     
-    return {"success": True, "message": f"{len(trials_data.trials)} trials recorded"}
+    return {"success": True, "message": f"{outcome['recorded']} trials recorded", **outcome}
 
 @router.post("/sessions/{session_id}/tympani-readings")
 async def create_tympani_reading(
     session_id: str,
     reading_data: TympaniReadingCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -70,18 +77,9 @@ async def create_tympani_reading(
             detail="Session not found"
         )
     
-    reading = TympaniReading(
-        session_id=session.id,
-        temperature=reading_data.temperature,
-        reading_number=reading_data.reading_number,
-        measurement_phase=reading_data.measurement_phase,
-        body_position=reading_data.body_position,
-        environment_temp=reading_data.environment_temp,
-        reading_time=reading_data.reading_time or datetime.utcnow()
-    )
-    
-    db.add(reading)
-    db.commit()
+    inserted = await TrialService(db).insert_tympani_readings(session, [reading_data])
+    await db.commit()
+    publish_stream_data(session.id, "tympani_readings", inserted)
     
     return {"success": True, "message": "Tympanic reading recorded"}
 
@@ -89,14 +87,15 @@ async def create_tympani_reading(
 async def create_vital_reading(
     session_id: str,
     reading_data: VitalReadingCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    platform_check: User = Depends(require_mobile_platform)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
 ):
-    session = db.query(Session).filter(
+    result = await db.execute(select(Session).where(
         Session.id == uuid.UUID(session_id),
         Session.operator_id == current_user.id
-    ).first()
+    ))
+    session = result.scalars().first()
     
     if not session:
         raise HTTPException(
@@ -104,19 +103,84 @@ async def create_vital_reading(
             detail="Session not found"
         )
     
-    reading = VitalReading(
-        session_id=session.id,
-        heart_rate=reading_data.heart_rate,
-        heart_rate_variability=reading_data.heart_rate_variability,
-        spo2=reading_data.spo2,
-        reading_number=reading_data.reading_number,
-        measurement_phase=reading_data.measurement_phase,
-        activity_context=reading_data.activity_context,
-        body_position=reading_data.body_position,
-        reading_time=reading_data.reading_time or datetime.utcnow()
-    )
+    inserted = await TrialService(db).insert_vital_readings(session, [reading_data])
+    await db.commit()
+    publish_stream_data(session.id, "vital_readings", inserted)
+    
+    return {"success": True, "message": "Vital reading recorded"}
+
+@router.post("/sessions/{session_id}/tympani-readings/batch")
+async def create_tympani_readings_batch(
+    session_id: str,
+    readings_data: TympaniReadingBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
+):
+    # One ownership check for the whole batch
+    result = await db.execute(select(Session).where(
+        Session.id == uuid.UUID(session_id),
+        Session.operator_id == current_user.id
+    ))
+    session = result.scalars().first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
     
-    db.add(reading)
-    db.commit()
+    outcome = await _ingest(db, session, "tympani_readings", readings_data.readings, readings_data.batch_id)
     
-    return {"success": True, "message": "Vital reading recorded"}
\ No newline at end of file
+    return {"success": True, "message": f"{outcome['recorded']} tympanic readings recorded", **outcome}
+
+@router.post("/sessions/{session_id}/vital-readings/batch")
+async def create_vital_readings_batch(
+    session_id: str,
+    readings_data: VitalReadingBatchCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
+):
+    # One ownership check for the whole batch
+    result = await db.execute(select(Session).where(
+        Session.id == uuid.UUID(session_id),
+        Session.operator_id == current_user.id
+    ))
+    session = result.scalars().first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    outcome = await _ingest(db, session, "vital_readings", readings_data.readings, readings_data.batch_id)
+    
+    return {"success": True, "message": f"{outcome['recorded']} vital readings recorded", **outcome}
+
+@router.get("/sessions/{session_id}/sync-state", response_model=SyncStateResponse)
+async def get_sync_state(
+    session_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal),
+    platform_check: Principal = Depends(require_mobile_platform)
+):
+    """Where a resuming client should continue each upload stream from"""
+    result = await db.execute(select(Session).where(
+        Session.id == uuid.UUID(session_id),
+        Session.operator_id == current_user.id
+    ))
+    session = result.scalars().first()
+    
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    return SyncStateResponse(
+        session_id=str(session.id),
+        trials_completed=session.trials_completed,
+        high_water_marks=await TrialService(db).high_water_marks(session)
+    )
@@ -0,0 +1,272 @@
+"""Live session channel.
+
+Dashboards connect to ``/api/v1/ws?token=<access token>`` (browsers can't
+set an Authorization header on a WebSocket) and send
+
+    {"action": "subscribe", "session_id": "<uuid>"}
+    {"action": "unsubscribe", "session_id": "<uuid>"}
+
+to join or leave a session's room. Operators may follow their own sessions,
+admins the sessions of operators they created. Trial/reading ingest and
+session status changes are published to the session's room only.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Hashable, Optional, Sequence, Set, Tuple
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core.auth import principal_from_token
+from app.core.principal_cache import Principal
+from app.core.serialization import dumps
+from app.database.database import get_async_db
+from app.database.models import Session, User, UserRole, UserStatus
+import asyncio
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Messages for one socket go through its own bounded queue and sender task,
+# so a publisher never waits on a socket and a slow one only delays itself.
+# A full queue drops its oldest message and tells the client how many it
+# missed, so it can refetch; messages with a coalesce key (session status)
+# replace their queued predecessor instead. A send that stalls for
+# LIVE_SEND_TIMEOUT_SECONDS closes the socket.
+
+class LiveConnection:
+    """One socket, its outbound queue and the task draining it"""
+
+    def __init__(self, websocket: WebSocket, manager: "ConnectionManager"):
+        self.websocket = websocket
+        self.manager = manager
+        self.pending: Deque[Tuple[Optional[Hashable], str]] = deque()
+        self.dropped = 0  # not yet reported to the client
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self.sender: Optional[asyncio.Task] = None
+
+    def enqueue(self, text: str, coalesce_key: Optional[Hashable] = None) -> None:
+        """Queue a serialized message; safe to call from any thread or loop"""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._enqueue(text, coalesce_key)
+        else:
+            self.loop.call_soon_threadsafe(self._enqueue, text, coalesce_key)
+
+    def _enqueue(self, text: str, coalesce_key: Optional[Hashable]) -> None:
+        if coalesce_key is not None:
+            for index, (key, _text) in enumerate(self.pending):
+                if key == coalesce_key:
+                    self.pending[index] = (coalesce_key, text)
+                    self.manager.coalesced += 1
+                    return
+        if len(self.pending) >= self.manager.queue_size:
+            self.pending.popleft()
+            self.dropped += 1
+            self.manager.dropped += 1
+        self.pending.append((coalesce_key, text))
+        self._ready.set()
+
+    async def run(self) -> None:
+        """Send queued messages in order until the socket fails or stalls"""
+        try:
+            while True:
+                await self._ready.wait()
+                if self.dropped:
+                    text = dumps({"type": "dropped", "count": self.dropped}).decode()
+                    self.dropped = 0
+                elif self.pending:
+                    _key, text = self.pending.popleft()
+                else:
+                    self._ready.clear()
+                    continue
+                await asyncio.wait_for(self.websocket.send_text(text), self.manager.send_timeout)
+                self.manager.sent += 1
+        except asyncio.TimeoutError:
+            self.manager.stalled += 1
+            logger.info("Closing stalled live connection")
+            self.manager.disconnect(self.websocket)
+            try:
+                await asyncio.wait_for(
+                    self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER), self.manager.send_timeout
+                )
+            except Exception:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.info("Dropping live connection after a failed send", exc_info=True)
+            self.manager.disconnect(self.websocket)
+
+class ConnectionManager:
+    """Open sockets and the session rooms they subscribed to"""
+
+    def __init__(self, queue_size: int, send_timeout: float):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.active_connections: Dict[WebSocket, LiveConnection] = {}
+        self.rooms: Dict[uuid.UUID, Set[WebSocket]] = {}
+        self.subscriptions: Dict[WebSocket, Set[uuid.UUID]] = {}
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.stalled = 0
+
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+        connection = LiveConnection(websocket, self)
+        connection.sender = asyncio.create_task(connection.run())
+        self.active_connections[websocket] = connection
+        self.subscriptions[websocket] = set()
+
+    def disconnect(self, websocket: WebSocket):
+        connection = self.active_connections.pop(websocket, None)
+        if connection is not None and connection.sender is not asyncio.current_task():
+            connection.sender.cancel()
+        for session_id in self.subscriptions.pop(websocket, set()):
+            self._leave(websocket, session_id)
+
+    def subscribe(self, websocket: WebSocket, session_id: uuid.UUID):
+        self.rooms.setdefault(session_id, set()).add(websocket)
+        self.subscriptions[websocket].add(session_id)
+
+    def unsubscribe(self, websocket: WebSocket, session_id: uuid.UUID):
+        self.subscriptions[websocket].discard(session_id)
+        self._leave(websocket, session_id)
+
+    def _leave(self, websocket: WebSocket, session_id: uuid.UUID):
+        room = self.rooms.get(session_id)
+        if room is not None:
+            room.discard(websocket)
+            if not room:
+                del self.rooms[session_id]
+
+    def has_subscribers(self, session_id: uuid.UUID) -> bool:
+        return session_id in self.rooms
+
+    def send_personal_message(self, message: Dict[str, Any], websocket: WebSocket):
+        connection = self.active_connections.get(websocket)
+        if connection is not None:
+            connection.enqueue(dumps(message).decode())
+
+    def broadcast(self, session_id: uuid.UUID, message: Dict[str, Any], coalesce_key: Optional[Hashable] = None) -> int:
+        """Queue the message for the session's subscribers, serialized once
+        for all of them; returns how many it was queued for"""
+        room = self.rooms.get(session_id)
+        if not room:
+            return 0
+        text = dumps(message).decode()
+        queued = 0
+        # Snapshot: sockets may leave the room meanwhile
+        for websocket in tuple(room):
+            connection = self.active_connections.get(websocket)
+            if connection is not None:
+                connection.enqueue(text, coalesce_key)
+                queued += 1
+        return queued
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.active_connections),
+            "rooms": len(self.rooms),
+            "queued": sum(len(connection.pending) for connection in tuple(self.active_connections.values())),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "stalled": self.stalled
+        }
+
+manager = ConnectionManager(settings.LIVE_QUEUE_SIZE, settings.LIVE_SEND_TIMEOUT_SECONDS)
+
+def publish_session_update(session_id: uuid.UUID, update_type: str, data: Dict[str, Any]):
+    """Status change of a session; a queued, unsent one is superseded"""
+    if not manager.has_subscribers(session_id):
+        return
+    manager.broadcast(session_id, {
+        "type": "session_update",
+        "session_id": str(session_id),
+        "update_type": update_type,
+        "data": data,
+        "timestamp": datetime.utcnow().isoformat()
+    }, coalesce_key=("session_update", session_id))
+
+def publish_stream_data(session_id: uuid.UUID, stream: str, rows: Sequence[Any]):
+    """Trials or readings of a session as just stored: the rows an insert
+    returned, so rejected items and skipped duplicates are never published"""
+    if not rows or not manager.has_subscribers(session_id):
+        return
+    manager.broadcast(session_id, {
+        "type": "trial_data" if stream == "reaction_trials" else "reading_data",
+        "session_id": str(session_id),
+        "stream": stream,
+        "items": [dict(row) for row in rows],
+        "timestamp": datetime.utcnow().isoformat()
+    })
+
+async def _may_follow(db: AsyncSession, principal: Principal, session_id: uuid.UUID) -> bool:
+    """Operators follow their own sessions, admins those of their operators"""
+    result = await db.execute(
+        select(Session.operator_id, User.created_by)
+        .join(User, Session.operator_id == User.id)
+        .where(Session.id == session_id)
+    )
+    row = result.first()
+    # Don't hold a pooled connection for the life of the socket
+    await db.close()
+    if row is None:
+        return False
+    if principal.role in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
+        return principal.id in (row.operator_id, row.created_by)
+    return row.operator_id == principal.id
+
+@router.websocket("/ws")
+async def live_channel(websocket: WebSocket, db: AsyncSession = Depends(get_async_db)):
+    token = websocket.query_params.get("token")
+    authorization = websocket.headers.get("authorization", "")
+    if token is None and authorization.lower().startswith("bearer "):
+        token = authorization[len("bearer "):]
+    try:
+        principal = await principal_from_token(token or "", db)
+    except HTTPException:
+        principal = None
+    await db.close()
+    if principal is None or principal.status != UserStatus.ACTIVE:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await manager.connect(websocket)
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                action = message["action"]
+                session_id = uuid.UUID(str(message["session_id"]))
+            except (ValueError, KeyError, TypeError):
+                manager.send_personal_message({"type": "error", "detail": "Invalid message"}, websocket)
+                continue
+
+            if action == "subscribe":
+                if not await _may_follow(db, principal, session_id):
+                    manager.send_personal_message(
+                        {"type": "error", "session_id": str(session_id), "detail": "Session not found"}, websocket
+                    )
+                    continue
+                manager.subscribe(websocket, session_id)
+                manager.send_personal_message({"type": "subscribed", "session_id": str(session_id)}, websocket)
+            elif action == "unsubscribe":
+                manager.unsubscribe(websocket, session_id)
+                manager.send_personal_message({"type": "unsubscribed", "session_id": str(session_id)}, websocket)
+            else:
+                manager.send_personal_message({"type": "error", "detail": f"Unknown action {action}"}, websocket)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket)
@@ -1,16 +1,53 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 class Settings(BaseSettings):
     # Database - untuk Docker
     DATABASE_URL: str = "postgresql://ergoquipt:password@db:5432/ergoquipt"
+    # Optional streaming replica for exports and admin reads; unset reads the primary
+    DATABASE_READ_URL: Optional[str] = None
+    
+    # Connection pool, per engine and worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 disables
     
     # JWT
     SECRET_KEY: str = "your-super-secret-key-change-in-production-123456"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     
+    # bcrypt runs in this many worker threads, off the event loop
+    PASSWORD_HASH_WORKERS: int = 2
+    
+    # Background export jobs
+    EXPORT_JOB_WORKERS: int = 2
+    EXPORT_JOB_DIR: str = "exports"  # finished files, on local disk
+    EXPORT_JOB_RETENTION_HOURS: int = 24  # finished files are reused, then deleted
+
+    # Exports of completed sessions, cached on local disk
+    EXPORT_CACHE_DIR: str = "export-cache"
+    EXPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # least recently used files go first
+    
+    # Monthly partitions of the reading tables
+    READINGS_PARTITION_MONTHS_AHEAD: int = 3
+    READINGS_RETENTION_MONTHS: int = 0  # 0 keeps all partitions
+    
+    # Partition and export-file upkeep, repeated by each API process
+    MAINTENANCE_INTERVAL_SECONDS: int = 3600
+    
+    # Live channel: messages queued per socket before the oldest are dropped,
+    # and how long one send may take before the socket counts as stalled
+    LIVE_QUEUE_SIZE: int = 256
+    LIVE_SEND_TIMEOUT_SECONDS: float = 5.0
+    
+    # Principal cache (user lookups behind every authenticated request)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
     # Security
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000", "http://127.0.0.1:8000", "http://0.0.0.0:8000"]
     
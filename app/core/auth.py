@@ -1,18 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.models import User, UserRole, PlatformAccess, UserStatus  # ✅ TAMBAH IMPORT UserStatus
 from app.config import settings
-from app.database.database import get_db
+from app.database.database import get_async_db
+from app.core.principal_cache import Principal, PrincipalCache
+import asyncio
 import uuid
 
 # Gunakan bcrypt yang compatible
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_MAX_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -23,6 +28,22 @@ def get_password_hash(password: str) -> str:
         password = password[:72]
     return pwd_context.hash(password)
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event
+# loop; the pool size caps how many hashes run at once and further logins
+# queue for a worker instead of stalling other requests
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+
+async def async_verify_password(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, verify_password, plain_password, hashed_password)
+
+async def async_get_password_hash(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_hash_executor, get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -33,8 +54,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def authenticate_user(db: Session, username: str, password: str, platform: str):
-    user = db.query(User).filter(User.username == username).first()
+async def authenticate_user(db: AsyncSession, username: str, password: str, platform: str):
+    result = await db.execute(select(User).where(User.username == username))
+    user = result.scalars().first()
     if not user:
         return None
     
@@ -54,39 +76,69 @@ def authenticate_user(db: Session, username: str, password: str, platform: str):
     if user.platform_access != platform and user.platform_access != "both":
         return None
     
-    if not verify_password(password, user.password_hash):
+    if not await async_verify_password(password, user.password_hash):
         return None
     
     return user
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_user_id(token: str) -> uuid.UUID:
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.id == uuid.UUID(user_id)).first()
+            raise _credentials_exception()
+        return uuid.UUID(user_id)
+    except (JWTError, ValueError):
+        raise _credentials_exception()
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full User row, for endpoints that read or change profile fields"""
+    result = await db.execute(select(User).where(User.id == _token_user_id(credentials.credentials)))
+    user = result.scalars().first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
+    principal_cache.set(Principal.from_user(user))
     return user
 
-async def get_current_active_user(current_user: User = Depends(get_current_user)):
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Id, role, status and platform access, served from the principal cache"""
+    return await principal_from_token(credentials.credentials, db)
+
+async def principal_from_token(token: str, db: AsyncSession) -> Principal:
+    """The principal of a bearer token, for callers outside the HTTPBearer
+    dependency (the WebSocket handshake)"""
+    user_id = _token_user_id(token)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        result = await db.execute(
+            select(User.id, User.role, User.status, User.platform_access).where(User.id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            raise _credentials_exception()
+        principal = Principal(*row)
+        principal_cache.set(principal)
+    return principal
+
+async def get_current_active_user(current_user: Principal = Depends(get_current_principal)):
     if current_user.status != UserStatus.ACTIVE:  # ✅ Gunakan UserStatus.ACTIVE
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
-def require_admin(user: User = Depends(get_current_active_user)):
+def require_admin(user: Principal = Depends(get_current_active_user)):
     if user.role not in [UserRole.ADMIN, UserRole.SUPER_ADMIN]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -94,7 +146,7 @@ def require_admin(user: User = Depends(get_current_active_user)):
         )
     return user
 
-def require_web_platform(user: User = Depends(get_current_active_user)):
+def require_web_platform(user: Principal = Depends(get_current_active_user)):
     if user.platform_access not in [PlatformAccess.WEB, PlatformAccess.BOTH]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -102,7 +154,7 @@ def require_web_platform(user: User = Depends(get_current_active_user)):
         )
     return user
 
-def require_mobile_platform(user: User = Depends(get_current_active_user)):
+def require_mobile_platform(user: Principal = Depends(get_current_active_user)):
     if user.platform_access not in [PlatformAccess.MOBILE, PlatformAccess.BOTH]:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
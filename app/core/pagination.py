@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+import base64
+import json
+import uuid
+
+# Listings are ordered newest first by (created_at, id); a cursor is the key
+# of the last row the client saw, so the next page is an index range scan
+# that costs the same at any depth and isn't shifted by newly created rows.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Opaque token for the (created_at, id) key of a row"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(row_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), uuid.UUID(payload["i"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def keyset_order(model) -> Tuple[Any, Any]:
+    return model.created_at.desc(), model.id.desc()
+
+def keyset_filter(model, cursor: str):
+    """Rows strictly after the cursor in keyset_order()"""
+    created_at, row_id = decode_cursor(cursor)
+    return tuple_(model.created_at, model.id) < tuple_(created_at, row_id)
+
+def paginate(query, model, cursor: Optional[str], limit: int, page: int = 1):
+    """Apply keyset order and the cursor (or the legacy page offset) to a select.
+
+    Fetches one extra row so split_page() can tell whether a next page exists.
+    """
+    query = query.order_by(*keyset_order(model))
+    if cursor:
+        query = query.where(keyset_filter(model, cursor))
+    elif page > 1:
+        query = query.offset((page - 1) * limit)
+    return query.limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row and build the cursor for the next page"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
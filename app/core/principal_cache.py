@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+from app.database.models import UserRole, UserStatus, PlatformAccess
+import threading
+import time
+import uuid
+
+@dataclass(frozen=True)
+class Principal:
+    """The parts of a User that authorization checks need"""
+    id: uuid.UUID
+    role: UserRole
+    status: UserStatus
+    platform_access: PlatformAccess
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            role=user.role,
+            status=user.status,
+            platform_access=user.platform_access
+        )
+
+class PrincipalCache:
+    """In-process TTL + LRU cache of principals keyed by user id.
+
+    Entries are dropped explicitly when an account's status or password
+    changes on this process; the TTL bounds how long another worker can
+    keep serving a stale entry.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[uuid.UUID, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: uuid.UUID) -> Optional[Principal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, principal: Principal) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
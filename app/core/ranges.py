@@ -0,0 +1,78 @@
+from typing import Dict, Iterator, Optional, Tuple
+from fastapi import HTTPException, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+import os
+
+# Downloads of finished files answer single byte ranges (resumed or
+# parallel downloads); the FileResponse of our Starlette version has no
+# Range support of its own.
+RANGE_CHUNK_SIZE = 64 * 1024
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """First and last byte (inclusive) requested by a Range header.
+
+    None means the whole file: no header, a malformed one, or several
+    ranges (which a server may answer with the full body). Raises 416 when
+    the range lies beyond the end of the file.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            start, end = max(size - suffix, 0), size - 1
+            if suffix == 0:
+                start = size
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start < 0 or start > end or start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+def iter_file(path: str, start: int, end: int, chunk_size: int = RANGE_CHUNK_SIZE) -> Iterator[bytes]:
+    with open(path, "rb") as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def ranged_file_response(
+    path: str,
+    media_type: str,
+    filename: str,
+    range_header: Optional[str],
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """The file, or the byte range asked for as 206 Partial Content"""
+    size = os.path.getsize(path)
+    headers = {
+        **(headers or {}),
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename={filename}"
+    }
+    byte_range = parse_range(range_header, size)
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file(path, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers
+    )
@@ -1,15 +1,102 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.database.pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
 
-engine = create_engine(settings.DATABASE_URL)
+# Async driver for each sync URL scheme we deploy with
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def async_database_url(url: str) -> str:
+    """Translate a sync DATABASE_URL into its async-driver equivalent"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql":
+        # Partitioned tables, ON CONFLICT upserts and UUID columns are Postgres-only
+        raise ValueError(f"Unsupported database {parsed.drivername!r}: DATABASE_URL must point to PostgreSQL")
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+def pool_options(poolclass) -> dict:
+    """Pool settings from Settings"""
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+# Sync engine: startup tasks, scripts and Alembic
+engine = create_engine(settings.DATABASE_URL, **pool_options(InstrumentedQueuePool))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine: request handlers, so DB round trips don't block the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    **pool_options(InstrumentedAsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Read engine: exports and admin reads go to the replica when one is
+# configured; without DATABASE_READ_URL it is the primary engine itself
+if settings.DATABASE_READ_URL:
+    async_read_engine = create_async_engine(
+        async_database_url(settings.DATABASE_READ_URL),
+        **pool_options(InstrumentedAsyncAdaptedQueuePool)
+    )
+else:
+    async_read_engine = async_engine
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Clients send "X-Consistency: strong" for reads that must see their own
+# just-committed writes, which a lagging replica may not have yet
+CONSISTENCY_HEADER = "X-Consistency"
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def pool_stats() -> dict:
+    """Live pool metrics of every engine, for the internal metrics endpoint"""
+    stats = {}
+    pools = [("async", async_engine.sync_engine.pool), ("sync", engine.pool)]
+    if async_read_engine is not async_engine:
+        pools.append(("read", async_read_engine.sync_engine.pool))
+    for name, pool in pools:
+        if hasattr(pool, "stats"):
+            stats[name] = pool.stats()
+    return stats
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints, on the replica unless strong consistency is asked for"""
+    if request.headers.get(CONSISTENCY_HEADER, "").lower() == "strong":
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = AsyncReadSessionLocal
+    async with session_factory() as db:
+        yield db
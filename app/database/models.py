@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum, DECIMAL, JSON
+from sqlalchemy import BigInteger, Column, String, Integer, Boolean, DateTime, Float, ForeignKey, Index, Text, Enum as SQLEnum, DECIMAL, JSON, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
 import uuid
 from .database import Base
+from .partitions import create_partitions_for_table
 import enum
 
 class UserRole(str, enum.Enum):
@@ -37,6 +39,18 @@ class SessionStatus(str, enum.Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
+class ExportJobKind(str, enum.Enum):
+    RAW_DATA_ZIP = "raw-data.zip"
+    SESSIONS_PARQUET = "sessions.parquet"
+    SESSIONS_ARROW = "sessions.arrow"
+
+class ExportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"  # file removed after EXPORT_JOB_RETENTION_HOURS
+
 class StimulusType(str, enum.Enum):
     RED = "red"
     YELLOW = "yellow"
@@ -74,6 +88,11 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Keyset pagination of an admin's operators
+        Index("ix_users_created_by_created_at_id", "created_by", "created_at", "id"),
+    )
+
 class UserRegistrationLog(Base):
     __tablename__ = "user_registration_logs"
 
@@ -99,6 +118,40 @@ class Respondent(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Keyset pagination of an operator's respondents
+        Index("ix_respondents_created_by_created_at_id", "created_by", "created_at", "id"),
+        # Prefix search on university (LIKE 'abc%' needs text_pattern_ops)
+        Index(
+            "ix_respondents_created_by_lower_university",
+            "created_by",
+            func.lower(university).label("lower_university"),
+            postgresql_ops={"lower_university": "text_pattern_ops"}
+        ),
+    )
+
+# Trigram index for substring/similarity search on guest_name. pg_trgm is a
+# contrib extension, so it is created here only where it can be; search
+# falls back to a plain ILIKE when the extension is missing.
+event.listen(
+    Respondent.__table__,
+    "after_create",
+    DDL("""
+        DO $$
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS ix_respondents_guest_name_trgm
+                ON respondents USING gin (guest_name gin_trgm_ops);
+        EXCEPTION WHEN undefined_file OR feature_not_supported OR undefined_object OR insufficient_privilege THEN
+            RAISE NOTICE 'pg_trgm unavailable, respondent search will not use a trigram index';
+        END
+        $$
+    """).execute_if(dialect="postgresql")
+)
+
+# Current transaction id; a transaction writing a row always has one
+CURRENT_XID = text("pg_current_xact_id()::text::bigint")
+
 class Session(Base):
     __tablename__ = "sessions"
 
@@ -125,6 +178,29 @@ class Session(Base):
     ended_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Id of the transaction that last wrote the row, for listing ETags and
+    # since= deltas: updated_at is the transaction's start, so a batch that
+    # commits after a later one would carry an older timestamp
+    changed_xid = Column(BigInteger, nullable=False, server_default=CURRENT_XID, onupdate=CURRENT_XID)
+
+    # reading_time range of this session's tympanic/vital readings, kept on
+    # insert so reading queries can bound reading_time and prune partitions
+    readings_first_at = Column(DateTime(timezone=True))
+    readings_last_at = Column(DateTime(timezone=True))
+
+    # Load with joinedload()/selectinload() in list and export paths; a lazy
+    # load per row is an N+1 (and raises under AsyncSession)
+    operator = relationship("User", foreign_keys=[operator_id])
+    respondent = relationship("Respondent")
+
+    __table_args__ = (
+        # Keyset-paginated listings and date-range exports per operator
+        Index("ix_sessions_operator_id_created_at_id", "operator_id", "created_at", "id"),
+        # Status-filtered listings and performance counts per operator
+        Index("ix_sessions_operator_id_status", "operator_id", "status"),
+        # Listing ETags (count, sum(changed_xid)) and since= deltas per operator
+        Index("ix_sessions_operator_id_changed_xid", "operator_id", "changed_xid"),
+    )
 
 class SessionConfig(Base):
     __tablename__ = "session_configs"
@@ -158,6 +234,30 @@ class ReactionTrial(Base):
     reaction_type = Column(String(20), default="correct")  # correct, incorrect, timeout
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Matches ExportService's "WHERE session_id = ? ORDER BY trial_number";
+        # unique so re-uploaded trials are dropped by ON CONFLICT DO NOTHING
+        Index("uq_reaction_trials_session_id_trial_number", "session_id", "trial_number", unique=True),
+    )
+
+class SessionStimulusStats(Base):
+    """Running reaction-time aggregates per session and stimulus, kept up to
+    date by trial ingestion (see app/services/stimulus_stats.py)"""
+    __tablename__ = "session_stimulus_stats"
+
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id"), primary_key=True)
+    stimulus_type = Column(SQLEnum(StimulusType), primary_key=True)
+    stimulus_category = Column(SQLEnum(StimulusCategory), primary_key=True)
+    trial_count = Column(Integer, nullable=False)
+    mean_response_time = Column(Float, nullable=False)
+    m2 = Column(Float, nullable=False)  # sum of squared deviations from the mean
+    min_response_time = Column(Integer, nullable=False)
+    max_response_time = Column(Integer, nullable=False)
+    correct = Column(Integer, nullable=False, default=0)
+    incorrect = Column(Integer, nullable=False, default=0)
+    timeout = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class TympaniReading(Base):
     __tablename__ = "tympani_readings"
 
@@ -168,9 +268,15 @@ class TympaniReading(Base):
     measurement_phase = Column(String(50))  # baseline, intervention, recovery
     body_position = Column(String(50))  # sitting, standing, lying_down
     environment_temp = Column(DECIMAL(4, 1))  # Suhu lingkungan
-    reading_time = Column(DateTime(timezone=True), server_default=func.now())
+    reading_time = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # partition key
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # Unique keys on a partitioned table must include the partition key
+        Index("uq_tympani_readings_session_id_reading_number", "session_id", "reading_number", "reading_time", unique=True),
+        {"postgresql_partition_by": "RANGE (reading_time)"},
+    )
+
 class VitalReading(Base):
     __tablename__ = "vital_readings"
 
@@ -183,5 +289,53 @@ class VitalReading(Base):
     measurement_phase = Column(String(50))  # baseline, exercise, recovery, sleep
     activity_context = Column(String(50))  # resting, light_activity, moderate_exercise, intense_exercise, sleep
     body_position = Column(String(50))  # sitting, standing, lying_down
-    reading_time = Column(DateTime(timezone=True), server_default=func.now())
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    reading_time = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())  # partition key
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("uq_vital_readings_session_id_reading_number", "session_id", "reading_number", "reading_time", unique=True),
+        {"postgresql_partition_by": "RANGE (reading_time)"},
+    )
+
+# Monthly partitions of the reading tables (see app/database/partitions.py)
+for _table in (TympaniReading.__table__, VitalReading.__table__):
+    event.listen(_table, "after_create", create_partitions_for_table)
+
+class SyncBatch(Base):
+    """Ledger of client upload batches, so a retried batch is answered from here"""
+    __tablename__ = "sync_batches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)  # batch_id supplied by the mobile client
+    session_id = Column(UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=False)
+    stream = Column(String(30), nullable=False)  # reaction_trials, tympani_readings, vital_readings
+    item_count = Column(Integer, nullable=False)
+    recorded = Column(Integer, nullable=False)
+    duplicates = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ExportJob(Base):
+    """Admin export produced in the background (see app/services/export_jobs.py)"""
+    __tablename__ = "export_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    kind = Column(SQLEnum(ExportJobKind), nullable=False)
+    params = Column(JSON, nullable=False)  # start_date, end_date, operator_id, test_type
+    params_hash = Column(String(64), nullable=False)  # sha256 of kind + params, for deduplication
+    status = Column(SQLEnum(ExportJobStatus), nullable=False, default=ExportJobStatus.PENDING)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_total = Column(Integer)  # estimate, set when the job starts
+    file_path = Column(String(500))
+    file_size = Column(BigInteger)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())  # progress heartbeat
+
+    __table_args__ = (
+        # One queued/running job per admin and parameter set; a duplicate
+        # request joins it instead of exporting twice
+        Index("uq_export_jobs_active", "requested_by", "params_hash", unique=True,
+              postgresql_where=text("status IN ('PENDING', 'RUNNING')")),
+    )
@@ -0,0 +1,159 @@
+"""Monthly range partitions of the reading tables.
+
+tympani_readings and vital_readings are partitioned by reading_time, one
+partition per calendar month (UTC) named ``<table>_pYYYYMM``, plus a
+``<table>_default`` partition that catches readings outside every monthly
+range (e.g. a device clock far off). Upcoming partitions are created ahead
+of time so the default partition stays empty; a month whose readings landed
+in the default partition anyway gets them moved into its new partition.
+Retention detaches and drops whole months instead of running DELETE.
+
+The API process runs maintain_partitions() at startup and then every
+MAINTENANCE_INTERVAL_SECONDS; it can also be run from cron (or by hand):
+
+    python -m app.database.partitions --months-ahead 3 --retain-months 24
+"""
+from datetime import date, datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+import re
+
+PARTITIONED_TABLES = ("tympani_readings", "vital_readings")
+
+PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$")
+
+def month_start(day: date, offset: int = 0) -> date:
+    """First day of the month ``offset`` months after ``day``'s month"""
+    index = day.year * 12 + day.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+def _attached_partitions(conn: Connection, table: str) -> List[str]:
+    return conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+          AND parent.relnamespace = to_regnamespace(current_schema())
+    """), {"table": table}).scalars().all()
+
+def create_partitions(
+    conn: Connection,
+    first_month: date,
+    last_month: date,
+    tables: Sequence[str] = PARTITIONED_TABLES
+) -> List[str]:
+    """Create the default partition and every monthly partition in the range.
+
+    Idempotent; returns the names of partitions that were newly created.
+    """
+    created = []
+    for table in tables:
+        existing = set(_attached_partitions(conn, table))
+        if f"{table}_default" not in existing:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"))
+            created.append(f"{table}_default")
+        month = month_start(first_month)
+        while month <= last_month:
+            name = partition_name(table, month)
+            if name not in existing:
+                _create_month(conn, table, month)
+                created.append(name)
+            month = month_start(month, 1)
+    return created
+
+def _create_month(conn: Connection, table: str, month: date) -> None:
+    name = partition_name(table, month)
+    bounds = {"lower": f"{month.isoformat()} 00:00:00+00", "upper": f"{month_start(month, 1).isoformat()} 00:00:00+00"}
+    create = (
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+    )
+    in_month = "reading_time >= CAST(:lower AS timestamptz) AND reading_time < CAST(:upper AS timestamptz)"
+    stranded = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {table}_default WHERE {in_month})"), bounds
+    ).scalar()
+    if not stranded:
+        conn.execute(text(create))
+        return
+    # Postgres refuses a new partition while the default one holds rows of
+    # its range: set the default partition aside and move those rows over
+    conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {table}_default"))
+    conn.execute(text(create))
+    conn.execute(text(f"INSERT INTO {name} SELECT * FROM {table}_default WHERE {in_month}"), bounds)
+    conn.execute(text(f"DELETE FROM {table}_default WHERE {in_month}"), bounds)
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {table}_default DEFAULT"))
+
+def ensure_partitions(
+    conn: Connection,
+    months_ahead: int = 3,
+    today: Optional[date] = None,
+    tables: Sequence[str] = PARTITIONED_TABLES
+) -> List[str]:
+    """Make sure the current month and the next ``months_ahead`` exist"""
+    today = today or datetime.now(timezone.utc).date()
+    return create_partitions(conn, month_start(today), month_start(today, months_ahead), tables)
+
+def drop_partitions_before(
+    conn: Connection,
+    cutoff: date,
+    tables: Sequence[str] = PARTITIONED_TABLES
+) -> List[str]:
+    """Retention: drop every monthly partition that ends on or before ``cutoff``"""
+    dropped = []
+    for table in tables:
+        for name in sorted(_attached_partitions(conn, table)):
+            match = PARTITION_NAME.match(name)
+            if not match or match.group("table") != table:
+                continue
+            month = date(int(match.group("year")), int(match.group("month")), 1)
+            if month_start(month, 1) <= cutoff:
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+                conn.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+    return dropped
+
+def maintain_partitions(
+    conn: Connection,
+    months_ahead: int,
+    retain_months: int = 0,
+    today: Optional[date] = None
+) -> Tuple[List[str], List[str]]:
+    """Create upcoming partitions and drop those past retention (0 keeps all).
+
+    Returns (created, dropped). A transaction-level advisory lock keeps
+    processes running this at the same time from racing each other.
+    """
+    today = today or datetime.now(timezone.utc).date()
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('reading_partitions'))"))
+    created = ensure_partitions(conn, months_ahead, today)
+    dropped = []
+    if retain_months > 0:
+        dropped = drop_partitions_before(conn, month_start(today, -retain_months))
+    return created, dropped
+
+def create_partitions_for_table(target, connection, **kw):
+    """after_create hook: a new partitioned table gets its partitions at once"""
+    ensure_partitions(connection, tables=[target.name])
+
+if __name__ == "__main__":
+    import argparse
+    from app.config import settings
+    from app.database.database import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months-ahead", type=int, default=settings.READINGS_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--retain-months", type=int, default=settings.READINGS_RETENTION_MONTHS,
+                        help="0 keeps every partition")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        created, dropped = maintain_partitions(conn, args.months_ahead, args.retain_months)
+    for name in created:
+        print(f"created {name}")
+    for name in dropped:
+        print(f"dropped {name}")
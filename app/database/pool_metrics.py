@@ -0,0 +1,100 @@
+from bisect import bisect_left
+from typing import Any, Dict, List
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+import threading
+import time
+
+# Upper bounds (ms) of the checkout wait histogram buckets; the last bucket
+# is everything slower
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+class PoolMetrics:
+    """Checkout timings and overflow/timeout counts for one pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.overflow_events = 0
+        self.timeouts = 0
+
+    def observe(self, wait_ms: float) -> None:
+        with self._lock:
+            self.bucket_counts[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.checkouts += 1
+            self.wait_ms_total += wait_ms
+            self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def overflowed(self) -> None:
+        with self._lock:
+            self.overflow_events += 1
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def histogram(self) -> List[Dict[str, Any]]:
+        """Cumulative counts per bucket, Prometheus-style (le = upper bound)"""
+        buckets, running = [], 0
+        for bound, count in zip(list(WAIT_BUCKETS_MS) + ["+Inf"], self.bucket_counts):
+            running += count
+            buckets.append({"le": bound, "count": running})
+        return buckets
+
+class InstrumentedPoolMixin:
+    """Times every checkout, including waits for a free connection.
+
+    The time also covers opening a new connection and the pre-ping, which
+    is what a request actually waits for.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timed_out()
+            raise
+        self.metrics.observe((time.perf_counter() - started) * 1000)
+        return connection
+
+    def _create_connection(self):
+        # _overflow counts up from -pool_size and is bumped before each new
+        # connection, so a positive value means this one is beyond pool_size
+        if self._overflow > 0:
+            self.metrics.overflowed()
+        return super()._create_connection()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = self.metrics
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": metrics.checkouts,
+            "overflow_events": metrics.overflow_events,
+            "timeouts": metrics.timeouts,
+            "wait_ms_avg": round(metrics.wait_ms_total / metrics.checkouts, 3) if metrics.checkouts else 0.0,
+            "wait_ms_max": round(metrics.wait_ms_max, 3),
+            "wait_ms_histogram": metrics.histogram()
+        }
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
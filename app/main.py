@@ -2,9 +2,14 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.api.v1.api import api_router
-from app.database.database import engine, Base, SessionLocal
+from app.database.database import engine, async_engine, async_read_engine, Base, SessionLocal
+from app.database.partitions import maintain_partitions
 from app.database.models import User, UserRole, UserStatus
 from app.core.auth import get_password_hash
+from app.core.conditional import SYNC_TOKEN_HEADER
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.services.export_jobs import export_job_runner
+import asyncio
 import logging
 from datetime import datetime
 import sys
@@ -29,6 +34,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, SYNC_TOKEN_HEADER, "Content-Range", "ETag"],
 )
 
 # Include routers
@@ -70,10 +76,65 @@ def create_default_admin():
     finally:
         db.close()
 
+def maintain_reading_partitions():
+    """Create reading partitions for the upcoming months and drop those past retention"""
+    try:
+        with engine.begin() as conn:
+            created, dropped = maintain_partitions(
+                conn, settings.READINGS_PARTITION_MONTHS_AHEAD, settings.READINGS_RETENTION_MONTHS
+            )
+        for name in created:
+            logger.info(f"Created partition {name}")
+        for name in dropped:
+            logger.info(f"Dropped partition {name}")
+    except Exception as e:
+        logger.error(f"❌ Error maintaining reading partitions: {e}")
+
+def resume_export_jobs():
+    """Delete expired export files and requeue jobs a restart left pending"""
+    try:
+        removed, requeued = export_job_runner.resume()
+        for path in removed:
+            logger.info(f"Removed expired export {path}")
+        if requeued:
+            logger.info(f"Requeued {requeued} export jobs")
+    except Exception as e:
+        logger.error(f"❌ Error resuming export jobs: {e}")
+
+def purge_expired_exports():
+    """Delete export files past EXPORT_JOB_RETENTION_HOURS"""
+    try:
+        with SessionLocal() as db:
+            removed = export_job_runner.purge_expired(db)
+        for path in removed:
+            logger.info(f"Removed expired export {path}")
+    except Exception as e:
+        logger.error(f"❌ Error purging expired exports: {e}")
+
+async def run_maintenance():
+    """Repeat the upkeep jobs for as long as the process runs; a server
+    outliving READINGS_PARTITION_MONTHS_AHEAD still gets its partitions
+    and export files still expire"""
+    while True:
+        await asyncio.sleep(settings.MAINTENANCE_INTERVAL_SECONDS)
+        await asyncio.to_thread(maintain_reading_partitions)
+        await asyncio.to_thread(purge_expired_exports)
+
 @app.on_event("startup")
 async def startup_event():
     """Run on application startup"""
     create_default_admin()
+    maintain_reading_partitions()
+    resume_export_jobs()
+    app.state.maintenance = asyncio.create_task(run_maintenance())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown"""
+    app.state.maintenance.cancel()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
 
 @app.get("/")
 async def root():
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, validator
+from typing import Optional
+from datetime import date, datetime
+from app.database.models import ExportJobKind
+import uuid
+
+class OperatorPerformance(BaseModel):
+    operator_id: str  # UUID sebagai string
+    operator_name: str
+    total_sessions: int
+    completed_sessions: int
+    active_sessions: int
+    reaction_time_tests: int
+    tympanic_tests: int
+    vitals_tests: int
+    total_trials: int
+    avg_trials_per_session: float
+    last_activity: Optional[datetime]
+
+    @validator('operator_id', pre=True)
+    def convert_uuid_to_string(cls, value):
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return value
+
+class ExportJobCreate(BaseModel):
+    kind: ExportJobKind
+    start_date: date
+    end_date: date
+    operator_id: Optional[uuid.UUID] = None
+    test_type: Optional[str] = None
+
+class ExportJobResponse(BaseModel):
+    id: str
+    kind: str
+    status: str  # pending, running, completed, failed, expired
+    rows_processed: int
+    rows_total: Optional[int] = None  # estimate
+    progress: Optional[float] = None  # rows_processed / rows_total, 0..1
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -50,6 +50,7 @@ class SessionResponse(BaseModel):
     started_at: Optional[datetime]
     ended_at: Optional[datetime]
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 import uuid
 
@@ -12,6 +12,7 @@ class ReactionTrialCreate(BaseModel):
 
 class ReactionTrialBatchCreate(BaseModel):
     trials: List[ReactionTrialCreate]
+    batch_id: Optional[uuid.UUID] = None  # client-generated; retries reuse it
 
 class TympaniReadingCreate(BaseModel):
     temperature: float
@@ -21,6 +22,10 @@ class TympaniReadingCreate(BaseModel):
     environment_temp: Optional[float] = None
     reading_time: Optional[datetime] = None
 
+class TympaniReadingBatchCreate(BaseModel):
+    readings: List[TympaniReadingCreate]
+    batch_id: Optional[uuid.UUID] = None  # client-generated; retries reuse it
+
 class VitalReadingCreate(BaseModel):
     heart_rate: int
     heart_rate_variability: float
@@ -31,6 +36,15 @@ class VitalReadingCreate(BaseModel):
     body_position: Optional[str] = None
     reading_time: Optional[datetime] = None
 
+class VitalReadingBatchCreate(BaseModel):
+    readings: List[VitalReadingCreate]
+    batch_id: Optional[uuid.UUID] = None  # client-generated; retries reuse it
+
+class SyncStateResponse(BaseModel):
+    session_id: str
+    trials_completed: int
+    high_water_marks: Dict[str, int]  # highest stored trial/reading number per stream
+
 class TrialResponse(BaseModel):
     id: str  # UUID sebagai string
     stimulus_type: str
@@ -51,11 +65,19 @@ class TrialResponse(BaseModel):
 
 class TrialStatistics(BaseModel):
     total_trials: int
-    mean_response_time: float
-    min_response_time: int
-    max_response_time: int
-    std_deviation: Optional[float] = None
+    mean_response_time: Optional[float] = None
+    min_response_time: Optional[int] = None
+    max_response_time: Optional[int] = None
+    std_deviation: Optional[float] = None  # sample std; None below 2 trials
+    median_response_time: Optional[float] = None
+    p90_response_time: Optional[float] = None
+    p95_response_time: Optional[float] = None
+    correct: int = 0
+    incorrect: int = 0
+    timeout: int = 0
 
 class SessionStatisticsResponse(BaseModel):
+    session_id: str
     overall: TrialStatistics
-    by_stimulus: dict
\ No newline at end of file
+    by_stimulus: Dict[str, TrialStatistics]  # keyed by stimulus_type
+    by_category: Dict[str, TrialStatistics]  # keyed by stimulus_category
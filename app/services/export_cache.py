@@ -0,0 +1,157 @@
+"""On-disk cache of completed-session exports.
+
+A completed session's trials and readings no longer change, so its export
+files are cached in EXPORT_CACHE_DIR under a key derived from the session
+id, the format and the session's data version (updated_at, which every
+trial/reading ingest bumps). The key doubles as the strong ETag: the same
+key always names the same bytes. Total size is capped at
+EXPORT_CACHE_MAX_BYTES by evicting the least recently used files.
+"""
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Any, AsyncIterator, Dict, Optional, Union
+from app.config import settings
+from app.database.models import Session, SessionStatus
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+# Bump when an export format's bytes change, so stale files are not served
+EXPORT_FORMAT_VERSION = 1
+
+# A .part file not written to for this long was left by a crashed fill;
+# another worker sharing the directory may be filling a younger one
+STALE_PART_SECONDS = 3600
+
+def cacheable(session: Session) -> bool:
+    """Only completed sessions: an active one may still receive data"""
+    return session.status == SessionStatus.COMPLETED and session.updated_at is not None
+
+def cache_key(session: Session, file_format: str) -> str:
+    version = "|".join([
+        str(session.id),
+        file_format,
+        session.updated_at.isoformat(),
+        session.readings_last_at.isoformat() if session.readings_last_at else "",
+        str(session.trials_completed),
+        str(EXPORT_FORMAT_VERSION)
+    ])
+    return hashlib.sha256(version.encode()).hexdigest()
+
+def validators(key: str, session: Session) -> Dict[str, str]:
+    """Strong ETag and Last-Modified headers of a cached export"""
+    return {
+        "ETag": f'"{key[:32]}"',
+        "Last-Modified": format_datetime(session.updated_at.astimezone(timezone.utc), usegmt=True)
+    }
+
+class ExportCache:
+    """LRU set of export files on local disk, bounded by total size"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._files: Optional["OrderedDict[str, int]"] = None  # file name -> size, oldest use first
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _index(self) -> "OrderedDict[str, int]":
+        """Files already on disk, loaded on first use, least recently used
+        first; stale partial files are deleted on the way"""
+        if self._files is None:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            stale_before = time.time() - STALE_PART_SECONDS
+            for entry in os.scandir(self.directory):
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if entry.name.endswith(".part"):
+                    if stat.st_mtime < stale_before:
+                        try:
+                            os.remove(entry.path)
+                        except FileNotFoundError:
+                            pass
+                    continue
+                entries.append((stat.st_atime, entry.name, stat.st_size))
+            self._files = OrderedDict((name, size) for _atime, name, size in sorted(entries))
+            self._size = sum(self._files.values())
+        return self._files
+
+    def get(self, key: str, extension: str) -> Optional[str]:
+        """Path of the cached file, marked as just used"""
+        name = f"{key}.{extension}"
+        with self._lock:
+            files = self._index()
+            if name in files:
+                path = os.path.join(self.directory, name)
+                if os.path.exists(path):
+                    files.move_to_end(name)
+                    self.hits += 1
+                    return path
+                self._size -= files.pop(name)
+            self.misses += 1
+            return None
+
+    async def fill(self, key: str, extension: str, chunks: AsyncIterator[Union[str, bytes]]) -> AsyncIterator[Union[str, bytes]]:
+        """Pass ``chunks`` through while writing them to the cache.
+
+        The file only enters the cache once every chunk was written; an
+        interrupted download leaves nothing behind.
+        """
+        name = f"{key}.{extension}"
+        with self._lock:
+            self._index()
+        partial = os.path.join(self.directory, f"{name}.{uuid.uuid4().hex}.part")
+        complete = False
+        try:
+            # Buffered local writes, small next to producing the chunks
+            with open(partial, "wb") as output:
+                async for chunk in chunks:
+                    output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+                    yield chunk
+            complete = True
+        finally:
+            if complete:
+                os.replace(partial, os.path.join(self.directory, name))
+                self._add(name, os.path.getsize(os.path.join(self.directory, name)))
+            elif os.path.exists(partial):
+                os.remove(partial)
+
+    def _add(self, name: str, size: int) -> None:
+        with self._lock:
+            files = self._index()
+            if name in files:
+                self._size -= files.pop(name)
+            files[name] = size
+            self._size += size
+            # Evict least recently used files; a file bigger than the whole
+            # cap evicts itself too
+            while self._size > self.max_bytes and files:
+                evicted, evicted_size = files.popitem(last=False)
+                self._size -= evicted_size
+                self.evictions += 1
+                try:
+                    os.remove(os.path.join(self.directory, evicted))
+                except FileNotFoundError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            files = self._index()
+            return {
+                "files": len(files),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+export_cache = ExportCache(settings.EXPORT_CACHE_DIR, settings.EXPORT_CACHE_MAX_BYTES)
@@ -0,0 +1,291 @@
+"""Background export jobs.
+
+An admin export request becomes an ExportJob row; its id goes to the
+runner, a small thread pool (EXPORT_JOB_WORKERS) whose workers each run a
+job on their own event loop and database engines. The ExportService output
+is streamed into EXPORT_JOB_DIR and progress is written to the job row, so
+any API process can report it. A repeated request from the same admin with
+the same parameters joins the queued, running or still-retained job.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.config import settings
+from app.database.database import SessionLocal, async_database_url
+from app.database.models import ExportJob, ExportJobKind, ExportJobStatus
+from app.services.export_service import COLUMNAR_MEDIA_TYPES, ColumnarFormat, ExportService
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress writes of a running job; they double as its heartbeat
+PROGRESS_INTERVAL = 1.0
+# A running job without a heartbeat for this long is considered dead
+STALL_SECONDS = 300
+
+MEDIA_TYPES = {
+    ExportJobKind.RAW_DATA_ZIP: "application/zip",
+    ExportJobKind.SESSIONS_PARQUET: COLUMNAR_MEDIA_TYPES[ColumnarFormat.PARQUET],
+    ExportJobKind.SESSIONS_ARROW: COLUMNAR_MEDIA_TYPES[ColumnarFormat.ARROW],
+}
+
+def job_params(
+    start_date: date,
+    end_date: date,
+    operator_id: Optional[uuid.UUID] = None,
+    test_type: Optional[str] = None
+) -> Dict[str, Any]:
+    """JSON form of the export filters, as stored in ExportJob.params"""
+    return {
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "operator_id": str(operator_id) if operator_id else None,
+        "test_type": test_type
+    }
+
+def params_hash(kind: ExportJobKind, params: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps({"kind": kind.value, **params}, sort_keys=True).encode()).hexdigest()
+
+def retention_cutoff() -> datetime:
+    """Jobs that finished before this have expired"""
+    return datetime.now(timezone.utc) - timedelta(hours=settings.EXPORT_JOB_RETENTION_HOURS)
+
+def export_filename(job: ExportJob) -> str:
+    """Download name, e.g. ``sessions_export_2026-01-01_2026-01-31.parquet``"""
+    stem, extension = job.kind.value.split(".")
+    prefix = "raw_data" if job.kind == ExportJobKind.RAW_DATA_ZIP else f"{stem}_export"
+    return f"{prefix}_{job.params['start_date']}_{job.params['end_date']}.{extension}"
+
+def _filters(params: Dict[str, Any]) -> Tuple[date, date, Optional[uuid.UUID], Optional[str]]:
+    return (
+        date.fromisoformat(params["start_date"]),
+        date.fromisoformat(params["end_date"]),
+        uuid.UUID(params["operator_id"]) if params["operator_id"] else None,
+        params["test_type"]
+    )
+
+def _stream(
+    export_service: ExportService,
+    kind: ExportJobKind,
+    admin_id: uuid.UUID,
+    params: Dict[str, Any],
+    on_rows: Callable[[int], None]
+) -> AsyncIterator[bytes]:
+    start_date, end_date, operator_id, test_type = _filters(params)
+    if kind == ExportJobKind.RAW_DATA_ZIP:
+        return export_service.stream_sessions_zip(
+            admin_id, start_date, end_date, operator_id, test_type, on_rows=on_rows
+        )
+    file_format = ColumnarFormat.PARQUET if kind == ExportJobKind.SESSIONS_PARQUET else ColumnarFormat.ARROW
+    return export_service.stream_sessions_columnar(
+        admin_id, start_date, end_date, file_format, operator_id, test_type, on_rows=on_rows
+    )
+
+class ExportJobService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def submit(self, admin_id: uuid.UUID, kind: ExportJobKind, params: Dict[str, Any]) -> Tuple[Optional[ExportJob], bool]:
+        """The admin's matching queued, running or retained job, or a new one.
+
+        Returns (job, created); the caller commits and hands new jobs to
+        the runner. The partial unique index on active jobs settles two
+        identical requests racing each other: the loser joins the winner's
+        job, or tries once more if that job already finished and left the
+        index. Returns (None, False) when the retry collides as well.
+        """
+        digest = params_hash(kind, params)
+        for _attempt in range(2):
+            job = await self._reusable(admin_id, digest)
+            if job is not None:
+                return job, False
+
+            job = ExportJob(
+                requested_by=admin_id,
+                kind=kind,
+                params=params,
+                params_hash=digest,
+                status=ExportJobStatus.PENDING,
+                rows_processed=0
+            )
+            self.db.add(job)
+            try:
+                await self.db.flush()
+            except IntegrityError:
+                await self.db.rollback()
+                continue
+            return job, True
+        return None, False
+
+    async def get(self, job_id: uuid.UUID, admin_id: uuid.UUID) -> Optional[ExportJob]:
+        result = await self.db.execute(select(ExportJob).where(
+            ExportJob.id == job_id,
+            ExportJob.requested_by == admin_id
+        ))
+        return result.scalars().first()
+
+    async def _reusable(self, admin_id: uuid.UUID, digest: str) -> Optional[ExportJob]:
+        result = await self.db.execute(select(ExportJob).where(
+            ExportJob.requested_by == admin_id,
+            ExportJob.params_hash == digest,
+            ExportJob.status.in_([ExportJobStatus.PENDING, ExportJobStatus.RUNNING, ExportJobStatus.COMPLETED])
+        ).order_by(ExportJob.created_at.desc()))
+
+        now = datetime.now(timezone.utc)
+        for job in result.scalars():
+            if job.status == ExportJobStatus.COMPLETED:
+                retained = job.finished_at >= retention_cutoff()
+                if retained and os.path.exists(job.file_path):
+                    return job
+            elif job.status == ExportJobStatus.RUNNING and job.updated_at < now - timedelta(seconds=STALL_SECONDS):
+                # Its worker died with the process; free the active slot
+                job.status = ExportJobStatus.FAILED
+                job.error = "Export stopped making progress"
+                job.finished_at = now
+                await self.db.flush()
+            else:
+                return job
+        return None
+
+class ExportJobRunner:
+    """Thread pool that produces export files, one event loop per job"""
+
+    def __init__(self, workers: int, export_dir: str):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export")
+        self.export_dir = export_dir
+        self.database_url = settings.DATABASE_URL
+        self.read_database_url = settings.DATABASE_READ_URL or settings.DATABASE_URL
+
+    def submit(self, job_id: uuid.UUID) -> Future:
+        return self.executor.submit(self._run_in_thread, job_id)
+
+    def _run_in_thread(self, job_id: uuid.UUID) -> None:
+        asyncio.run(self.run(job_id))
+
+    async def run(self, job_id: uuid.UUID) -> None:
+        """Claim a pending job and produce its file; a job another worker
+        already claimed is left alone"""
+        # Engines are bound to the event loop that creates them, so each job
+        # gets its own; NullPool since a job holds one connection throughout
+        primary = create_async_engine(async_database_url(self.database_url), poolclass=NullPool)
+        read = primary
+        if self.read_database_url != self.database_url:
+            read = create_async_engine(async_database_url(self.read_database_url), poolclass=NullPool)
+        try:
+            async with AsyncSession(primary, expire_on_commit=False) as db:
+                claimed = await db.execute(
+                    update(ExportJob)
+                    .where(ExportJob.id == job_id, ExportJob.status == ExportJobStatus.PENDING)
+                    .values(status=ExportJobStatus.RUNNING, started_at=func.now(), updated_at=func.now())
+                    .returning(ExportJob.requested_by, ExportJob.kind, ExportJob.params)
+                )
+                job = claimed.first()
+                await db.commit()
+                if job is None:
+                    return
+                try:
+                    await self._produce(db, read, job_id, job)
+                except Exception as e:
+                    logger.exception(f"Export job {job_id} failed")
+                    await db.rollback()
+                    await self._update(
+                        db, job_id,
+                        status=ExportJobStatus.FAILED,
+                        error=str(e) or e.__class__.__name__,
+                        finished_at=func.now()
+                    )
+        finally:
+            await primary.dispose()
+            if read is not primary:
+                await read.dispose()
+
+    async def _produce(self, db: AsyncSession, read_engine, job_id: uuid.UUID, job) -> None:
+        kind = ExportJobKind(job.kind)
+        raw_data = kind == ExportJobKind.RAW_DATA_ZIP
+        os.makedirs(self.export_dir, exist_ok=True)
+        path = os.path.join(self.export_dir, f"{job_id}.{kind.value.split('.')[-1]}")
+        partial = f"{path}.part"
+
+        processed = 0
+        def on_rows(rows: int) -> None:
+            nonlocal processed
+            processed += rows
+
+        async with AsyncSession(read_engine) as read_db:
+            export_service = ExportService(read_db)
+            total = await export_service.estimate_rows(job.requested_by, *_filters(job.params), raw_data=raw_data)
+            await self._update(db, job_id, rows_total=total)
+
+            reported_at = time.monotonic()
+            try:
+                # Plain blocking writes: this loop runs on the job's own thread
+                with open(partial, "wb") as output:
+                    async for data in _stream(export_service, kind, job.requested_by, job.params, on_rows):
+                        output.write(data)
+                        if time.monotonic() - reported_at >= PROGRESS_INTERVAL:
+                            await self._update(db, job_id, rows_processed=processed)
+                            reported_at = time.monotonic()
+            except BaseException:
+                if os.path.exists(partial):
+                    os.remove(partial)
+                raise
+
+        os.replace(partial, path)
+        await self._update(
+            db, job_id,
+            status=ExportJobStatus.COMPLETED,
+            rows_processed=processed,
+            file_path=path,
+            file_size=os.path.getsize(path),
+            finished_at=func.now()
+        )
+
+    async def _update(self, db: AsyncSession, job_id: uuid.UUID, **values) -> None:
+        await db.execute(
+            update(ExportJob).where(ExportJob.id == job_id).values(updated_at=func.now(), **values)
+        )
+        await db.commit()
+
+    def purge_expired(self, db: Session) -> List[str]:
+        """Delete files past retention and mark their jobs expired; returns
+        the removed files"""
+        removed = []
+        expired = db.execute(select(ExportJob).where(
+            ExportJob.status == ExportJobStatus.COMPLETED,
+            ExportJob.finished_at < retention_cutoff()
+        )).scalars().all()
+        for job in expired:
+            if job.file_path and os.path.exists(job.file_path):
+                os.remove(job.file_path)
+                removed.append(job.file_path)
+            job.status = ExportJobStatus.EXPIRED
+            job.file_path = None
+        db.commit()
+        return removed
+
+    def resume(self) -> Tuple[List[str], int]:
+        """Startup: delete files past retention and requeue jobs still pending.
+
+        Returns (removed files, requeued job count).
+        """
+        with SessionLocal() as db:
+            removed = self.purge_expired(db)
+            pending = db.execute(
+                select(ExportJob.id).where(ExportJob.status == ExportJobStatus.PENDING).order_by(ExportJob.created_at)
+            ).scalars().all()
+        for job_id in pending:
+            self.submit(job_id)
+        return removed, len(pending)
+
+export_job_runner = ExportJobRunner(settings.EXPORT_JOB_WORKERS, settings.EXPORT_JOB_DIR)
@@ -1,67 +1,290 @@
 import csv
+import enum
 import io
+import json
+import zipfile
 from datetime import datetime, date
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from app.database.models import Session, ReactionTrial, TympaniReading, VitalReading, User
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from app.database.models import (
+    Session, SessionStatus, TestType, ReactionTrial, TympaniReading, VitalReading, User, UserRole,
+    StimulusType, StimulusCategory
+)
+from app.services.trial_service import readings_window
+import pyarrow as pa
+import pyarrow.parquet as pq
 import uuid
 
+# Rows fetched per server-side cursor round trip while streaming exports
+EXPORT_CHUNK_SIZE = 500
+
+# Rows per Parquet row group / Arrow record batch; columnar formats need
+# larger batches than CSV for compression and fast reads to pay off
+COLUMNAR_CHUNK_SIZE = 10000
+
+class ColumnarFormat(str, enum.Enum):
+    PARQUET = "parquet"
+    ARROW = "arrow"  # Arrow IPC file (Feather v2)
+
+COLUMNAR_MEDIA_TYPES = {
+    ColumnarFormat.PARQUET: "application/vnd.apache.parquet",
+    ColumnarFormat.ARROW: "application/vnd.apache.arrow.file",
+}
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# Enum columns are dictionary-encoded
+ENUM = pa.dictionary(pa.int8(), pa.string())
+
+def _enum_column(enum_class, values: List[Any]) -> pa.Array:
+    """Dictionary array over every member, so all batches share one dictionary"""
+    members = [member.value for member in enum_class]
+    index = {value: position for position, value in enumerate(members)}
+    return pa.DictionaryArray.from_arrays(
+        pa.array([None if value is None else index[_value(value)] for value in values], pa.int8()),
+        pa.array(members, pa.string())
+    )
+
+def _float(value: Any) -> Optional[float]:
+    """DECIMAL columns as float64; NULL stays null"""
+    return None if value is None else float(value)
+
+# Typed columns per session test type: (name, Arrow type or enum class, value getter)
+ARROW_COLUMNS: Dict[str, List[tuple]] = {
+    "reaction_time": [
+        ("trial_number", pa.int32(), lambda trial: trial.trial_number),
+        ("stimulus_type", StimulusType, lambda trial: trial.stimulus_type),
+        ("stimulus_category", StimulusCategory, lambda trial: trial.stimulus_category),
+        ("response_time_ms", pa.int32(), lambda trial: trial.response_time),
+        ("reaction_type", pa.string(), lambda trial: trial.reaction_type),
+        ("created_at", TIMESTAMP, lambda trial: trial.created_at),
+    ],
+    "tympanic": [
+        ("reading_number", pa.int32(), lambda reading: reading.reading_number),
+        ("temperature_c", pa.float64(), lambda reading: _float(reading.temperature)),
+        ("measurement_phase", pa.string(), lambda reading: reading.measurement_phase),
+        ("body_position", pa.string(), lambda reading: reading.body_position),
+        ("environment_temp_c", pa.float64(), lambda reading: _float(reading.environment_temp)),
+        ("reading_time", TIMESTAMP, lambda reading: reading.reading_time),
+    ],
+    "vitals": [
+        ("reading_number", pa.int32(), lambda reading: reading.reading_number),
+        ("heart_rate_bpm", pa.int32(), lambda reading: reading.heart_rate),
+        ("heart_rate_variability", pa.float64(), lambda reading: _float(reading.heart_rate_variability)),
+        ("spo2_percent", pa.int32(), lambda reading: reading.spo2),
+        ("measurement_phase", pa.string(), lambda reading: reading.measurement_phase),
+        ("activity_context", pa.string(), lambda reading: reading.activity_context),
+        ("body_position", pa.string(), lambda reading: reading.body_position),
+        ("reading_time", TIMESTAMP, lambda reading: reading.reading_time),
+    ],
+    "sessions": [
+        ("session_code", pa.string(), lambda session: session.session_code),
+        ("operator", pa.string(), lambda session: session.operator.full_name),
+        ("respondent", pa.string(), lambda session: session.respondent.guest_name),
+        ("test_type", TestType, lambda session: session.test_type),
+        ("status", SessionStatus, lambda session: session.status),
+        ("device", pa.string(), lambda session: session.device_name),
+        ("started_at", TIMESTAMP, lambda session: session.started_at),
+        ("ended_at", TIMESTAMP, lambda session: session.ended_at),
+        ("trials_completed", pa.int32(), lambda session: session.trials_completed),
+        ("measurement_context", pa.string(), lambda session: session.measurement_context),
+        ("environment_notes", pa.string(), lambda session: session.environment_notes),
+    ],
+}
+
+def arrow_schema(columns: List[tuple]) -> pa.Schema:
+    return pa.schema([
+        pa.field(name, ENUM if isinstance(kind, type) else kind)
+        for name, kind, _getter in columns
+    ])
+
+def record_batch(schema: pa.Schema, columns: List[tuple], records: List[Any]) -> pa.RecordBatch:
+    """One record batch from a chunk of ORM records, column by column"""
+    arrays = []
+    for name, kind, getter in columns:
+        values = [getter(record) for record in records]
+        arrays.append(_enum_column(kind, values) if isinstance(kind, type) else pa.array(values, kind))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back in chunks.
+
+    Keeps its own position, since the Parquet and Arrow file writers record
+    byte offsets in their footers while earlier chunks are already sent.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+def _value(value: Any) -> Any:
+    """Plain value for enum columns (``StimulusType.RED`` -> ``"red"``)"""
+    return value.value if isinstance(value, enum.Enum) else value
+
+def _drain(output: io.StringIO) -> str:
+    """Return buffered CSV text and reset the buffer for reuse"""
+    chunk = output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+    return chunk
+
 class ExportService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def export_session_to_csv(self, session_id: uuid.UUID) -> tuple[str, str]:
+    async def export_session_to_csv(self, session_id: uuid.UUID) -> tuple[str, str]:
         """Export session data to CSV format"""
-        session = self.db.query(Session).filter(Session.id == session_id).first()
+        result = await self.db.execute(select(Session).where(Session.id == session_id))
+        session = result.scalars().first()
         if not session:
             raise ValueError("Session not found")
         
+        csv_content = "".join([chunk async for chunk in self.stream_session_csv(session)])
+        filename = self.session_export_filename(session, "csv")
+        
+        return csv_content, filename
+    
+    async def stream_session_csv(self, session: Session, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[str]:
+        """Yield session data as CSV text, one chunk per server-side fetch"""
+        async for chunk, _rows in self._session_csv_chunks(session, chunk_size):
+            yield chunk
+    
+    async def _session_csv_chunks(self, session: Session, chunk_size: int) -> AsyncIterator[tuple[str, int]]:
+        """CSV text chunks of the session's raw data, with the number of data rows in each"""
+        rows = self._session_rows(session)
+        if rows is None:
+            return
+        header, query, to_row = rows
+        
         output = io.StringIO()
         writer = csv.writer(output)
         
-        if session.test_type == "reaction_time":
-            writer.writerow(["Trial Number", "Stimulus Type", "Stimulus Category", "Response Time (ms)", "Reaction Type", "Timestamp"])
-            
-            trials = self.db.query(ReactionTrial).filter(
-                ReactionTrial.session_id == session_id
-            ).order_by(ReactionTrial.trial_number).all()
+        # Header goes out before the first fetch so the client sees bytes immediately
+        writer.writerow(header)
+        yield _drain(output), 0
+        
+        # stream() + yield_per runs on a server-side cursor, so only one
+        # partition of ORM rows is alive at any time
+        result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        async for records in result.scalars().partitions():
+            for record in records:
+                writer.writerow(to_row(record))
+            yield _drain(output), len(records)
+    
+    async def stream_session_columnar(
+        self,
+        session: Session,
+        file_format: ColumnarFormat,
+        chunk_size: int = COLUMNAR_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yield session data as Parquet or Arrow IPC bytes, one row group /
+        record batch per server-side fetch. Needs has_raw_data(session)."""
+        _header, query, _to_row = self._session_rows(session)
+        async for chunk in self._stream_columnar(query, ARROW_COLUMNS[_value(session.test_type)], file_format, chunk_size):
+            yield chunk
+    
+    def has_raw_data(self, session: Session) -> bool:
+        """Whether the session's test type has a single raw-data table to export"""
+        return self._session_rows(session) is not None
+    
+    async def _stream_columnar(
+        self,
+        query: Select,
+        columns: List[tuple],
+        file_format: ColumnarFormat,
+        chunk_size: int,
+        on_rows: Optional[Callable[[int], None]] = None
+    ) -> AsyncIterator[bytes]:
+        """Write query results through a Parquet/Arrow writer; ``on_rows`` is
+        called with the number of rows in each batch, for progress reports"""
+        schema = arrow_schema(columns)
+        sink = _ChunkSink()
+        if file_format == ColumnarFormat.PARQUET:
+            writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        
+        try:
+            result = await self.db.stream(query.execution_options(yield_per=chunk_size))
+            async for records in result.scalars().partitions():
+                writer.write_batch(record_batch(schema, columns, records))
+                if on_rows:
+                    on_rows(len(records))
+                yield sink.drain()
+        finally:
+            writer.close()
+        # The footer is written on close
+        yield sink.drain()
+    
+    def session_export_filename(self, session: Session, extension: str) -> str:
+        test_type = _value(session.test_type)
+        return f"{session.session_code}_{test_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    
+    def _session_rows(self, session: Session) -> Optional[tuple[List[str], Select, Callable[[Any], list]]]:
+        """Header, ordered query and row formatter for the session's test type"""
+        test_type = _value(session.test_type)
+        
+        if test_type == "reaction_time":
+            header = ["Trial Number", "Stimulus Type", "Stimulus Category", "Response Time (ms)", "Reaction Type", "Timestamp"]
+            query = select(ReactionTrial).where(
+                ReactionTrial.session_id == session.id
+            ).order_by(ReactionTrial.trial_number)
             
-            for trial in trials:
-                writer.writerow([
+            def to_row(trial):
+                return [
                     trial.trial_number,
-                    trial.stimulus_type,
-                    trial.stimulus_category,
+                    _value(trial.stimulus_type),
+                    _value(trial.stimulus_category),
                     trial.response_time,
                     trial.reaction_type,
                     trial.created_at.isoformat()
-                ])
+                ]
         
-        elif session.test_type == "tympanic":
-            writer.writerow(["Reading Number", "Temperature (°C)", "Measurement Phase", "Body Position", "Environment Temp", "Timestamp"])
-            
-            readings = self.db.query(TympaniReading).filter(
-                TympaniReading.session_id == session_id
-            ).order_by(TympaniReading.reading_number).all()
+        elif test_type == "tympanic":
+            header = ["Reading Number", "Temperature (°C)", "Measurement Phase", "Body Position", "Environment Temp", "Timestamp"]
+            query = select(TympaniReading).where(
+                TympaniReading.session_id == session.id,
+                readings_window(TympaniReading, session)
+            ).order_by(TympaniReading.reading_number)
             
-            for reading in readings:
-                writer.writerow([
+            def to_row(reading):
+                return [
                     reading.reading_number,
                     float(reading.temperature),
                     reading.measurement_phase or "",
                     reading.body_position or "",
                     float(reading.environment_temp) if reading.environment_temp else "",
                     reading.reading_time.isoformat()
-                ])
+                ]
         
-        elif session.test_type == "vitals":
-            writer.writerow(["Reading Number", "Heart Rate (BPM)", "HRV", "SpO2 (%)", "Measurement Phase", "Activity Context", "Body Position", "Timestamp"])
+        elif test_type == "vitals":
+            header = ["Reading Number", "Heart Rate (BPM)", "HRV", "SpO2 (%)", "Measurement Phase", "Activity Context", "Body Position", "Timestamp"]
+            query = select(VitalReading).where(
+                VitalReading.session_id == session.id,
+                readings_window(VitalReading, session)
+            ).order_by(VitalReading.reading_number)
             
-            readings = self.db.query(VitalReading).filter(
-                VitalReading.session_id == session_id
-            ).order_by(VitalReading.reading_number).all()
-            
-            for reading in readings:
-                writer.writerow([
+            def to_row(reading):
+                return [
                     reading.reading_number,
                     reading.heart_rate,
                     float(reading.heart_rate_variability) if reading.heart_rate_variability else "",
@@ -70,14 +293,15 @@ class ExportService:
                     reading.activity_context or "",
                     reading.body_position or "",
                     reading.reading_time.isoformat()
-                ])
+                ]
         
-        csv_content = output.getvalue()
-        filename = f"{session.session_code}_{session.test_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        else:
+            # Combined sessions have no single raw-data table
+            return None
         
-        return csv_content, filename
+        return header, query, to_row
     
-    def export_sessions_to_csv(
+    async def export_sessions_to_csv(
         self,
         admin_id: uuid.UUID,
         start_date: date,
@@ -86,25 +310,10 @@ class ExportService:
         test_type: Optional[str] = None
     ) -> tuple[str, str]:
         """Export multiple sessions to CSV format"""
-        # Get managed operators
-        managed_operators = self.db.query(User.id).filter(
-            User.created_by == admin_id,
-            User.role == UserRole.OPERATOR
-        ).subquery()
+        query = self.sessions_query(admin_id, start_date, end_date, operator_id, test_type)
         
-        query = self.db.query(Session).filter(
-            Session.operator_id.in_(managed_operators),
-            Session.created_at >= start_date,
-            Session.created_at <= end_date
-        )
-        
-        if operator_id:
-            query = query.filter(Session.operator_id == operator_id)
-        
-        if test_type:
-            query = query.filter(Session.test_type == test_type)
-        
-        sessions = query.order_by(Session.created_at).all()
+        result = await self.db.execute(query)
+        sessions = result.scalars().all()
         
         output = io.StringIO()
         writer = csv.writer(output)
@@ -135,17 +344,208 @@ class ExportService:
         
         return csv_content, filename
     
-    def export_operator_performance(
+    def sessions_query(
+        self,
+        admin_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        operator_id: Optional[uuid.UUID] = None,
+        test_type: Optional[str] = None
+    ) -> Select:
+        """Sessions of the admin's operators in a date range, oldest first"""
+        return select(Session).options(
+            joinedload(Session.operator),
+            joinedload(Session.respondent)
+        ).where(
+            *self._sessions_filter(admin_id, start_date, end_date, operator_id, test_type)
+        ).order_by(Session.created_at)
+    
+    def _sessions_filter(
+        self,
+        admin_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        operator_id: Optional[uuid.UUID] = None,
+        test_type: Optional[str] = None
+    ) -> List[Any]:
+        # Get managed operators
+        managed_operators = select(User.id).where(
+            User.created_by == admin_id,
+            User.role == UserRole.OPERATOR
+        )
+        
+        conditions = [
+            Session.operator_id.in_(managed_operators),
+            Session.created_at >= start_date,
+            Session.created_at <= end_date
+        ]
+        
+        if operator_id:
+            conditions.append(Session.operator_id == operator_id)
+        
+        if test_type:
+            conditions.append(Session.test_type == test_type)
+        
+        return conditions
+    
+    async def estimate_rows(
+        self,
+        admin_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        operator_id: Optional[uuid.UUID] = None,
+        test_type: Optional[str] = None,
+        raw_data: bool = False
+    ) -> int:
+        """Rows a sessions export will write: sessions, or with ``raw_data``
+        the trials/readings of those sessions (counted from the
+        (session_id, number) unique indexes)"""
+        conditions = self._sessions_filter(admin_id, start_date, end_date, operator_id, test_type)
+        if not raw_data:
+            return (await self.db.execute(select(func.count()).select_from(Session).where(*conditions))).scalar_one()
+        
+        total = 0
+        for session_type, model in (
+            (TestType.REACTION_TIME, ReactionTrial),
+            (TestType.TYMPANIC, TympaniReading),
+            (TestType.VITALS, VitalReading)
+        ):
+            session_ids = select(Session.id).where(*conditions, Session.test_type == session_type)
+            query = select(func.count()).select_from(model).where(model.session_id.in_(session_ids))
+            total += (await self.db.execute(query)).scalar_one()
+        return total
+    
+    def stream_sessions_columnar(
+        self,
+        admin_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        file_format: ColumnarFormat,
+        operator_id: Optional[uuid.UUID] = None,
+        test_type: Optional[str] = None,
+        chunk_size: int = COLUMNAR_CHUNK_SIZE,
+        on_rows: Optional[Callable[[int], None]] = None
+    ) -> AsyncIterator[bytes]:
+        """Session metadata of a date range as Parquet or Arrow IPC bytes"""
+        query = self.sessions_query(admin_id, start_date, end_date, operator_id, test_type)
+        return self._stream_columnar(query, ARROW_COLUMNS["sessions"], file_format, chunk_size, on_rows)
+    
+    async def stream_sessions_zip(
+        self,
+        admin_id: uuid.UUID,
+        start_date: date,
+        end_date: date,
+        operator_id: Optional[uuid.UUID] = None,
+        test_type: Optional[str] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        on_rows: Optional[Callable[[int], None]] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield a ZIP archive with each matching session's raw data as CSV
+        (``<test_type>/<session_code>.csv``) plus ``manifest.json``.
+
+        The archive is written to the response as it is built: entries use
+        data descriptors instead of seeking back, and each entry is fed one
+        server-side fetch at a time, so memory stays bounded by a chunk plus
+        the (one line per session) central directory. ``on_rows`` is called
+        with the number of data rows in each chunk, for progress reports.
+        """
+        query = self.sessions_query(admin_id, start_date, end_date, operator_id, test_type)
+        # Sessions come off a server-side cursor too; each session's raw data
+        # opens a second one in the same transaction while this one waits
+        sessions = await self.db.stream(query.execution_options(yield_per=chunk_size))
+        
+        manifest = []
+        sink = _ChunkSink()
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            async for session in sessions.scalars():
+                entry = {
+                    "file": None,
+                    "session_code": session.session_code,
+                    "operator": session.operator.full_name,
+                    "respondent": session.respondent.guest_name,
+                    "test_type": _value(session.test_type),
+                    "status": _value(session.status),
+                    "started_at": session.started_at.isoformat() if session.started_at else None,
+                    "ended_at": session.ended_at.isoformat() if session.ended_at else None,
+                    "rows": 0
+                }
+                if self.has_raw_data(session):
+                    entry["file"] = f"{entry['test_type']}/{session.session_code}.csv"
+                    with archive.open(entry["file"], "w") as member:
+                        async for chunk, rows in self._session_csv_chunks(session, chunk_size):
+                            member.write(chunk.encode())
+                            entry["rows"] += rows
+                            if on_rows and rows:
+                                on_rows(rows)
+                            # The compressor buffers small writes; only send what it flushed
+                            data = sink.drain()
+                            if data:
+                                yield data
+                manifest.append(entry)
+            
+            archive.writestr("manifest.json", json.dumps({
+                "generated_at": datetime.utcnow().isoformat(),
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "operator_id": str(operator_id) if operator_id else None,
+                "test_type": test_type,
+                "sessions": manifest
+            }, indent=2))
+        # Central directory is written on close
+        yield sink.drain()
+    
+    async def operator_performance(
         self,
         admin_id: uuid.UUID,
         start_date: date,
         end_date: date
-    ) -> tuple[str, str]:
-        """Export operator performance report"""
-        managed_operators = self.db.query(User).filter(
+    ) -> List[Dict[str, Any]]:
+        """Per-operator session counts in one grouped query (one row per managed operator)"""
+        def sessions_where(condition):
+            return func.count(Session.id).filter(condition)
+        
+        query = select(
+            User.id.label("operator_id"),
+            User.full_name.label("operator_name"),
+            func.count(Session.id).label("total_sessions"),
+            sessions_where(Session.status == SessionStatus.COMPLETED).label("completed_sessions"),
+            sessions_where(Session.status == SessionStatus.ACTIVE).label("active_sessions"),
+            sessions_where(Session.test_type == TestType.REACTION_TIME).label("reaction_time_tests"),
+            sessions_where(Session.test_type == TestType.TYMPANIC).label("tympanic_tests"),
+            sessions_where(Session.test_type == TestType.VITALS).label("vitals_tests"),
+            func.coalesce(func.sum(Session.trials_completed), 0).label("total_trials"),
+            func.max(Session.updated_at).label("last_activity")
+        ).select_from(User).outerjoin(
+            # Date filter lives in the join so operators without sessions still get a row
+            Session, and_(
+                Session.operator_id == User.id,
+                Session.created_at >= start_date,
+                Session.created_at <= end_date
+            )
+        ).where(
             User.created_by == admin_id,
             User.role == UserRole.OPERATOR
-        ).all()
+        ).group_by(User.id, User.full_name).order_by(User.full_name)
+        
+        result = await self.db.execute(query)
+        
+        report = []
+        for row in result.mappings():
+            entry = dict(row)
+            total_sessions = entry["total_sessions"]
+            entry["avg_trials_per_session"] = round(entry["total_trials"] / total_sessions, 2) if total_sessions > 0 else 0
+            report.append(entry)
+        
+        return report
+    
+    async def export_operator_performance(
+        self,
+        admin_id: uuid.UUID,
+        start_date: date,
+        end_date: date
+    ) -> tuple[str, str]:
+        """Export operator performance report"""
+        report = await self.operator_performance(admin_id, start_date, end_date)
         
         output = io.StringIO()
         writer = csv.writer(output)
@@ -156,36 +556,18 @@ class ExportService:
             "Total Trials", "Avg Trials per Session", "Last Activity"
         ])
         
-        for operator in managed_operators:
-            sessions = self.db.query(Session).filter(
-                Session.operator_id == operator.id,
-                Session.created_at >= start_date,
-                Session.created_at <= end_date
-            ).all()
-            
-            total_sessions = len(sessions)
-            completed_sessions = len([s for s in sessions if s.status == "completed"])
-            active_sessions = len([s for s in sessions if s.status == "active"])
-            
-            reaction_time_tests = len([s for s in sessions if s.test_type == "reaction_time"])
-            tympanic_tests = len([s for s in sessions if s.test_type == "tympanic"])
-            vitals_tests = len([s for s in sessions if s.test_type == "vitals"])
-            
-            total_trials = sum(s.trials_completed for s in sessions)
-            avg_trials = total_trials / total_sessions if total_sessions > 0 else 0
-            
-            last_activity = max([s.updated_at for s in sessions]) if sessions else None
-            
+        for entry in report:
+            last_activity = entry["last_activity"]
             writer.writerow([
-                operator.full_name,
-                total_sessions,
-                completed_sessions,
-                active_sessions,
-                reaction_time_tests,
-                tympanic_tests,
-                vitals_tests,
-                total_trials,
-                round(avg_trials, 2),
+                entry["operator_name"],
+                entry["total_sessions"],
+                entry["completed_sessions"],
+                entry["active_sessions"],
+                entry["reaction_time_tests"],
+                entry["tympanic_tests"],
+                entry["vitals_tests"],
+                entry["total_trials"],
+                entry["avg_trials_per_session"],
                 last_activity.isoformat() if last_activity else ""
             ])
         
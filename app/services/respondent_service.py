@@ -0,0 +1,59 @@
+from typing import List, Optional
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import Respondent
+import uuid
+
+# Whether the connected database has pg_trgm, looked up once per process
+_trigram_available: Optional[bool] = None
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input only matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+class RespondentService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def trigram_available(self) -> bool:
+        """Whether pg_trgm is installed; it is a contrib extension the
+        database may lack or the migration may not have been allowed to create"""
+        global _trigram_available
+        if _trigram_available is None:
+            result = await self.db.execute(
+                text("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            )
+            _trigram_available = bool(result.scalar())
+        return _trigram_available
+
+    async def search(self, owner_id: uuid.UUID, search: str, page: int = 1, limit: int = 20) -> List[Respondent]:
+        """Respondents of one operator matching a search-box term.
+
+        Matches a substring of guest_name or a prefix of university. With
+        pg_trgm the substring match and the similarity operator (typos) are
+        served by the GIN trigram index and results are ranked by
+        similarity. Where pg_trgm is not installed this is a plain ILIKE,
+        newest first.
+        """
+        term = search.strip()
+        pattern = escape_like(term)
+        name_match = Respondent.guest_name.ilike(f"%{pattern}%", escape="\\")
+        university_match = func.lower(Respondent.university).like(f"{pattern.lower()}%", escape="\\")
+
+        query = select(Respondent).where(Respondent.created_by == owner_id)
+        if await self.trigram_available():
+            query = query.where(
+                or_(name_match, Respondent.guest_name.op("%")(term), university_match)
+            ).order_by(
+                func.similarity(Respondent.guest_name, term).desc(),
+                Respondent.created_at.desc(),
+                Respondent.id.desc()
+            )
+        else:
+            query = query.where(or_(name_match, university_match)).order_by(
+                Respondent.created_at.desc(),
+                Respondent.id.desc()
+            )
+
+        result = await self.db.execute(query.offset((page - 1) * limit).limit(limit))
+        return result.scalars().all()
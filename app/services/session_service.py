@@ -1,6 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional, Dict, Any
-from app.database.models import Session, SessionConfig, SessionStatus, TestType, Respondent, User
+from app.database.models import Session, SessionConfig, SessionStatus, TestType, Respondent, User, UserRole
 from app.core.utils import generate_session_code
 import uuid
 from datetime import datetime
@@ -81,7 +81,10 @@ class SessionService:
             User.role == UserRole.OPERATOR
         ).subquery()
         
-        query = self.db.query(Session).filter(Session.operator_id.in_(managed_operators))
+        query = self.db.query(Session).options(
+            joinedload(Session.operator),
+            joinedload(Session.respondent)
+        ).filter(Session.operator_id.in_(managed_operators))
         
         if operator_id:
             query = query.filter(Session.operator_id == operator_id)
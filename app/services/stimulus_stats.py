@@ -0,0 +1,244 @@
+"""Running reaction-time statistics per session and stimulus.
+
+session_stimulus_stats keeps one row per (session, stimulus_type,
+stimulus_category) with the trial count, mean, M2 (sum of squared
+deviations from the mean), min/max and the correct/incorrect/timeout split.
+Trial ingestion summarises each batch and merges it into those rows with
+the parallel form of Welford's update (Chan et al.), so reading a session's
+statistics costs one row per stimulus however many trials it has.
+
+Verify the summaries against reaction_trials and rebuild the ones that
+drifted (or every session with --rebuild-all):
+
+    python -m app.services.stimulus_stats [--session ID] [--verify-only] [--rebuild-all]
+"""
+from collections import defaultdict
+from dataclasses import dataclass, replace
+from math import fsum, isclose, sqrt
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import ReactionTrial, SessionStimulusStats, StimulusCategory, StimulusType
+import uuid
+
+OUTCOMES = ("correct", "incorrect", "timeout")
+
+@dataclass(frozen=True)
+class RunningStats:
+    """Mergeable count/mean/M2/min/max summary of a set of response times"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: Optional[int] = None
+    max: Optional[int] = None
+    correct: int = 0
+    incorrect: int = 0
+    timeout: int = 0
+
+    @classmethod
+    def of(cls, response_times: Sequence[int], reaction_types: Sequence[str]) -> "RunningStats":
+        if not response_times:
+            return cls()
+        mean = fsum(response_times) / len(response_times)
+        return cls(
+            count=len(response_times),
+            mean=mean,
+            m2=fsum((time - mean) ** 2 for time in response_times),
+            min=min(response_times),
+            max=max(response_times),
+            **{outcome: reaction_types.count(outcome) for outcome in OUTCOMES}
+        )
+
+    @classmethod
+    def from_summary(cls, summary: SessionStimulusStats) -> "RunningStats":
+        return cls(
+            count=summary.trial_count,
+            mean=summary.mean_response_time,
+            m2=summary.m2,
+            min=summary.min_response_time,
+            max=summary.max_response_time,
+            correct=summary.correct,
+            incorrect=summary.incorrect,
+            timeout=summary.timeout
+        )
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Chan et al.'s pairwise combine; the same formula the upsert runs in SQL"""
+        if not other.count:
+            return self
+        if not self.count:
+            return other
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        return replace(
+            self,
+            count=count,
+            mean=self.mean + delta * other.count / count,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / count,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+            correct=self.correct + other.correct,
+            incorrect=self.incorrect + other.incorrect,
+            timeout=self.timeout + other.timeout
+        )
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation; None below two trials"""
+        if self.count < 2:
+            return None
+        return sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    def as_statistics(self) -> Dict[str, Any]:
+        """Fields of schemas.trials.TrialStatistics"""
+        return {
+            "total_trials": self.count,
+            "mean_response_time": self.mean if self.count else None,
+            "min_response_time": self.min,
+            "max_response_time": self.max,
+            "std_deviation": self.std,
+            "correct": self.correct,
+            "incorrect": self.incorrect,
+            "timeout": self.timeout
+        }
+
+def summarize_trials(rows: Iterable[Dict[str, Any]]) -> Dict[Tuple[StimulusType, StimulusCategory], RunningStats]:
+    """Summaries of a batch of reaction_trials rows per (stimulus_type, stimulus_category)"""
+    groups = defaultdict(lambda: ([], []))
+    for row in rows:
+        key = (StimulusType(row["stimulus_type"]), StimulusCategory(row["stimulus_category"]))
+        groups[key][0].append(row["response_time"])
+        groups[key][1].append(row["reaction_type"])
+    return {key: RunningStats.of(times, outcomes) for key, (times, outcomes) in groups.items()}
+
+async def record_trials(db: AsyncSession, session_id: uuid.UUID, rows: Sequence[Dict[str, Any]]) -> None:
+    """Merge newly stored trials into the session's running statistics.
+
+    The merge runs in ON CONFLICT DO UPDATE, under the summary row's lock,
+    so concurrent batches of one session combine correctly. The caller
+    commits, in the same transaction as the trial insert.
+    """
+    summaries = summarize_trials(rows)
+    if not summaries:
+        return
+    statement = insert(SessionStimulusStats)
+    stats, new = SessionStimulusStats.__table__.c, statement.excluded
+    count = stats.trial_count + new.trial_count
+    delta = new.mean_response_time - stats.mean_response_time
+    statement = statement.on_conflict_do_update(
+        index_elements=["session_id", "stimulus_type", "stimulus_category"],
+        set_={
+            "trial_count": count,
+            "mean_response_time": stats.mean_response_time + delta * new.trial_count / count,
+            "m2": stats.m2 + new.m2 + delta * delta * stats.trial_count * new.trial_count / count,
+            "min_response_time": func.least(stats.min_response_time, new.min_response_time),
+            "max_response_time": func.greatest(stats.max_response_time, new.max_response_time),
+            "correct": stats.correct + new.correct,
+            "incorrect": stats.incorrect + new.incorrect,
+            "timeout": stats.timeout + new.timeout,
+            "updated_at": func.now()
+        }
+    )
+    await db.execute(statement, [
+        {
+            "session_id": session_id,
+            "stimulus_type": stimulus_type,
+            "stimulus_category": stimulus_category,
+            "trial_count": summary.count,
+            "mean_response_time": summary.mean,
+            "m2": summary.m2,
+            "min_response_time": summary.min,
+            "max_response_time": summary.max,
+            "correct": summary.correct,
+            "incorrect": summary.incorrect,
+            "timeout": summary.timeout
+        }
+        for (stimulus_type, stimulus_category), summary in summaries.items()
+    ])
+
+def _raw_summaries(session_ids: Optional[Sequence[uuid.UUID]] = None):
+    """The summary rows recomputed from reaction_trials"""
+    count = func.count()
+    query = select(
+        ReactionTrial.session_id,
+        ReactionTrial.stimulus_type,
+        ReactionTrial.stimulus_category,
+        count.label("trial_count"),
+        func.avg(ReactionTrial.response_time).cast(SessionStimulusStats.mean_response_time.type).label("mean_response_time"),
+        (func.var_pop(ReactionTrial.response_time) * count).cast(SessionStimulusStats.m2.type).label("m2"),
+        func.min(ReactionTrial.response_time).label("min_response_time"),
+        func.max(ReactionTrial.response_time).label("max_response_time"),
+        *[
+            func.count().filter(ReactionTrial.reaction_type == outcome).label(outcome)
+            for outcome in OUTCOMES
+        ]
+    ).group_by(ReactionTrial.session_id, ReactionTrial.stimulus_type, ReactionTrial.stimulus_category)
+    if session_ids is not None:
+        query = query.where(ReactionTrial.session_id.in_(session_ids))
+    return query
+
+def verify(conn: Connection, session_ids: Optional[Sequence[uuid.UUID]] = None) -> List[uuid.UUID]:
+    """Sessions whose summary rows disagree with their raw trials"""
+    raw = {
+        (row.session_id, row.stimulus_type, row.stimulus_category): row
+        for row in conn.execute(_raw_summaries(session_ids))
+    }
+    query = select(SessionStimulusStats.__table__)
+    if session_ids is not None:
+        query = query.where(SessionStimulusStats.session_id.in_(session_ids))
+    stored = {
+        (row.session_id, row.stimulus_type, row.stimulus_category): row
+        for row in conn.execute(query)
+    }
+
+    drifted = set()
+    for key in raw.keys() | stored.keys():
+        expected, actual = raw.get(key), stored.get(key)
+        if expected is None or actual is None:
+            drifted.add(key[0])
+            continue
+        exact = ("trial_count", "min_response_time", "max_response_time", *OUTCOMES)
+        if any(getattr(expected, name) != getattr(actual, name) for name in exact):
+            drifted.add(key[0])
+        elif not (isclose(expected.mean_response_time, actual.mean_response_time, rel_tol=1e-9, abs_tol=1e-6)
+                  and isclose(expected.m2, actual.m2, rel_tol=1e-6, abs_tol=1e-3)):
+            drifted.add(key[0])
+    return sorted(drifted)
+
+def rebuild(conn: Connection, session_ids: Optional[Sequence[uuid.UUID]] = None) -> int:
+    """Replace summary rows (of the given sessions, or all) with ones recomputed
+    from reaction_trials; returns the number of rows written"""
+    statement = delete(SessionStimulusStats)
+    if session_ids is not None:
+        statement = statement.where(SessionStimulusStats.session_id.in_(session_ids))
+    conn.execute(statement)
+    columns = [
+        "session_id", "stimulus_type", "stimulus_category", "trial_count", "mean_response_time",
+        "m2", "min_response_time", "max_response_time", *OUTCOMES
+    ]
+    result = conn.execute(insert(SessionStimulusStats).from_select(columns, _raw_summaries(session_ids)))
+    return result.rowcount
+
+if __name__ == "__main__":
+    import argparse
+    from app.database.database import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--session", type=uuid.UUID, action="append", help="limit to these sessions")
+    parser.add_argument("--verify-only", action="store_true", help="report drift without rebuilding")
+    parser.add_argument("--rebuild-all", action="store_true", help="rebuild without verifying first")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.rebuild_all:
+            print(f"rebuilt {rebuild(conn, args.session)} summary rows")
+        else:
+            drifted = verify(conn, args.session)
+            for session_id in drifted:
+                print(f"drifted {session_id}")
+            if drifted and not args.verify_only:
+                print(f"rebuilt {rebuild(conn, drifted)} summary rows")
+            elif not drifted:
+                print("all summaries match reaction_trials")
@@ -0,0 +1,338 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+from sqlalchemy import false, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from app.database.models import Session, ReactionTrial, SessionStimulusStats, TympaniReading, VitalReading, SyncBatch
+from app.schemas.trials import ReactionTrialCreate, TympaniReadingCreate, VitalReadingCreate
+from app.services.stimulus_stats import RunningStats, record_trials
+import uuid
+
+# Upload streams: table model and the per-session sequence column that
+# identifies an item across retries
+STREAMS = {
+    "reaction_trials": (ReactionTrial, "trial_number"),
+    "tympani_readings": (TympaniReading, "reading_number"),
+    "vital_readings": (VitalReading, "reading_number"),
+}
+
+def readings_window(model, session: Session):
+    """reading_time bounds of a session's readings, so queries on the
+    partitioned reading tables only touch the partitions that hold them"""
+    if session.readings_first_at is None:
+        return false()
+    return model.reading_time.between(session.readings_first_at, session.readings_last_at)
+
+def split_batch(items: Sequence[Any], number_field: str) -> Tuple[List[Any], List[Dict[str, Any]]]:
+    """Separate insertable items from ones rejected by per-item checks.
+
+    Returns (accepted items, rejection reports); each report carries the
+    item's index in the request so the client can resend just those.
+    """
+    accepted, rejected, seen = [], [], set()
+    for index, item in enumerate(items):
+        number = getattr(item, number_field)
+        if number < 1:
+            rejected.append({"index": index, number_field: number, "detail": f"{number_field} must be positive"})
+        elif number in seen:
+            rejected.append({"index": index, number_field: number, "detail": f"Duplicate {number_field} in batch"})
+        else:
+            seen.add(number)
+            accepted.append(item)
+    return accepted, rejected
+
+class TrialService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ingest_batch(
+        self,
+        session: Session,
+        stream: str,
+        items: Sequence[Any],
+        batch_id: Optional[uuid.UUID] = None
+    ) -> Tuple[Dict[str, Any], List[Any]]:
+        """Idempotently store one upload batch for a session stream.
+
+        A batch_id already in the sync_batches ledger is answered from the
+        ledger (a single primary-key probe) without touching the data tables.
+        Items whose trial/reading number is already stored are skipped by
+        the unique index, so replays without a batch_id are no-ops too.
+        Returns the outcome and the rows actually inserted; the caller commits.
+        """
+        _model, number_field = STREAMS[stream]
+        # Read before any rollback below expires the instance
+        session_id = session.id
+
+        if batch_id is not None:
+            replay = await self.db.get(SyncBatch, batch_id)
+            if replay is not None:
+                return self._replay_result(replay, session_id, stream), []
+
+        accepted, rejected = split_batch(items, number_field)
+
+        if batch_id is not None:
+            # Claim the batch id first: a concurrent retry of the same batch
+            # blocks on this key and then replays instead of racing us
+            ledger = SyncBatch(
+                id=batch_id,
+                session_id=session_id,
+                stream=stream,
+                item_count=len(items),
+                recorded=0
+            )
+            self.db.add(ledger)
+            try:
+                await self.db.flush()
+            except IntegrityError:
+                await self.db.rollback()
+                replay = await self.db.get(SyncBatch, batch_id)
+                return self._replay_result(replay, session_id, stream), []
+
+        inserters: Dict[str, Callable] = {
+            "reaction_trials": self.insert_reaction_trials,
+            "tympani_readings": self.insert_tympani_readings,
+            "vital_readings": self.insert_vital_readings,
+        }
+        inserted = await inserters[stream](session, accepted)
+        recorded = len(inserted)
+        duplicates = len(accepted) - recorded
+
+        if batch_id is not None:
+            ledger.recorded = recorded
+            ledger.duplicates = duplicates
+
+        return {
+            "recorded": recorded,
+            "duplicates": duplicates,
+            "rejected": rejected,
+            "replayed": False
+        }, inserted
+
+    async def high_water_marks(self, session: Session) -> Dict[str, int]:
+        """Highest stored trial/reading number per stream (0 when empty).
+
+        Each MAX is answered from the (session_id, number) unique index; the
+        reading streams are bounded to the session's reading_time range so
+        only the partitions holding it are searched.
+        """
+        marks = {}
+        for stream, (model, number_field) in STREAMS.items():
+            column = getattr(model, number_field)
+            query = select(func.coalesce(func.max(column), 0)).where(model.session_id == session.id)
+            if model is not ReactionTrial:
+                query = query.where(readings_window(model, session))
+            marks[stream] = (await self.db.execute(query)).scalar_one()
+        return marks
+
+    async def session_statistics(self, session_id: uuid.UUID, percentiles: bool = True) -> Dict[str, Any]:
+        """Reaction-time statistics of a session: overall, per stimulus_type
+        and per stimulus_category.
+
+        Counts, mean, std, min/max and the outcome split are merged from the
+        session_stimulus_stats rows, one per stimulus, whatever the number
+        of trials. Percentiles can't be kept incrementally: with
+        ``percentiles`` they come from one GROUPING SETS query over the
+        session's trials (percentile_cont), otherwise they are left out.
+        """
+        overall = RunningStats()
+        by_stimulus: Dict[str, RunningStats] = {}
+        by_category: Dict[str, RunningStats] = {}
+        result = await self.db.execute(
+            select(SessionStimulusStats).where(SessionStimulusStats.session_id == session_id)
+        )
+        for summary in result.scalars():
+            stats = RunningStats.from_summary(summary)
+            overall = overall.merge(stats)
+            stimulus, category = summary.stimulus_type.value, summary.stimulus_category.value
+            by_stimulus[stimulus] = by_stimulus.get(stimulus, RunningStats()).merge(stats)
+            by_category[category] = by_category.get(category, RunningStats()).merge(stats)
+
+        statistics = {
+            "session_id": str(session_id),
+            "overall": overall.as_statistics(),
+            "by_stimulus": {key: stats.as_statistics() for key, stats in by_stimulus.items()},
+            "by_category": {key: stats.as_statistics() for key, stats in by_category.items()}
+        }
+        if percentiles and overall.count:
+            await self._add_percentiles(session_id, statistics)
+        return statistics
+
+    async def _add_percentiles(self, session_id: uuid.UUID, statistics: Dict[str, Any]) -> None:
+        response_time = ReactionTrial.response_time
+        query = select(
+            func.grouping(ReactionTrial.stimulus_type, ReactionTrial.stimulus_category).label("level"),
+            ReactionTrial.stimulus_type,
+            ReactionTrial.stimulus_category,
+            func.percentile_cont(0.5).within_group(response_time).label("median"),
+            func.percentile_cont(0.9).within_group(response_time).label("p90"),
+            func.percentile_cont(0.95).within_group(response_time).label("p95")
+        ).where(ReactionTrial.session_id == session_id).group_by(
+            func.grouping_sets(
+                tuple_(),
+                tuple_(ReactionTrial.stimulus_type),
+                tuple_(ReactionTrial.stimulus_category)
+            )
+        )
+        # grouping() sets a bit per column rolled up: 0b11 overall,
+        # 0b01 per stimulus_type, 0b10 per stimulus_category
+        for row in (await self.db.execute(query)).all():
+            if row.level == 0b11:
+                target = statistics["overall"]
+            elif row.level == 0b01:
+                target = statistics["by_stimulus"].get(row.stimulus_type.value)
+            else:
+                target = statistics["by_category"].get(row.stimulus_category.value)
+            if target is not None:
+                target.update(
+                    median_response_time=row.median,
+                    p90_response_time=row.p90,
+                    p95_response_time=row.p95
+                )
+
+    async def insert_reaction_trials(self, session: Session, trials: List[ReactionTrialCreate]) -> List[Any]:
+        """Bulk insert a batch of trials and bump the session's progress counter.
+
+        Uses a Core executemany (batched into multi-row INSERTs by
+        insertmanyvalues) instead of one ORM object per trial. Trials already
+        stored are skipped, and trials_completed and the session's running
+        statistics are updated in SQL with only the trials actually inserted,
+        so retries can't double-count.
+        Returns the inserted rows; the caller commits.
+        """
+        rows: List[Dict[str, Any]] = [
+            {
+                "session_id": session.id,
+                "stimulus_type": trial.stimulus_type,
+                "stimulus_category": trial.stimulus_category,
+                "response_time": trial.response_time,
+                "trial_number": trial.trial_number,
+                "reaction_type": trial.reaction_type
+            }
+            for trial in trials
+        ]
+
+        inserted = await self._insert_rows(ReactionTrial, ["session_id", "trial_number"], rows)
+        if inserted:
+            await record_trials(self.db, session.id, inserted)
+            await self.db.execute(
+                update(Session)
+                .where(Session.id == session.id)
+                .values(trials_completed=Session.trials_completed + len(inserted))
+                .execution_options(synchronize_session=False)
+            )
+
+        return inserted
+
+    async def insert_tympani_readings(self, session: Session, readings: List[TympaniReadingCreate]) -> List[Any]:
+        """Bulk insert tympanic readings in one statement; returns the inserted
+        rows and the caller commits"""
+        received_at = datetime.utcnow()
+        rows = [
+            {
+                "session_id": session.id,
+                "temperature": reading.temperature,
+                "reading_number": reading.reading_number,
+                "measurement_phase": reading.measurement_phase,
+                "body_position": reading.body_position,
+                "environment_temp": reading.environment_temp,
+                "reading_time": reading.reading_time or received_at
+            }
+            for reading in readings
+        ]
+        return await self._insert_readings(session, TympaniReading, rows)
+
+    async def insert_vital_readings(self, session: Session, readings: List[VitalReadingCreate]) -> List[Any]:
+        """Bulk insert vital readings in one statement; returns the inserted
+        rows and the caller commits"""
+        received_at = datetime.utcnow()
+        rows = [
+            {
+                "session_id": session.id,
+                "heart_rate": reading.heart_rate,
+                "heart_rate_variability": reading.heart_rate_variability,
+                "spo2": reading.spo2,
+                "reading_number": reading.reading_number,
+                "measurement_phase": reading.measurement_phase,
+                "activity_context": reading.activity_context,
+                "body_position": reading.body_position,
+                "reading_time": reading.reading_time or received_at
+            }
+            for reading in readings
+        ]
+        return await self._insert_readings(session, VitalReading, rows)
+
+    async def _insert_readings(self, session: Session, model, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Insert tympanic/vital readings not stored yet and widen the session's reading window.
+
+        The reading tables are partitioned by reading_time, so their unique
+        key is (session_id, reading_number, reading_time) and only catches
+        retries that resend the same reading_time. A retried reading that
+        was stamped with the server time on arrival differs there, so numbers
+        already stored for the session are filtered out first, with a lookup
+        bounded to the session's reading window.
+        
+        That lookup only holds while no other batch of the session inserts in
+        between, so the session row is locked (FOR NO KEY UPDATE, which leaves
+        foreign-key inserts alone) until the caller commits.
+        """
+        if not rows:
+            return []
+        result = await self.db.execute(
+            select(Session.readings_first_at).where(Session.id == session.id).with_for_update(key_share=True)
+        )
+        first_at = result.scalar_one()
+        if first_at is not None:
+            numbers = [row["reading_number"] for row in rows]
+            result = await self.db.execute(
+                select(model.reading_number).where(
+                    model.session_id == session.id,
+                    model.reading_number.in_(numbers),
+                    model.reading_time >= first_at
+                )
+            )
+            stored = set(result.scalars().all())
+            rows = [row for row in rows if row["reading_number"] not in stored]
+            if not rows:
+                return []
+
+        inserted = await self._insert_rows(model, ["session_id", "reading_number", "reading_time"], rows)
+        if inserted:
+            times = [row["reading_time"] for row in inserted]
+            # LEAST/GREATEST skip NULLs, so the first batch sets both bounds
+            result = await self.db.execute(
+                update(Session)
+                .where(Session.id == session.id)
+                .values(
+                    readings_first_at=func.least(Session.readings_first_at, min(times)),
+                    readings_last_at=func.greatest(Session.readings_last_at, max(times))
+                )
+                .returning(Session.readings_first_at, Session.readings_last_at)
+                .execution_options(synchronize_session=False)
+            )
+            first_at, last_at = result.one()
+            set_committed_value(session, "readings_first_at", first_at)
+            set_committed_value(session, "readings_last_at", last_at)
+        return inserted
+
+    async def _insert_rows(self, model, conflict_columns: List[str], rows: List[Dict[str, Any]]) -> List[Any]:
+        """INSERT ... ON CONFLICT DO NOTHING; returns the rows that were new, as stored"""
+        if not rows:
+            return []
+        statement = insert(model).on_conflict_do_nothing(
+            index_elements=conflict_columns
+        ).returning(*model.__table__.c)
+        result = await self.db.execute(statement, rows)
+        return result.mappings().all()
+
+    def _replay_result(self, replay: SyncBatch, session_id: uuid.UUID, stream: str) -> Dict[str, Any]:
+        if replay.session_id != session_id or replay.stream != stream:
+            raise ValueError("batch_id was already used for a different upload")
+        return {
+            "recorded": replay.recorded,
+            "duplicates": replay.duplicates,
+            "rejected": [],
+            "replayed": True
+        }
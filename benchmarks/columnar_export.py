@@ -0,0 +1,93 @@
+"""
+Single-session raw-data export: CSV vs Parquet vs Arrow IPC.
+
+Seeds --trials reaction trials (default 100k) into one session of a scratch
+schema of DATABASE_URL, streams each export through ExportService and
+reports the file size, export time and how long pandas takes to load it
+(median of --repeat loads).
+
+    python benchmarks/columnar_export.py --trials 100000 --repeat 10
+"""
+import argparse
+import asyncio
+import io
+import statistics
+import time
+
+import pandas as pd
+from common import async_engine, scratch_schema, seed_session
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.database.models import Session
+from app.services.export_service import ColumnarFormat, ExportService
+
+SEED_SQL = """
+INSERT INTO reaction_trials (id, session_id, stimulus_type, stimulus_category, response_time,
+                             trial_number, reaction_type, created_at)
+SELECT gen_random_uuid(), :session_id,
+       (ARRAY['RED', 'YELLOW', 'BLUE', 'SIREN', 'AMBULANCE', 'GAUGE', 'SPECTRUM'])[1 + n % 7]::stimulustype,
+       (ARRAY['LED', 'LED', 'LED', 'SOUND', 'SOUND', 'VISUAL', 'VISUAL'])[1 + n % 7]::stimuluscategory,
+       150 + (random() * 400)::int,
+       n,
+       (ARRAY['correct', 'correct', 'correct', 'correct', 'incorrect', 'timeout'])[1 + n % 6],
+       now() - (n || ' seconds')::interval
+FROM generate_series(1, :trials) AS n
+"""
+
+LOADERS = {
+    "csv": pd.read_csv,
+    "parquet": pd.read_parquet,
+    "arrow": pd.read_feather,
+}
+
+
+async def export(session_factory, session_id, label):
+    async with session_factory() as db:
+        session = (await db.execute(select(Session).where(Session.id == session_id))).scalars().one()
+        export_service = ExportService(db)
+        if label == "csv":
+            chunks = export_service.stream_session_csv(session)
+            return "".join([chunk async for chunk in chunks]).encode()
+        chunks = export_service.stream_session_columnar(session, ColumnarFormat(label))
+        return b"".join([chunk async for chunk in chunks])
+
+
+def load_ms(label, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        LOADERS[label](io.BytesIO(content))
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def run(args):
+    with scratch_schema(args.schema) as engine:
+        _, session_id = seed_session(engine)
+        with engine.begin() as conn:
+            conn.execute(text(SEED_SQL), {"session_id": session_id, "trials": args.trials})
+
+        db_engine = async_engine(args.schema)
+        session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+        print(f"{'format':>8} {'size KiB':>10} {'export ms':>10} {'load ms (p50)':>14}")
+        for label in LOADERS:
+            started = time.perf_counter()
+            content = await export(session_factory, session_id, label)
+            export_ms = (time.perf_counter() - started) * 1000
+            print(f"{label:>8} {len(content) / 1024:>10.1f} {export_ms:>10.1f} "
+                  f"{load_ms(label, content, args.repeat):>14.2f}")
+
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default="bench_columnar_export")
+    parser.add_argument("--trials", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
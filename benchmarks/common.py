@@ -0,0 +1,66 @@
+"""Shared helpers for the benchmark scripts: scratch schemas and seed rows."""
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from app.database.database import async_database_url
+from app.database.models import Base, User, UserRole, UserStatus, Respondent, Session
+
+
+def sync_engine(schema):
+    """Sync engine whose connections resolve unqualified names in ``schema``"""
+    return create_engine(settings.DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+
+
+def async_engine(schema, **kwargs):
+    """Async (asyncpg) engine whose connections resolve unqualified names in ``schema``"""
+    return create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        connect_args={"server_settings": {"search_path": schema}},
+        **kwargs
+    )
+
+
+@contextmanager
+def scratch_schema(schema, create_tables=True):
+    """Create ``schema`` (optionally with all model tables) and drop it afterwards"""
+    admin_engine = create_engine(settings.DATABASE_URL)
+    with admin_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = sync_engine(schema)
+    try:
+        if create_tables:
+            Base.metadata.create_all(engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with admin_engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        admin_engine.dispose()
+
+
+def seed_session(engine, test_type="reaction_time"):
+    """Insert one operator, respondent and session; returns (operator_id, session_id)"""
+    operator_id, respondent_id, session_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert().values(
+            id=operator_id, username=f"bench-{operator_id}", email=f"{operator_id}@bench",
+            password_hash="x", full_name="Bench Operator", role=UserRole.OPERATOR,
+            status=UserStatus.ACTIVE, platform_access="mobile"
+        ))
+        conn.execute(Respondent.__table__.insert().values(
+            id=respondent_id, guest_name="Bench Respondent", created_by=operator_id
+        ))
+        conn.execute(Session.__table__.insert().values(
+            id=session_id, session_code=f"BENCH-{session_id.hex[:8]}", operator_id=operator_id,
+            respondent_id=respondent_id, test_type=test_type, status="active",
+            trials_completed=0, total_trials=0
+        ))
+    return operator_id, session_id
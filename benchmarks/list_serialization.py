@@ -0,0 +1,125 @@
+"""
+100-row listing pages: the ORM objects validated through the response_model
+and rendered with json (what FastAPI does for GET /mobile/sessions and
+/mobile/respondents without a Response of their own) vs the projected rows
+rendered with orjson by app.core.serialization.
+
+Seeds --rows sessions and respondents for one operator in a scratch schema of
+DATABASE_URL and reports the median time per page: fetch + serialize, and
+serialization alone.
+
+    python benchmarks/list_serialization.py --rows 100 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+from common import async_engine, scratch_schema, seed_session
+from pydantic import TypeAdapter
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.pagination import paginate, split_page
+from app.core.serialization import FastJSONResponse, columns
+from app.database.models import Respondent, Session
+from app.schemas.respondents import RespondentResponse
+from app.schemas.sessions import SessionResponse
+
+SEED_SQL = {
+    "sessions": """
+        INSERT INTO sessions (id, session_code, operator_id, respondent_id, test_type, status, device_id,
+                              device_name, measurement_context, trials_completed, total_trials,
+                              started_at, created_at, updated_at)
+        SELECT gen_random_uuid(), 'LIST-' || n, :operator_id, s.respondent_id, 'REACTION_TIME', 'ACTIVE',
+               'device-' || n, 'Pixel 7', 'lab', n % 40, 40,
+               now() - n * interval '1 minute', now() - n * interval '1 minute', now()
+        FROM generate_series(1, :rows) AS n, (SELECT respondent_id FROM sessions LIMIT 1) s
+    """,
+    "respondents": """
+        INSERT INTO respondents (id, guest_name, gender, age, height, weight, status, university,
+                                 created_by, created_at)
+        SELECT gen_random_uuid(), 'Respondent ' || n, 'female', 20 + n % 30, 160, 60, 'guest',
+               'Universitas Indonesia', :operator_id, now() - n * interval '1 minute'
+        FROM generate_series(1, :rows) AS n
+    """,
+}
+
+LISTINGS = {
+    "sessions": (Session, SessionResponse, Session.operator_id),
+    "respondents": (Respondent, RespondentResponse, Respondent.created_by),
+}
+
+
+def render_json(content):
+    # JSONResponse.render of the Starlette version in use
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+async def validated_page(db, model, schema, owner, operator_id, limit):
+    result = await db.execute(paginate(select(model).where(owner == operator_id), model, None, limit))
+    rows, _ = split_page(result.scalars().all(), limit)
+    return lambda: validated_body(rows, schema)
+
+
+def validated_body(rows, schema):
+    adapter = TypeAdapter(List[schema])
+    return render_json(adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json"))
+
+
+async def projected_page(db, model, schema, owner, operator_id, limit):
+    query = select(*columns(schema, model)).where(owner == operator_id)
+    result = await db.execute(paginate(query, model, None, limit))
+    rows, _ = split_page(result.all(), limit)
+    return lambda: projected_body(rows)
+
+
+def projected_body(rows):
+    return FastJSONResponse([row._asdict() for row in rows]).body
+
+
+async def run(args):
+    with scratch_schema(args.schema) as engine:
+        operator_id, _ = seed_session(engine)
+        with engine.begin() as conn:
+            for sql in SEED_SQL.values():
+                conn.execute(text(sql), {"operator_id": operator_id, "rows": args.rows})
+            conn.execute(text("ANALYZE"))
+
+        db_engine = async_engine(args.schema)
+        session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+        print(f"{'listing':<12} {'path':<10} {'fetch+serialize ms':>19} {'serialize ms':>13} {'bytes':>7}")
+        for listing, (model, schema, owner) in LISTINGS.items():
+            results = {}
+            for label, page in (("validated", validated_page), ("projected", projected_page)):
+                total, serialize = [], []
+                for _ in range(args.repeat):
+                    async with session_factory() as db:
+                        started = time.perf_counter()
+                        body = await page(db, model, schema, owner, operator_id, args.rows)
+                        rendered_at = time.perf_counter()
+                        content = body()
+                        finished = time.perf_counter()
+                    total.append((finished - started) * 1000)
+                    serialize.append((finished - rendered_at) * 1000)
+                results[label] = (statistics.median(total), statistics.median(serialize), len(content))
+            for label, (total_ms, serialize_ms, size) in results.items():
+                print(f"{listing:<12} {label:<10} {total_ms:>19.3f} {serialize_ms:>13.3f} {size:>7}")
+            speedup = results["validated"][1] / results["projected"][1]
+            print(f"{listing:<12} {'speedup':<10} {results['validated'][0] / results['projected'][0]:>18.1f}x {speedup:>12.1f}x")
+
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default="bench_list_serialization")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Live channel fan-out under load: the previous broadcast (await send_text on
+every socket in turn) vs ConnectionManager's per-socket queues and sender
+tasks, with --subscribers simulated sockets in one session room of which
+the first --slow take --slow-delay seconds per send.
+
+Publishes --messages messages every --interval seconds and reports the
+delivery latency percentiles (publish to send completed) at the fast
+subscribers, plus how long publishing itself blocked. No database needed.
+
+    python benchmarks/live_fanout.py --subscribers 1000 --slow 10 --slow-delay 0.1
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import common  # noqa: F401  (puts the repo on sys.path)
+from app.api.v1.websocket import ConnectionManager
+
+
+class SimulatedSocket:
+    def __init__(self, delay):
+        self.delay = delay
+        self.latencies = []
+        self.published = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        number = int(text.rsplit(":", 1)[1].rstrip("}"))
+        self.latencies.append(time.perf_counter() - self.published[number])
+
+    async def close(self, code):
+        pass
+
+
+async def sequential_broadcast(sockets, text):
+    # The broadcast this replaced
+    for socket in sockets:
+        await socket.send_text(text)
+
+
+async def run_sequential(sockets, args, published):
+    blocked = []
+    for number in range(args.messages):
+        published[number] = time.perf_counter()
+        await sequential_broadcast(sockets, f'{{"number":{number}}}')
+        blocked.append(time.perf_counter() - published[number])
+        await asyncio.sleep(args.interval)
+    return blocked
+
+
+async def run_queued(sockets, args, published):
+    manager = ConnectionManager(queue_size=args.queue_size, send_timeout=args.send_timeout)
+    session_id = uuid.uuid4()
+    for socket in sockets:
+        await manager.connect(socket)
+        manager.subscribe(socket, session_id)
+    blocked = []
+    for number in range(args.messages):
+        published[number] = time.perf_counter()
+        manager.broadcast(session_id, {"number": number})
+        blocked.append(time.perf_counter() - published[number])
+        await asyncio.sleep(args.interval)
+    # Let the fast subscribers drain
+    await asyncio.sleep(max(args.interval, 0.5))
+    for socket in sockets:
+        manager.disconnect(socket)
+    return blocked
+
+
+def percentiles(values):
+    values = sorted(values)
+    pick = lambda fraction: values[min(int(len(values) * fraction), len(values) - 1)] * 1000
+    return pick(0.5), pick(0.95), pick(0.99), values[-1] * 1000
+
+
+async def run(args):
+    print(f"{'path':<11} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>9} {'delivered':>10} {'publish ms':>11}")
+    for label, fan_out in (("sequential", run_sequential), ("queued", run_queued)):
+        published = {}
+        sockets = [
+            SimulatedSocket(args.slow_delay if index < args.slow else 0.0)
+            for index in range(args.subscribers)
+        ]
+        for socket in sockets:
+            socket.published = published
+        blocked = await fan_out(sockets, args, published)
+        fast = [latency for socket in sockets[args.slow:] for latency in socket.latencies]
+        p50, p95, p99, worst = percentiles(fast)
+        expected = (args.subscribers - args.slow) * args.messages
+        print(f"{label:<11} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {worst:>9.2f} "
+              f"{len(fast) / expected:>9.0%} {statistics.median(blocked) * 1000:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--slow", type=int, default=10)
+    parser.add_argument("--slow-delay", type=float, default=0.1)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--queue-size", type=int, default=256)
+    parser.add_argument("--send-timeout", type=float, default=5.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
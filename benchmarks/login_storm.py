@@ -0,0 +1,75 @@
+"""
+Shift-start login storm: bcrypt verification inline on the event loop (the
+old authenticate_user) vs dispatched to the bounded password-hash pool.
+
+A concurrent "uploader" task wakes every --tick-ms, like a stream of trial
+uploads would, and records how late each wake-up is. With inline bcrypt
+the loop is blocked for every hash; with the pool the lag stays near zero
+while the logins complete at roughly the same overall rate.
+
+No database is needed; only the hashing path is exercised.
+
+    python benchmarks/login_storm.py --logins 50 --workers 2
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import common  # noqa: F401  (puts the repo root on sys.path)
+from concurrent.futures import ThreadPoolExecutor
+from app.core.auth import get_password_hash, verify_password
+
+PASSWORD = "operator123"
+
+
+async def inline_login(hashed, executor):
+    return verify_password(PASSWORD, hashed)
+
+
+async def pooled_login(hashed, executor):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, verify_password, PASSWORD, hashed)
+
+
+async def uploader(tick, lags, stop):
+    while not stop.is_set():
+        expected = time.perf_counter() + tick
+        await asyncio.sleep(tick)
+        lags.append((time.perf_counter() - expected) * 1000)
+
+
+async def storm(login, hashed, args):
+    executor = ThreadPoolExecutor(max_workers=args.workers)
+    lags, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(uploader(args.tick_ms / 1000, lags, stop))
+    await asyncio.sleep(args.tick_ms / 1000 * 3)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login(hashed, executor) for _ in range(args.logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    executor.shutdown()
+    lags.sort()
+    return elapsed, statistics.median(lags), lags[int(len(lags) * 0.99) - 1], lags[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASH_WORKERS")
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    hashed = get_password_hash(PASSWORD)
+    print(f"{args.logins} concurrent logins, {args.workers} hash workers, uploader tick {args.tick_ms} ms")
+    print(f"{'mode':>8} {'logins s':>9} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11}")
+    for label, login in (("inline", inline_login), ("pool", pooled_login)):
+        elapsed, p50, p99, worst = asyncio.run(storm(login, hashed, args))
+        print(f"{label:>8} {elapsed:>9.2f} {p50:>11.2f} {p99:>11.2f} {worst:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
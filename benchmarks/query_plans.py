@@ -0,0 +1,120 @@
+"""
+Query plans for the export, listing and ownership queries, before and after
+the composite indexes from alembic revision 0001.
+
+Seeds a scratch schema (default ``bench_indexes``) in the database pointed at
+by DATABASE_URL, runs EXPLAIN (ANALYZE, BUFFERS) for each query without the
+indexes, creates them, and runs the same queries again. The scratch schema is
+dropped afterwards, so it is safe to point at a development database.
+
+    python benchmarks/query_plans.py --operators 50 --sessions 40 --trials 120
+"""
+import argparse
+import time
+
+from common import scratch_schema
+from sqlalchemy import text
+from app.database.models import Session, ReactionTrial, TympaniReading, VitalReading
+
+INDEXED_TABLES = [Session.__table__, ReactionTrial.__table__, TympaniReading.__table__, VitalReading.__table__]
+
+QUERIES = {
+    "export trials (session_id, ORDER BY trial_number)": """
+        SELECT * FROM reaction_trials WHERE session_id = :session_id ORDER BY trial_number
+    """,
+    "session listing (operator_id, ORDER BY created_at DESC)": """
+        SELECT * FROM sessions WHERE operator_id = :operator_id ORDER BY created_at DESC LIMIT 20
+    """,
+    "date-range export (operator_id, created_at range)": """
+        SELECT * FROM sessions
+        WHERE operator_id = :operator_id AND created_at >= now() - interval '30 days'
+        ORDER BY created_at
+    """,
+    "status count (operator_id, status)": """
+        SELECT count(*) FROM sessions WHERE operator_id = :operator_id AND status = 'ACTIVE'
+    """,
+}
+
+SEED_SQL = """
+INSERT INTO users (id, username, email, password_hash, full_name, role, status, platform_access, registration_type)
+SELECT gen_random_uuid(), 'op' || n, 'op' || n || '@bench', 'x', 'Operator ' || n,
+       'OPERATOR', 'ACTIVE', 'MOBILE', 'ADMIN_CREATED'
+FROM generate_series(1, :operators) AS n;
+
+INSERT INTO respondents (id, guest_name, created_by)
+SELECT gen_random_uuid(), 'Respondent ' || u.username, u.id FROM users u;
+
+INSERT INTO sessions (id, session_code, operator_id, respondent_id, test_type, status, trials_completed, total_trials, created_at, updated_at)
+SELECT gen_random_uuid(), u.username || '-' || n, u.id, r.id, 'REACTION_TIME',
+       (ARRAY['DRAFT', 'ACTIVE', 'COMPLETED', 'CANCELLED'])[1 + n % 4]::sessionstatus,
+       :trials, :trials, now() - (n || ' hours')::interval, now()
+FROM users u
+JOIN respondents r ON r.created_by = u.id
+CROSS JOIN generate_series(1, :sessions) AS n;
+
+INSERT INTO reaction_trials (id, session_id, stimulus_type, stimulus_category, response_time, trial_number, reaction_type, created_at)
+SELECT gen_random_uuid(), s.id, 'RED', 'LED', 150 + (random() * 200)::int, n, 'correct', now()
+FROM sessions s
+CROSS JOIN generate_series(1, :trials) AS n;
+"""
+
+
+def explain(conn, params):
+    plans = {}
+    for label, sql in QUERIES.items():
+        rows = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params).scalars().all()
+        plans[label] = rows
+    return plans
+
+
+def print_plans(title, plans):
+    print(f"\n{'=' * 20} {title} {'=' * 20}")
+    for label, rows in plans.items():
+        print(f"\n-- {label}")
+        for row in rows:
+            print(f"   {row}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default="bench_indexes")
+    parser.add_argument("--operators", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=40, help="sessions per operator")
+    parser.add_argument("--trials", type=int, default=120, help="trials per session")
+    args = parser.parse_args()
+
+    with scratch_schema(args.schema) as engine, engine.begin() as conn:
+        for table in INDEXED_TABLES:
+            for index in table.indexes:
+                index.drop(conn)
+
+        started = time.perf_counter()
+        for statement in SEED_SQL.split(";\n"):
+            if statement.strip():
+                conn.execute(text(statement), {
+                    "operators": args.operators,
+                    "sessions": args.sessions,
+                    "trials": args.trials,
+                })
+        conn.execute(text("ANALYZE"))
+        print(f"Seeded {args.operators * args.sessions} sessions / "
+              f"{args.operators * args.sessions * args.trials} trials "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        params = {
+            "operator_id": conn.execute(text("SELECT id FROM users LIMIT 1")).scalar(),
+            "session_id": conn.execute(text("SELECT id FROM sessions LIMIT 1")).scalar(),
+        }
+
+        print_plans("BEFORE (no composite indexes)", explain(conn, params))
+
+        for table in INDEXED_TABLES:
+            for index in table.indexes:
+                index.create(conn)
+        conn.execute(text("ANALYZE"))
+
+        print_plans("AFTER (alembic revision 0001)", explain(conn, params))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Respondent search at scale: ILIKE '%term%' without an index (the old
+get_respondents filter) vs the pg_trgm GIN index used by
+RespondentService.search, plus the university prefix match.
+
+Seeds --respondents rows (default 100k) for one operator in a scratch
+schema of DATABASE_URL and reports median latency per search term and the
+plan of each query. Needs the pg_trgm extension to be installable.
+
+    python benchmarks/respondent_search.py --respondents 100000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+
+from common import scratch_schema, seed_session
+from sqlalchemy import text
+
+SEED_SQL = """
+INSERT INTO respondents (id, guest_name, university, created_by, created_at)
+SELECT gen_random_uuid(),
+       (ARRAY['Budi', 'Siti', 'Andi', 'Dewi', 'Rizky', 'Putri', 'Agus', 'Nur'])[1 + n % 8]
+           || ' ' || md5(n::text),
+       (ARRAY['Universitas Indonesia', 'Institut Teknologi Bandung', 'Universitas Gadjah Mada',
+              'Universitas Airlangga', 'Institut Pertanian Bogor'])[1 + n % 5],
+       :operator_id,
+       now() - (n || ' seconds')::interval
+FROM generate_series(1, :respondents) AS n
+"""
+
+SEARCHES = {
+    "substring ILIKE": """
+        SELECT * FROM respondents
+        WHERE created_by = :operator_id AND guest_name ILIKE '%' || :term || '%'
+        ORDER BY created_at DESC, id DESC LIMIT 20
+    """,
+    "trigram ranked": """
+        SELECT * FROM respondents
+        WHERE created_by = :operator_id
+          AND (guest_name ILIKE '%' || :term || '%' OR guest_name OPERATOR({schema}.%) :term
+               OR lower(university) LIKE lower(:term) || '%')
+        ORDER BY {schema}.similarity(guest_name, :term) DESC, created_at DESC, id DESC LIMIT 20
+    """,
+    "university prefix": """
+        SELECT * FROM respondents
+        WHERE created_by = :operator_id AND lower(university) LIKE lower(:term) || '%'
+        ORDER BY created_at DESC, id DESC LIMIT 20
+    """,
+}
+
+
+def timed(conn, sql, params, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        conn.execute(text(sql), params).all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default="bench_respondent_search")
+    parser.add_argument("--respondents", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--terms", nargs="+", default=["a3f", "santo", "Dewi", "univ"])
+    args = parser.parse_args()
+
+    with scratch_schema(args.schema) as engine:
+        operator_id, _ = seed_session(engine)
+        with engine.begin() as conn:
+            # Installs into the scratch schema unless another schema already has it
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            trgm_schema = conn.execute(text(
+                "SELECT n.nspname FROM pg_extension e JOIN pg_namespace n ON n.oid = e.extnamespace "
+                "WHERE e.extname = 'pg_trgm'"
+            )).scalar()
+            conn.execute(text("DROP INDEX IF EXISTS ix_respondents_guest_name_trgm"))
+            conn.execute(text("DROP INDEX IF EXISTS ix_respondents_created_by_lower_university"))
+
+            started = time.perf_counter()
+            conn.execute(text(SEED_SQL), {"operator_id": operator_id, "respondents": args.respondents})
+            conn.execute(text("ANALYZE respondents"))
+            print(f"Seeded {args.respondents} respondents in {time.perf_counter() - started:.1f}s")
+
+        queries = {label: sql.replace("{schema}", trgm_schema) for label, sql in SEARCHES.items()}
+        with engine.connect() as conn:
+            before = {
+                (label, term): timed(conn, sql, {"operator_id": operator_id, "term": term}, args.repeat)
+                for label, sql in queries.items() for term in args.terms
+            }
+
+            conn.execute(text(
+                f"CREATE INDEX ix_respondents_guest_name_trgm "
+                f"ON respondents USING gin (guest_name {trgm_schema}.gin_trgm_ops)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX ix_respondents_created_by_lower_university "
+                "ON respondents (created_by, lower(university) text_pattern_ops)"
+            ))
+            conn.execute(text("ANALYZE respondents"))
+            conn.commit()
+
+            print(f"\n{'query':>18} {'term':>8} {'no index ms':>12} {'indexed ms':>11}")
+            for (label, term), before_ms in before.items():
+                after_ms = timed(conn, queries[label], {"operator_id": operator_id, "term": term}, args.repeat)
+                print(f"{label:>18} {term:>8} {before_ms:>12.2f} {after_ms:>11.2f}")
+
+            for label, sql in queries.items():
+                print(f"\n-- {label} ({args.terms[0]!r})")
+                plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"),
+                                    {"operator_id": operator_id, "term": args.terms[0]}).scalars()
+                for row in plan:
+                    print(f"   {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Per-session reaction-time statistics: loading every trial and aggregating
+row by row in Python vs TrialService.session_statistics, which merges the
+session_stimulus_stats summary rows and, with percentiles, adds one GROUPING
+SETS query with percentile_cont over the trials.
+
+Seeds --trials trials (default 10k) into one session of a scratch schema of
+DATABASE_URL, builds their summary rows and reports median latency of each
+approach.
+
+    python benchmarks/session_statistics.py --trials 10000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict
+
+from common import async_engine, scratch_schema, seed_session
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.database.models import ReactionTrial
+from app.services.stimulus_stats import rebuild
+from app.services.trial_service import TrialService
+
+SEED_SQL = """
+INSERT INTO reaction_trials (id, session_id, stimulus_type, stimulus_category, response_time,
+                             trial_number, reaction_type)
+SELECT gen_random_uuid(), :session_id,
+       (ARRAY['RED', 'YELLOW', 'BLUE', 'SIREN', 'AMBULANCE', 'GAUGE', 'SPECTRUM'])[1 + n % 7]::stimulustype,
+       (ARRAY['LED', 'LED', 'LED', 'SOUND', 'SOUND', 'VISUAL', 'VISUAL'])[1 + n % 7]::stimuluscategory,
+       150 + (random() * 400)::int,
+       n,
+       (ARRAY['correct', 'correct', 'correct', 'correct', 'incorrect', 'timeout'])[1 + n % 6]
+FROM generate_series(1, :trials) AS n
+"""
+
+
+def summarize(times, outcomes):
+    times = sorted(times)
+    count = len(times)
+    return {
+        "total_trials": count,
+        "mean": statistics.fmean(times),
+        "min": times[0],
+        "max": times[-1],
+        "std": statistics.stdev(times) if count > 1 else None,
+        "median": statistics.median(times),
+        "p90": statistics.quantiles(times, n=20, method="inclusive")[17] if count > 1 else times[0],
+        "p95": statistics.quantiles(times, n=20, method="inclusive")[18] if count > 1 else times[0],
+        **{outcome: outcomes.count(outcome) for outcome in ("correct", "incorrect", "timeout")},
+    }
+
+
+async def python_statistics(db, session_id):
+    result = await db.execute(select(ReactionTrial).where(ReactionTrial.session_id == session_id))
+    groups = defaultdict(lambda: ([], []))
+    for trial in result.scalars():
+        for key in ("overall", f"type:{trial.stimulus_type.value}", f"category:{trial.stimulus_category.value}"):
+            groups[key][0].append(trial.response_time)
+            groups[key][1].append(trial.reaction_type)
+    return {key: summarize(times, outcomes) for key, (times, outcomes) in groups.items()}
+
+
+async def sql_statistics(db, session_id):
+    return await TrialService(db).session_statistics(session_id)
+
+
+async def summary_statistics(db, session_id):
+    return await TrialService(db).session_statistics(session_id, percentiles=False)
+
+
+async def run(args):
+    with scratch_schema(args.schema) as engine:
+        _, session_id = seed_session(engine)
+        with engine.begin() as conn:
+            conn.execute(text(SEED_SQL), {"session_id": session_id, "trials": args.trials})
+            # Raw inserts bypass ingestion, so build the summary rows it would have kept
+            rebuild(conn, [session_id])
+            conn.execute(text("ANALYZE reaction_trials"))
+            conn.execute(text("ANALYZE session_stimulus_stats"))
+
+        db_engine = async_engine(args.schema)
+        session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+        approaches = (
+            ("python", python_statistics),
+            ("sql", sql_statistics),
+            ("summary", summary_statistics),
+        )
+        timings = {label: [] for label, _compute in approaches}
+        for _ in range(args.repeat):
+            for label, compute in approaches:
+                async with session_factory() as db:
+                    started = time.perf_counter()
+                    result = await compute(db, session_id)
+                    timings[label].append((time.perf_counter() - started) * 1000)
+                if label != "python":
+                    assert result["overall"]["total_trials"] == args.trials, result["overall"]
+
+        python_ms = statistics.median(timings["python"])
+        print(f"{'trials':>7} {'approach':>18} {'ms (p50)':>9} {'speedup':>8}")
+        for label, name in (("python", "python"), ("sql", "sql + percentiles"), ("summary", "sql summary only")):
+            ms = statistics.median(timings[label])
+            print(f"{args.trials:>7} {name:>18} {ms:>9.2f} {python_ms / ms:>7.1f}x")
+
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default="bench_session_statistics")
+    parser.add_argument("--trials", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
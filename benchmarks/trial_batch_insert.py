@@ -0,0 +1,93 @@
+"""
+Reaction-trial batch ingestion: per-object ORM inserts (the old
+create_reaction_trials_batch body) vs TrialService.insert_reaction_trials
+(Core executemany + SQL-side trials_completed bump).
+
+Runs against a scratch schema in DATABASE_URL over asyncpg, like the API.
+
+    python benchmarks/trial_batch_insert.py --sizes 10 100 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from common import async_engine, scratch_schema, seed_session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.database.models import Session, ReactionTrial
+from app.schemas.trials import ReactionTrialCreate
+from app.services.trial_service import TrialService
+
+
+def make_batch(size, offset):
+    return [
+        ReactionTrialCreate(
+            stimulus_type="red",
+            stimulus_category="led",
+            response_time=150 + number % 200,
+            trial_number=offset + number,
+            reaction_type="correct"
+        )
+        for number in range(size)
+    ]
+
+
+async def orm_insert(db, session_id, trials):
+    session = (await db.execute(select(Session).where(Session.id == session_id))).scalars().first()
+    db.add_all([
+        ReactionTrial(
+            session_id=session.id,
+            stimulus_type=trial.stimulus_type,
+            stimulus_category=trial.stimulus_category,
+            response_time=trial.response_time,
+            trial_number=trial.trial_number,
+            reaction_type=trial.reaction_type
+        )
+        for trial in trials
+    ])
+    session.trials_completed += len(trials)
+    await db.commit()
+
+
+async def bulk_insert(db, session_id, trials):
+    session = (await db.execute(select(Session).where(Session.id == session_id))).scalars().first()
+    await TrialService(db).insert_reaction_trials(session, trials)
+    await db.commit()
+
+
+async def run(args):
+    with scratch_schema(args.schema) as engine:
+        _, session_id = seed_session(engine)
+        db_engine = async_engine(args.schema)
+        session_factory = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+        offset = 0
+        print(f"{'batch':>6} {'orm ms (p50)':>14} {'bulk ms (p50)':>14} {'speedup':>8}")
+        for size in args.sizes:
+            timings = {"orm": [], "bulk": []}
+            for _ in range(args.repeat):
+                for label, insert in (("orm", orm_insert), ("bulk", bulk_insert)):
+                    batch = make_batch(size, offset)
+                    offset += size
+                    async with session_factory() as db:
+                        started = time.perf_counter()
+                        await insert(db, session_id, batch)
+                        timings[label].append((time.perf_counter() - started) * 1000)
+            orm_ms = statistics.median(timings["orm"])
+            bulk_ms = statistics.median(timings["bulk"])
+            print(f"{size:>6} {orm_ms:>14.2f} {bulk_ms:>14.2f} {orm_ms / bulk_ms:>7.1f}x")
+
+        await db_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schema", default="bench_trial_insert")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,9 @@ import sys
 import os
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,8 +15,8 @@ load_dotenv()
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.main import app
-from app.database.database import get_db, Base
-from app.core.auth import get_password_hash
+from app.database.database import get_db, get_async_db, get_read_db, async_database_url, Base
+from app.core.auth import get_password_hash, principal_cache
 from app.database.models import User, UserRole
 
 # Database URLs
@@ -50,6 +51,20 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# TestClient runs each request on a fresh event loop, so async connections
+# must not be pooled across requests
+async_engine = create_async_engine(
+    async_database_url(TEST_DATABASE_URL),
+    poolclass=NullPool,
+)
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 @pytest.fixture(scope="function")
 def db():
     # Create the tables
@@ -63,6 +78,39 @@ def db():
         # Clean up after test
         Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(scope="function")
+def async_session_factory(db):
+    return TestingAsyncSessionLocal
+
+@pytest.fixture(scope="function")
+def export_job_runner(db, tmp_path, monkeypatch):
+    """Export job runner on the test database; waits for its jobs before the tables are dropped"""
+    from app.services.export_jobs import export_job_runner as runner
+    
+    futures = []
+    submit = runner.submit
+    def recording_submit(job_id):
+        futures.append(submit(job_id))
+        return futures[-1]
+    
+    monkeypatch.setattr(runner, "database_url", TEST_DATABASE_URL)
+    monkeypatch.setattr(runner, "read_database_url", TEST_DATABASE_URL)
+    monkeypatch.setattr(runner, "export_dir", str(tmp_path))
+    monkeypatch.setattr(runner, "submit", recording_submit)
+    yield runner
+    for future in futures:
+        future.result(timeout=60)
+
+@pytest.fixture(scope="function", autouse=True)
+def export_cache(tmp_path, monkeypatch):
+    """Empty export cache per test, in its own directory"""
+    from app.services.export_cache import ExportCache
+    from app.api.v1.endpoints import export
+    
+    cache = ExportCache(str(tmp_path / "export-cache"), 1024 * 1024)
+    monkeypatch.setattr(export, "export_cache", cache)
+    return cache
+
 @pytest.fixture(scope="function")
 def client(db):
     def override_get_db():
@@ -71,9 +119,17 @@ def client(db):
         finally:
             db.close()
     
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_async_db
+    principal_cache.clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
+    principal_cache.clear()
 
 @pytest.fixture(scope="function")
 def test_admin(db):
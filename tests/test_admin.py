@@ -139,4 +139,54 @@ class TestAdmin:
         
         # Verify password was reset
         db.refresh(operator)
-        assert operator.initial_password is True
\ No newline at end of file
+        assert operator.initial_password is True
+
+    def test_status_change_invalidates_cached_principal(self, client, admin_token, operator_token, test_operator):
+        """Test a suspended operator is rejected on the next request despite the principal cache"""
+        operator_headers = {"Authorization": f"Bearer {operator_token}"}
+        
+        assert client.get("/api/v1/mobile/sessions", headers=operator_headers).status_code == status.HTTP_200_OK
+        assert client.get("/api/v1/mobile/sessions", headers=operator_headers).status_code == status.HTTP_200_OK
+        
+        response = client.patch(
+            f"/api/v1/admin/users/{test_operator.id}/status",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"status": "suspended", "reason": "Testing cache invalidation"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        
+        response = client.get("/api/v1/mobile/sessions", headers=operator_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_principal_cache_metrics(self, client, admin_token):
+        """Test repeated requests are served from the principal cache"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        first = client.get("/api/v1/internal/metrics", headers=headers).json()["principal_cache"]
+        second = client.get("/api/v1/internal/metrics", headers=headers).json()["principal_cache"]
+        
+        assert second["hits"] == first["hits"] + 1
+        assert second["misses"] == first["misses"]
+
+    def test_reads_routed_to_replica_unless_strong(self, client, admin_token, async_session_factory, monkeypatch):
+        """Test admin reads use the read engine, and the primary with X-Consistency: strong"""
+        from app.main import app
+        from app.database import database
+        
+        used = []
+        def recording(name):
+            def factory():
+                used.append(name)
+                return async_session_factory()
+            return factory
+        monkeypatch.setattr(database, "AsyncSessionLocal", recording("primary"))
+        monkeypatch.setattr(database, "AsyncReadSessionLocal", recording("replica"))
+        del app.dependency_overrides[database.get_read_db]
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        
+        assert client.get("/api/v1/admin/users", headers=headers).status_code == status.HTTP_200_OK
+        assert used == ["replica"]
+        
+        response = client.get("/api/v1/admin/users", headers={**headers, "X-Consistency": "strong"})
+        assert response.status_code == status.HTTP_200_OK
+        assert used == ["replica", "primary"]
@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from fastapi import status
-from app.core.auth import get_password_hash
+from app.core.auth import get_password_hash, async_verify_password
 
 class TestAuth:
     def test_login_success(self, client, test_operator):
@@ -116,4 +117,27 @@ class TestAuth:
             headers={"Authorization": "Bearer invalid_token"}
         )
         
-        assert response.status_code == status.HTTP_401_UNAUTHORIZED
\ No newline at end of file
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_password_verification_does_not_block_event_loop(self):
+        """Test other coroutines keep running while bcrypt verifies a password"""
+        hashed = get_password_hash("operator123")
+        
+        async def run():
+            ticks = 0
+            done = asyncio.Event()
+            
+            async def ticker():
+                nonlocal ticks
+                while not done.is_set():
+                    ticks += 1
+                    await asyncio.sleep(0.001)
+            
+            task = asyncio.create_task(ticker())
+            assert await async_verify_password("operator123", hashed) is True
+            ticks_during_verify = ticks
+            done.set()
+            await task
+            return ticks_during_verify
+        
+        assert asyncio.run(run()) > 1
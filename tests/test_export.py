@@ -1,7 +1,10 @@
+import asyncio
+import os
+import time
 import pytest
 from fastapi import status
 import uuid
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 class TestExport:
     def test_export_session_csv(self, client, operator_token, db, test_operator):
@@ -108,4 +111,459 @@ class TestExport:
         )
         
         assert response.status_code == status.HTTP_200_OK
-        assert response.headers["content-type"] == "text/csv"
\ No newline at end of file
+        assert response.headers["content-type"] == "text/csv"
+
+    def test_stream_session_csv_in_chunks(self, db, async_session_factory, test_operator):
+        """Test single-session export is streamed chunk by chunk in trial order"""
+        from app.database.models import Respondent, Session, ReactionTrial
+        from app.services.export_service import ExportService
+        
+        respondent = Respondent(
+            guest_name="Stream Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="STREAM-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="completed"
+        )
+        db.add(session)
+        db.commit()
+        
+        db.add_all([
+            ReactionTrial(
+                session_id=session.id,
+                stimulus_type="red",
+                stimulus_category="led",
+                response_time=100 + number,
+                trial_number=number
+            )
+            for number in range(25, 0, -1)
+        ])
+        db.commit()
+        
+        async def collect_chunks():
+            async with async_session_factory() as async_db:
+                export_service = ExportService(async_db)
+                return [chunk async for chunk in export_service.stream_session_csv(session, chunk_size=10)]
+        
+        chunks = asyncio.run(collect_chunks())
+        
+        # Header, two full chunks and the remainder
+        assert len(chunks) == 4
+        assert chunks[0].startswith("Trial Number")
+        lines = "".join(chunks).splitlines()
+        assert len(lines) == 26
+        assert lines[1].startswith("1,red,led,101")
+        assert lines[-1].startswith("25,red,led,125")
+
+    def test_operator_performance_report(self, client, admin_token, db, test_admin):
+        """Test aggregated operator performance report"""
+        from app.database.models import User, UserRole, Respondent, Session
+        
+        busy = User(
+            username="busy_op",
+            email="busy@test.com",
+            password_hash="hash",
+            full_name="Busy Operator",
+            role=UserRole.OPERATOR,
+            created_by=test_admin.id
+        )
+        idle = User(
+            username="idle_op",
+            email="idle@test.com",
+            password_hash="hash",
+            full_name="Idle Operator",
+            role=UserRole.OPERATOR,
+            created_by=test_admin.id
+        )
+        db.add_all([busy, idle])
+        db.commit()
+        
+        respondent = Respondent(
+            guest_name="Report Test",
+            created_by=busy.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        db.add_all([
+            Session(session_code="PERF-001", operator_id=busy.id, respondent_id=respondent.id,
+                    test_type="reaction_time", status="completed", trials_completed=30),
+            Session(session_code="PERF-002", operator_id=busy.id, respondent_id=respondent.id,
+                    test_type="reaction_time", status="active", trials_completed=10),
+            Session(session_code="PERF-003", operator_id=busy.id, respondent_id=respondent.id,
+                    test_type="vitals", status="draft", trials_completed=0)
+        ])
+        db.commit()
+        
+        today = date.today()
+        tomorrow = today + timedelta(days=1)
+        response = client.get(
+            f"/api/v1/admin/reports/operator-performance?start_date={today}&end_date={tomorrow}",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        report = {entry["operator_name"]: entry for entry in response.json()}
+        assert report["Busy Operator"]["total_sessions"] == 3
+        assert report["Busy Operator"]["completed_sessions"] == 1
+        assert report["Busy Operator"]["active_sessions"] == 1
+        assert report["Busy Operator"]["reaction_time_tests"] == 2
+        assert report["Busy Operator"]["vitals_tests"] == 1
+        assert report["Busy Operator"]["total_trials"] == 40
+        assert report["Busy Operator"]["avg_trials_per_session"] == 13.33
+        assert report["Busy Operator"]["last_activity"] is not None
+        assert report["Idle Operator"]["total_sessions"] == 0
+        assert report["Idle Operator"]["last_activity"] is None
+        
+        response = client.get(
+            f"/api/v1/admin/reports/operator-performance.csv?start_date={today}&end_date={tomorrow}",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert "Busy Operator,3,1,1,2,0,1,40,13.33" in response.content.decode()
+
+    def test_export_sessions_constant_queries(self, db, async_session_factory, test_admin, test_operator):
+        """Test multi-session export loads operators and respondents without N+1 queries"""
+        from sqlalchemy import event
+        from app.database.models import Respondent, Session
+        from app.services.export_service import ExportService
+        
+        respondents = [
+            Respondent(guest_name=f"Eager Respondent {number}", created_by=test_operator.id)
+            for number in range(5)
+        ]
+        db.add_all(respondents)
+        db.commit()
+        
+        db.add_all([
+            Session(session_code=f"EAGER-{number:03d}", operator_id=test_operator.id,
+                    respondent_id=respondents[number % 5].id, test_type="reaction_time")
+            for number in range(20)
+        ])
+        db.commit()
+        
+        statements = []
+        
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        async def export():
+            async with async_session_factory() as async_db:
+                sync_engine = async_db.bind.sync_engine
+                event.listen(sync_engine, "before_cursor_execute", count_statement)
+                try:
+                    return await ExportService(async_db).export_sessions_to_csv(
+                        test_admin.id, date.today(), date.today() + timedelta(days=1)
+                    )
+                finally:
+                    event.remove(sync_engine, "before_cursor_execute", count_statement)
+        
+        csv_content, _ = asyncio.run(export())
+        
+        assert len(csv_content.splitlines()) == 21
+        assert "Test Operator,Eager Respondent 3" in csv_content
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+    def test_reading_export_prunes_partitions(self, client, operator_token, db, test_operator):
+        """Test the tympanic export query only scans the partition holding the session's readings"""
+        from app.database.models import Respondent, Session
+        from app.database.partitions import month_start, partition_name
+        from app.services.export_service import ExportService
+        
+        respondent = Respondent(
+            guest_name="Partition Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="PART-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="tympanic"
+        )
+        db.add(session)
+        db.commit()
+        
+        # Current month: its partition exists from create_all
+        this_month = month_start(datetime.utcnow().date())
+        reading_time = datetime.combine(this_month, datetime.min.time()).isoformat() + "+00:00"
+        response = client.post(
+            f"/api/v1/mobile/sessions/{session.id}/tympani-readings/batch",
+            headers={"Authorization": f"Bearer {operator_token}"},
+            json={"readings": [
+                {"temperature": 36.5, "reading_number": number, "reading_time": reading_time}
+                for number in (1, 2, 3)
+            ]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        
+        db.refresh(session)
+        _header, query, _to_row = ExportService(db)._session_rows(session)
+        compiled = query.compile(dialect=db.bind.dialect)
+        plan = "\n".join(
+            row[0] for row in db.connection().exec_driver_sql(f"EXPLAIN {compiled}", compiled.params)
+        )
+        
+        assert partition_name("tympani_readings", this_month) in plan
+        assert partition_name("tympani_readings", month_start(this_month, 1)) not in plan
+        assert "tympani_readings_default" not in plan
+
+    def test_stream_session_parquet_row_groups(self, db, async_session_factory, test_operator):
+        """Test Parquet export writes typed columns, one row group per fetch"""
+        import io
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from app.database.models import Respondent, Session, ReactionTrial
+        from app.services.export_service import ColumnarFormat, ExportService
+        
+        respondent = Respondent(guest_name="Parquet Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="PARQUET-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="completed"
+        )
+        db.add(session)
+        db.commit()
+        
+        db.add_all([
+            ReactionTrial(
+                session_id=session.id,
+                stimulus_type="siren" if number % 2 else "red",
+                stimulus_category="sound" if number % 2 else "led",
+                response_time=100 + number,
+                trial_number=number
+            )
+            for number in range(25, 0, -1)
+        ])
+        db.commit()
+        
+        async def collect():
+            async with async_session_factory() as async_db:
+                export_service = ExportService(async_db)
+                return b"".join([
+                    chunk async for chunk in export_service.stream_session_columnar(
+                        session, ColumnarFormat.PARQUET, chunk_size=10
+                    )
+                ])
+        
+        parquet_file = pq.ParquetFile(io.BytesIO(asyncio.run(collect())))
+        assert parquet_file.metadata.num_row_groups == 3
+        
+        table = parquet_file.read()
+        assert table.num_rows == 25
+        assert table.schema.field("response_time_ms").type == pa.int32()
+        assert pa.types.is_dictionary(table.schema.field("stimulus_type").type)
+        assert table.column("trial_number").to_pylist() == list(range(1, 26))
+        assert table.column("stimulus_type").to_pylist()[:2] == ["siren", "red"]
+
+    def test_export_session_arrow(self, client, operator_token, db, test_operator):
+        """Test Arrow IPC export keeps DECIMAL temperatures numeric"""
+        import io
+        import pyarrow as pa
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Arrow Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="ARROW-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="tympanic"
+        )
+        db.add(session)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        client.post(
+            f"/api/v1/mobile/sessions/{session.id}/tympani-readings/batch",
+            headers=headers,
+            json={"readings": [
+                {"temperature": 36.55, "reading_number": 1, "environment_temp": 24.5},
+                {"temperature": 37.1, "reading_number": 2}
+            ]}
+        )
+        
+        response = client.get(f"/api/v1/export/sessions/{session.id}/export.arrow", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/vnd.apache.arrow.file"
+        assert response.headers["content-disposition"].endswith(".arrow")
+        
+        table = pa.ipc.open_file(io.BytesIO(response.content)).read_all()
+        assert table.column("temperature_c").type == pa.float64()
+        assert table.column("temperature_c").to_pylist() == [36.55, 37.1]
+        assert table.column("environment_temp_c").to_pylist() == [24.5, None]
+        
+        response = client.get(f"/api/v1/export/sessions/{session.id}/export.xlsx", headers=headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_export_raw_data_zip(self, client, admin_token, operator_token, db, test_admin, test_operator):
+        """Test the raw-data ZIP holds one CSV per session and a manifest"""
+        import io
+        import json
+        import zipfile
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Zip Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        sessions = {}
+        for code, test_type in (("ZIP-RT", "reaction_time"), ("ZIP-TYM", "tympanic"), ("ZIP-MIX", "combined")):
+            sessions[code] = Session(
+                session_code=code,
+                operator_id=test_operator.id,
+                respondent_id=respondent.id,
+                test_type=test_type,
+                status="completed"
+            )
+            db.add(sessions[code])
+        db.commit()
+        
+        operator_headers = {"Authorization": f"Bearer {operator_token}"}
+        client.post(
+            f"/api/v1/mobile/sessions/{sessions['ZIP-RT'].id}/trials/batch",
+            headers=operator_headers,
+            json={"trials": [
+                {"stimulus_type": "red", "stimulus_category": "led", "response_time": 150 + number, "trial_number": number}
+                for number in range(1, 4)
+            ]}
+        )
+        client.post(
+            f"/api/v1/mobile/sessions/{sessions['ZIP-TYM'].id}/tympani-readings/batch",
+            headers=operator_headers,
+            json={"readings": [{"temperature": 36.6, "reading_number": 1}]}
+        )
+        
+        today = date.today()
+        response = client.get(
+            "/api/v1/admin/export/raw-data.zip",
+            params={"start_date": str(today), "end_date": str(today + timedelta(days=1))},
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/zip"
+        
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == ["manifest.json", "reaction_time/ZIP-RT.csv", "tympanic/ZIP-TYM.csv"]
+        
+        lines = archive.read("reaction_time/ZIP-RT.csv").decode().splitlines()
+        assert lines[0].startswith("Trial Number")
+        assert lines[-1].startswith("3,red,led,153")
+        
+        manifest = {entry["session_code"]: entry for entry in json.loads(archive.read("manifest.json"))["sessions"]}
+        assert manifest["ZIP-RT"]["rows"] == 3
+        assert manifest["ZIP-TYM"] == {**manifest["ZIP-TYM"], "file": "tympanic/ZIP-TYM.csv", "rows": 1}
+        assert manifest["ZIP-MIX"]["file"] is None
+
+    def test_completed_session_export_cached(self, client, operator_token, db, test_operator, export_cache):
+        """Test a completed session's export is revalidated by ETag and served from the cache"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Cache Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="CACHE-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time"
+        )
+        db.add(session)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        client.post(
+            f"/api/v1/mobile/sessions/{session.id}/trials/batch",
+            headers=headers,
+            json={"trials": [
+                {"stimulus_type": "red", "stimulus_category": "led", "response_time": 200 + number, "trial_number": number}
+                for number in range(1, 6)
+            ]}
+        )
+        url = f"/api/v1/export/sessions/{session.id}/export.csv"
+        
+        # Still active: streamed every time, without validators
+        response = client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert "etag" not in response.headers
+        
+        session.status = "completed"
+        db.commit()
+        
+        first = client.get(url, headers=headers)
+        assert first.status_code == status.HTTP_200_OK
+        assert first.headers["etag"].startswith('"')
+        assert "last-modified" in first.headers
+        assert export_cache.stats()["files"] == 1
+        
+        second = client.get(url, headers=headers)
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.headers["accept-ranges"] == "bytes"
+        assert export_cache.stats()["hits"] == 1
+        
+        response = client.get(url, headers={**headers, "If-None-Match": first.headers["etag"]})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        
+        parquet = client.get(f"/api/v1/export/sessions/{session.id}/export.parquet", headers=headers)
+        assert parquet.headers["etag"] != first.headers["etag"]
+        assert export_cache.stats()["files"] == 2
+
+    def test_export_cache_evicts_least_recently_used(self, tmp_path):
+        """Test the export cache stays under its size cap"""
+        from app.services.export_cache import ExportCache
+        
+        async def chunks(size):
+            for _ in range(size // 100):
+                yield b"x" * 100
+        
+        async def fill(key):
+            return [chunk async for chunk in cache.fill(key, "csv", chunks(400))]
+        
+        cache = ExportCache(str(tmp_path), 1000)
+        asyncio.run(fill("a"))
+        asyncio.run(fill("b"))
+        assert cache.get("a", "csv") is not None
+        asyncio.run(fill("c"))
+        
+        assert cache.get("b", "csv") is None
+        assert cache.get("a", "csv") is not None
+        assert cache.get("c", "csv") is not None
+        assert cache.stats() == {**cache.stats(), "files": 2, "bytes": 800, "evictions": 1}
+        assert sorted(os.listdir(tmp_path)) == ["a.csv", "c.csv"]
+        
+        # A restarted process picks up the files already on disk
+        assert ExportCache(str(tmp_path), 1000).stats()["bytes"] == 800
+
+    def test_export_cache_removes_abandoned_partial_files(self, tmp_path):
+        """Test partial files left by a crashed fill are deleted when the cache loads"""
+        from app.services.export_cache import STALE_PART_SECONDS, ExportCache
+        
+        abandoned, filling = tmp_path / "a.csv.1.part", tmp_path / "b.csv.2.part"
+        abandoned.write_bytes(b"x" * 100)
+        filling.write_bytes(b"x" * 100)
+        stale = time.time() - STALE_PART_SECONDS - 60
+        os.utime(abandoned, (stale, stale))
+        
+        assert ExportCache(str(tmp_path), 1000).stats()["files"] == 0
+        assert sorted(os.listdir(tmp_path)) == ["b.csv.2.part"]
@@ -0,0 +1,125 @@
+import io
+import time
+import zipfile
+import pytest
+from fastapi import status
+from datetime import date, timedelta
+
+def wait_for_job(client, headers, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/admin/export-jobs/{job_id}", headers=headers).json()
+        if job["status"] not in ("pending", "running"):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"export job {job_id} did not finish")
+
+class TestExportJobs:
+    def test_export_job_lifecycle(self, client, admin_token, operator_token, db, test_operator, export_job_runner):
+        """Test a job is deduplicated, reports progress and serves byte ranges"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Job Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="JOB-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="completed"
+        )
+        db.add(session)
+        db.commit()
+        
+        client.post(
+            f"/api/v1/mobile/sessions/{session.id}/trials/batch",
+            headers={"Authorization": f"Bearer {operator_token}"},
+            json={"trials": [
+                {"stimulus_type": "red", "stimulus_category": "led", "response_time": 150 + number, "trial_number": number}
+                for number in range(1, 41)
+            ]}
+        )
+        
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        today = date.today()
+        request = {"kind": "raw-data.zip", "start_date": str(today), "end_date": str(today + timedelta(days=1))}
+        
+        created = client.post("/api/v1/admin/export-jobs", headers=headers, json=request)
+        assert created.status_code == status.HTTP_202_ACCEPTED
+        job_id = created.json()["id"]
+        
+        # The same request joins the existing job
+        repeated = client.post("/api/v1/admin/export-jobs", headers=headers, json=request)
+        assert repeated.status_code == status.HTTP_200_OK
+        assert repeated.json()["id"] == job_id
+        
+        job = wait_for_job(client, headers, job_id)
+        assert job["status"] == "completed", job["error"]
+        assert job["rows_total"] == 40
+        assert job["rows_processed"] == 40
+        assert job["progress"] == 1.0
+        
+        url = f"/api/v1/admin/export-jobs/{job_id}/download"
+        full = client.get(url, headers=headers)
+        assert full.status_code == status.HTTP_200_OK
+        assert full.headers["accept-ranges"] == "bytes"
+        assert len(full.content) == job["file_size"]
+        archive = zipfile.ZipFile(io.BytesIO(full.content))
+        assert "reaction_time/JOB-001.csv" in archive.namelist()
+        
+        partial = client.get(url, headers={**headers, "Range": "bytes=10-19"})
+        assert partial.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert partial.headers["content-range"] == f"bytes 10-19/{job['file_size']}"
+        assert partial.content == full.content[10:20]
+        
+        tail = client.get(url, headers={**headers, "Range": "bytes=-5"})
+        assert tail.content == full.content[-5:]
+        
+        beyond = client.get(url, headers={**headers, "Range": f"bytes={job['file_size']}-"})
+        assert beyond.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+    def test_export_job_belongs_to_requester(self, client, admin_token, operator_token, export_job_runner):
+        """Test other users cannot see or create export jobs"""
+        import uuid
+        
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get(f"/api/v1/admin/export-jobs/{uuid.uuid4()}", headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        
+        response = client.post(
+            "/api/v1/admin/export-jobs",
+            headers={"Authorization": f"Bearer {operator_token}"},
+            json={"kind": "sessions.parquet", "start_date": "2026-01-01", "end_date": "2026-01-31"}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_expired_export_is_gone_and_purged(self, client, admin_token, db, test_admin, export_job_runner, tmp_path):
+        """Test a file past retention is refused before and removed by the periodic purge"""
+        from datetime import datetime, timezone
+        from app.database.models import ExportJob, ExportJobKind, ExportJobStatus
+        
+        path = tmp_path / "expired.zip"
+        path.write_bytes(b"stale")
+        job = ExportJob(
+            requested_by=test_admin.id,
+            kind=ExportJobKind.RAW_DATA_ZIP,
+            params={"start_date": "2026-01-01", "end_date": "2026-01-31", "operator_id": None, "test_type": None},
+            params_hash="expired",
+            status=ExportJobStatus.COMPLETED,
+            rows_processed=0,
+            file_path=str(path),
+            finished_at=datetime.now(timezone.utc) - timedelta(days=30)
+        )
+        db.add(job)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get(f"/api/v1/admin/export-jobs/{job.id}/download", headers=headers)
+        assert response.status_code == status.HTTP_410_GONE
+        
+        assert export_job_runner.purge_expired(db) == [str(path)]
+        assert not path.exists()
+        db.refresh(job)
+        assert job.status == ExportJobStatus.EXPIRED
@@ -0,0 +1,75 @@
+import pytest
+from datetime import date, datetime, timezone
+from sqlalchemy import text
+from app.database.partitions import create_partitions, drop_partitions_before, month_start, partition_name
+
+class TestPartitions:
+    def test_month_start(self):
+        """Test month arithmetic across year boundaries"""
+        assert month_start(date(2026, 12, 31), 1) == date(2027, 1, 1)
+        assert month_start(date(2026, 1, 15), -1) == date(2025, 12, 1)
+        assert partition_name("vital_readings", date(2026, 3, 1)) == "vital_readings_p202603"
+
+    def test_retention_drops_whole_partitions(self, db, test_operator):
+        """Test old months are dropped as partitions and newer readings stay"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Retention Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        session = Session(
+            session_code="RETAIN-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="tympanic"
+        )
+        db.add(session)
+        db.commit()
+        
+        conn = db.connection()
+        created = create_partitions(conn, date(2025, 1, 1), date(2025, 2, 1), tables=["tympani_readings"])
+        assert created == ["tympani_readings_p202501", "tympani_readings_p202502"]
+        
+        for number, month in ((1, 1), (2, 2)):
+            conn.execute(text("""
+                INSERT INTO tympani_readings (id, session_id, temperature, reading_number, reading_time)
+                VALUES (gen_random_uuid(), :session_id, 36.5, :number, :reading_time)
+            """), {"session_id": session.id, "number": number, "reading_time": datetime(2025, month, 10, tzinfo=timezone.utc)})
+        
+        dropped = drop_partitions_before(conn, date(2025, 2, 1), tables=["tympani_readings"])
+        db.commit()
+        
+        assert dropped == ["tympani_readings_p202501"]
+        remaining = db.execute(text("SELECT reading_number FROM tympani_readings")).scalars().all()
+        assert remaining == [2]
+
+    def test_new_partition_takes_rows_from_default(self, db, test_operator):
+        """Test readings that landed in the default partition move into their month's new partition"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Default Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        session = Session(
+            session_code="DEFAULT-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="tympanic"
+        )
+        db.add(session)
+        db.commit()
+        
+        conn = db.connection()
+        create_partitions(conn, date(2024, 1, 1), date(2024, 1, 1), tables=["tympani_readings"])
+        conn.execute(text("""
+            INSERT INTO tympani_readings (id, session_id, temperature, reading_number, reading_time)
+            VALUES (gen_random_uuid(), :session_id, 36.5, 1, :reading_time)
+        """), {"session_id": session.id, "reading_time": datetime(2024, 3, 10, tzinfo=timezone.utc)})
+        
+        created = create_partitions(conn, date(2024, 3, 1), date(2024, 3, 1), tables=["tympani_readings"])
+        db.commit()
+        
+        assert created == ["tympani_readings_p202403"]
+        assert db.execute(text("SELECT count(*) FROM tympani_readings_default")).scalar() == 0
+        assert db.execute(text("SELECT count(*) FROM tympani_readings_p202403")).scalar() == 1
+        assert db.execute(text("SELECT count(*) FROM tympani_readings")).scalar() == 1
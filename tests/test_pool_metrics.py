@@ -0,0 +1,43 @@
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, exc
+from app.database.pool_metrics import InstrumentedQueuePool
+
+class TestPoolMetrics:
+    def test_checkouts_overflow_and_timeouts_are_counted(self, tmp_path):
+        """Test the instrumented pool records waits, overflow events and timeouts"""
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=1,
+            pool_timeout=0.05
+        )
+        first = engine.connect()
+        second = engine.connect()  # beyond pool_size: an overflow connection
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 2
+        assert stats["overflow"] == 1
+        assert stats["checkouts"] == 2
+        assert stats["overflow_events"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["wait_ms_histogram"][-1] == {"le": "+Inf", "count": 2}
+        
+        second.close()
+        first.close()
+        engine.dispose()
+
+    def test_metrics_endpoint_reports_pools(self, client, admin_token):
+        """Test the internal metrics endpoint serves pool statistics"""
+        response = client.get(
+            "/api/v1/internal/metrics",
+            headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        pools = response.json()["db_pools"]
+        assert set(pools) == {"async", "sync"}
+        assert {"checked_out", "overflow_events", "wait_ms_histogram"} <= set(pools["async"])
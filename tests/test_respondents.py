@@ -46,14 +46,19 @@ class TestRespondents:
         """Test getting list of respondents"""
         # Create test respondents first
         from app.database.models import Respondent
+        from datetime import datetime, timedelta, timezone
         
+        # Listings are newest first; rows from one transaction share created_at
+        now = datetime.now(timezone.utc)
         respondent1 = Respondent(
             guest_name="Respondent 1",
-            created_by=test_operator.id
+            created_by=test_operator.id,
+            created_at=now
         )
         respondent2 = Respondent(
             guest_name="Respondent 2", 
-            created_by=test_operator.id
+            created_by=test_operator.id,
+            created_at=now - timedelta(seconds=1)
         )
         
         db.add_all([respondent1, respondent2])
@@ -124,4 +129,28 @@ class TestRespondents:
             headers={"Authorization": f"Bearer {operator_token}"}
         )
         
-        assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_search_respondents(self, client, operator_token, db, test_operator):
+        """Test search matches name substrings and university prefixes"""
+        from app.database.models import Respondent
+        
+        db.add_all([
+            Respondent(guest_name="Budi Santoso", university="Universitas Indonesia", created_by=test_operator.id),
+            Respondent(guest_name="Siti Rahma", university="Institut Teknologi Bandung", created_by=test_operator.id),
+            Respondent(guest_name="Andi 100% Fit", university="Universitas Gadjah Mada", created_by=test_operator.id)
+        ])
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        
+        def names(search):
+            response = client.get("/api/v1/mobile/respondents", headers=headers, params={"search": search})
+            assert response.status_code == status.HTTP_200_OK
+            return sorted(item["guest_name"] for item in response.json())
+        
+        assert names("santo") == ["Budi Santoso"]
+        assert names("institut") == ["Siti Rahma"]
+        assert names("universitas") == ["Andi 100% Fit", "Budi Santoso"]
+        assert names("teknologi") == []  # university matches by prefix only
+        assert names("0%") == ["Andi 100% Fit"]  # wildcards are literal
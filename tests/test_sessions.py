@@ -245,4 +245,244 @@ class TestSessions:
         
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        assert len(data) == 2
\ No newline at end of file
+        assert len(data) == 2
+
+    def test_get_sessions_cursor_pagination(self, client, operator_token, db, test_operator):
+        """Test walking the session list with cursors visits every session once"""
+        from app.database.models import Respondent, Session
+        from datetime import datetime, timedelta, timezone
+        
+        respondent = Respondent(
+            guest_name="Cursor Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        # Two sessions share a created_at so the id tie-breaker is exercised
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        for index, offset in enumerate([0, 1, 1, 2, 3]):
+            db.add(Session(
+                session_code=f"CURSOR-{index:03d}",
+                operator_id=test_operator.id,
+                respondent_id=respondent.id,
+                test_type="reaction_time",
+                created_at=base + timedelta(minutes=offset)
+            ))
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        seen, cursor = [], None
+        while True:
+            url = "/api/v1/mobile/sessions?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            response = client.get(url, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(item["created_at"] for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        
+        assert len(seen) == 5
+        assert seen == sorted(seen, reverse=True)
+        
+        response = client.get("/api/v1/mobile/sessions?cursor=not-a-cursor", headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_sessions_fast_path_matches_schema(self, client, operator_token, db, test_operator):
+        """Test the projected orjson listing serializes exactly like SessionResponse"""
+        from app.database.models import Respondent, Session
+        from app.schemas.sessions import SessionResponse
+        from datetime import datetime, timezone
+        
+        respondent = Respondent(guest_name="Fast Path Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        db.add_all([
+            Session(
+                session_code="FAST-001",
+                operator_id=test_operator.id,
+                respondent_id=respondent.id,
+                test_type="reaction_time",
+                device_name="Pixel",
+                started_at=datetime(2026, 1, 1, 8, 30, 0, 123456, tzinfo=timezone.utc)
+            ),
+            Session(
+                session_code="FAST-002",
+                operator_id=test_operator.id,
+                respondent_id=respondent.id,
+                test_type="tympanic",
+                status="completed",
+                trials_completed=12
+            )
+        ])
+        db.commit()
+        
+        response = client.get("/api/v1/mobile/sessions", headers={"Authorization": f"Bearer {operator_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
+        assert "etag" in response.headers
+        
+        expected = {
+            session.session_code: SessionResponse.model_validate(session).model_dump(mode="json")
+            for session in db.query(Session).filter(Session.operator_id == test_operator.id)
+        }
+        listed = {item["session_code"]: item for item in response.json()}
+        assert listed == expected
+        assert listed["FAST-001"]["started_at"] == "2026-01-01T08:30:00.123456Z"
+
+    def test_get_sessions_conditional_and_delta(self, client, operator_token, db, test_operator):
+        """Test unchanged session polls get a 304 and since returns only changes"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Delta Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        sessions = [
+            Session(
+                session_code=f"DELTA-{index:03d}",
+                operator_id=test_operator.id,
+                respondent_id=respondent.id,
+                test_type="reaction_time"
+            )
+            for index in range(3)
+        ]
+        db.add_all(sessions)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        first = client.get("/api/v1/mobile/sessions", headers=headers)
+        assert first.status_code == status.HTTP_200_OK
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+        token = first.headers["x-sync-token"]
+        
+        response = client.get("/api/v1/mobile/sessions", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        
+        # Starting a session restamps it, and with it the listing's ETag
+        client.patch(f"/api/v1/mobile/sessions/{sessions[1].id}/start", headers=headers)
+        response = client.get("/api/v1/mobile/sessions", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etag
+        
+        response = client.get("/api/v1/mobile/sessions", params={"since": token}, headers=headers)
+        assert [item["session_code"] for item in response.json()] == ["DELTA-001"]
+        assert response.json()[0]["status"] == "active"
+        
+        url = f"/api/v1/mobile/sessions/{sessions[1].id}"
+        single = client.get(url, headers=headers)
+        assert client.get(url, headers={**headers, "If-None-Match": single.headers["etag"]}).status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get(url, params={"since": single.headers["x-sync-token"]}, headers=headers).status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get(url, params={"since": token}, headers=headers).status_code == status.HTTP_200_OK
+        assert client.get(url, params={"since": "not-a-token"}, headers=headers).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_sessions_delta_with_out_of_order_commits(self, client, operator_token, db, test_operator):
+        """Test a write committing after a later one still changes the ETag and reaches since"""
+        from sqlalchemy import create_engine, update
+        from sqlalchemy.pool import NullPool
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Order Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        sessions = [
+            Session(
+                session_code=f"ORDER-{index:03d}",
+                operator_id=test_operator.id,
+                respondent_id=respondent.id,
+                test_type="reaction_time"
+            )
+            for index in range(2)
+        ]
+        db.add_all(sessions)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        url = "/api/v1/mobile/sessions"
+        token = client.get(url, headers=headers).headers["x-sync-token"]
+        
+        # Two connections of their own: the test engine shares one
+        engine = create_engine(db.get_bind().url, poolclass=NullPool)
+        early, late = engine.connect(), engine.connect()
+        try:
+            # The early transaction writes first and commits last
+            early_transaction = early.begin()
+            early.execute(update(Session).where(Session.id == sessions[0].id).values(trials_completed=1))
+            with late.begin():
+                late.execute(update(Session).where(Session.id == sessions[1].id).values(trials_completed=1))
+            
+            delta = client.get(url, params={"since": token}, headers=headers)
+            assert [item["session_code"] for item in delta.json()] == ["ORDER-001"]
+            poll = client.get(url, headers=headers)
+            etag, token = poll.headers["etag"], poll.headers["x-sync-token"]
+            watermark = max(item["updated_at"] for item in poll.json())
+            
+            early_transaction.commit()
+        finally:
+            early.close()
+            late.close()
+            engine.dispose()
+        
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        
+        delta = client.get(url, params={"since": token}, headers=headers)
+        assert [item["session_code"] for item in delta.json()] == ["ORDER-000"]
+        # Its updated_at is older than what the client had already seen
+        assert delta.json()[0]["updated_at"] < watermark
+
+    def test_get_session_statistics(self, client, operator_token, db, test_operator):
+        """Test reaction-time statistics overall and per stimulus"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(guest_name="Stats Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="STATS-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="active"
+        )
+        db.add(session)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        response = client.get(f"/api/v1/mobile/sessions/{session.id}/statistics", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["overall"]["total_trials"] == 0
+        
+        trials = [
+            {"stimulus_type": "red", "stimulus_category": "led", "response_time": time,
+             "trial_number": number, "reaction_type": "correct"}
+            for number, time in enumerate([100, 200, 300, 400], start=1)
+        ] + [
+            {"stimulus_type": "siren", "stimulus_category": "sound", "response_time": 500,
+             "trial_number": 5, "reaction_type": "timeout"}
+        ]
+        client.post(f"/api/v1/mobile/sessions/{session.id}/trials/batch", headers=headers, json={"trials": trials})
+        
+        response = client.get(f"/api/v1/mobile/sessions/{session.id}/statistics", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        
+        assert data["overall"]["total_trials"] == 5
+        assert data["overall"]["mean_response_time"] == 300
+        assert data["overall"]["median_response_time"] == 300
+        assert data["overall"]["correct"] == 4
+        assert data["overall"]["timeout"] == 1
+        
+        red = data["by_stimulus"]["red"]
+        assert red["total_trials"] == 4
+        assert red["min_response_time"] == 100
+        assert red["max_response_time"] == 400
+        assert red["p90_response_time"] == pytest.approx(370)
+        assert red["std_deviation"] == pytest.approx(129.0994, rel=1e-4)
+        assert data["by_stimulus"]["siren"]["std_deviation"] is None
+        assert set(data["by_category"]) == {"led", "sound"}
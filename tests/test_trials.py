@@ -158,4 +158,315 @@ class TestTrials:
             json=trials_data
         )
         
-        assert response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_reaction_trials_batches_accumulate(self, client, operator_token, db, test_operator):
+        """Test consecutive batches are all stored and counted"""
+        from app.database.models import Respondent, Session, ReactionTrial
+        
+        respondent = Respondent(
+            guest_name="Bulk Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="BULK-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="active"
+        )
+        db.add(session)
+        db.commit()
+        
+        for block in range(3):
+            trials_data = {
+                "trials": [
+                    {
+                        "stimulus_type": "siren",
+                        "stimulus_category": "sound",
+                        "response_time": 200 + number,
+                        "trial_number": block * 50 + number + 1
+                    }
+                    for number in range(50)
+                ]
+            }
+            response = client.post(
+                f"/api/v1/mobile/sessions/{session.id}/trials/batch",
+                headers={"Authorization": f"Bearer {operator_token}"},
+                json=trials_data
+            )
+            assert response.status_code == status.HTTP_200_OK
+        
+        db.refresh(session)
+        assert session.trials_completed == 150
+        assert db.query(ReactionTrial).filter(ReactionTrial.session_id == session.id).count() == 150
+
+    def test_create_tympani_readings_batch(self, client, operator_token, db, test_operator):
+        """Test batch creation of tympanic readings with per-item rejections"""
+        from app.database.models import Respondent, Session, TympaniReading
+        
+        respondent = Respondent(
+            guest_name="Tympanic Batch Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="TYMP-BATCH-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="tympanic"
+        )
+        db.add(session)
+        db.commit()
+        
+        readings_data = {
+            "readings": [
+                {"temperature": 36.5, "reading_number": 1, "measurement_phase": "baseline"},
+                {"temperature": 36.6, "reading_number": 2, "measurement_phase": "baseline"},
+                {"temperature": 36.7, "reading_number": 2, "measurement_phase": "baseline"},
+                {"temperature": 36.8, "reading_number": 0, "measurement_phase": "baseline"}
+            ]
+        }
+        
+        response = client.post(
+            f"/api/v1/mobile/sessions/{session.id}/tympani-readings/batch",
+            headers={"Authorization": f"Bearer {operator_token}"},
+            json=readings_data
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["recorded"] == 2
+        assert [item["index"] for item in data["rejected"]] == [2, 3]
+        assert db.query(TympaniReading).filter(TympaniReading.session_id == session.id).count() == 2
+
+    def test_create_vital_readings_batch(self, client, operator_token, db, test_operator):
+        """Test batch creation of vital readings"""
+        from app.database.models import Respondent, Session, VitalReading
+        
+        respondent = Respondent(
+            guest_name="Vital Batch Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="VITAL-BATCH-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="vitals"
+        )
+        db.add(session)
+        db.commit()
+        
+        readings_data = {
+            "readings": [
+                {
+                    "heart_rate": 70 + number,
+                    "heart_rate_variability": 45.0,
+                    "spo2": 98,
+                    "reading_number": number + 1,
+                    "activity_context": "resting"
+                }
+                for number in range(60)
+            ]
+        }
+        
+        response = client.post(
+            f"/api/v1/mobile/sessions/{session.id}/vital-readings/batch",
+            headers={"Authorization": f"Bearer {operator_token}"},
+            json=readings_data
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["recorded"] == 60
+        assert data["rejected"] == []
+        assert db.query(VitalReading).filter(VitalReading.session_id == session.id).count() == 60
+
+    def test_batch_retry_is_idempotent(self, client, operator_token, db, test_operator):
+        """Test a retried batch_id and overlapping re-sent trials are not stored twice"""
+        from app.database.models import Respondent, Session, ReactionTrial
+        
+        respondent = Respondent(
+            guest_name="Retry Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="RETRY-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="active"
+        )
+        db.add(session)
+        db.commit()
+        
+        def trials(numbers):
+            return [
+                {"stimulus_type": "red", "stimulus_category": "led", "response_time": 180, "trial_number": number}
+                for number in numbers
+            ]
+        
+        url = f"/api/v1/mobile/sessions/{session.id}/trials/batch"
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        batch = {"batch_id": str(uuid.uuid4()), "trials": trials(range(1, 11))}
+        
+        first = client.post(url, headers=headers, json=batch).json()
+        retry = client.post(url, headers=headers, json=batch).json()
+        assert (first["recorded"], first["replayed"]) == (10, False)
+        assert (retry["recorded"], retry["replayed"]) == (10, True)
+        
+        # Resumed upload without a batch_id that re-sends trials 6-10
+        overlap = client.post(url, headers=headers, json={"trials": trials(range(6, 16))}).json()
+        assert overlap["recorded"] == 5
+        assert overlap["duplicates"] == 5
+        
+        db.refresh(session)
+        assert session.trials_completed == 15
+        assert db.query(ReactionTrial).filter(ReactionTrial.session_id == session.id).count() == 15
+        
+        # The same batch_id cannot be reused for another stream
+        response = client.post(
+            f"/api/v1/mobile/sessions/{session.id}/vital-readings/batch",
+            headers=headers,
+            json={"batch_id": batch["batch_id"], "readings": [{"heart_rate": 70, "heart_rate_variability": 42.0, "spo2": 98, "reading_number": 1}]}
+        )
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+    def test_get_sync_state(self, client, operator_token, db, test_operator):
+        """Test the sync state reports the highest stored number per stream"""
+        from app.database.models import Respondent, Session
+        
+        respondent = Respondent(
+            guest_name="Sync State Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="SYNC-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="tympanic"
+        )
+        db.add(session)
+        db.commit()
+        
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        client.post(
+            f"/api/v1/mobile/sessions/{session.id}/tympani-readings/batch",
+            headers=headers,
+            json={"readings": [
+                {"temperature": 36.5, "reading_number": number, "measurement_phase": "baseline"}
+                for number in (1, 2, 4)
+            ]}
+        )
+        
+        response = client.get(f"/api/v1/mobile/sessions/{session.id}/sync-state", headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["high_water_marks"] == {"reaction_trials": 0, "tympani_readings": 4, "vital_readings": 0}
+
+    def test_reading_retry_without_reading_time_is_skipped(self, client, operator_token, db, test_operator):
+        """Test a resent reading stamped with the arrival time is not stored twice"""
+        from app.database.models import Respondent, Session, VitalReading
+        
+        respondent = Respondent(
+            guest_name="Vital Retry Test",
+            created_by=test_operator.id
+        )
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="VITAL-RETRY-001",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="vitals"
+        )
+        db.add(session)
+        db.commit()
+        
+        url = f"/api/v1/mobile/sessions/{session.id}/vital-readings/batch"
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        readings = {"readings": [
+            {"heart_rate": 70 + number, "heart_rate_variability": 40.0, "spo2": 98, "reading_number": number}
+            for number in (1, 2)
+        ]}
+        
+        assert client.post(url, headers=headers, json=readings).json()["recorded"] == 2
+        retry = client.post(url, headers=headers, json=readings).json()
+        
+        assert retry["recorded"] == 0
+        assert retry["duplicates"] == 2
+        assert db.query(VitalReading).filter(VitalReading.session_id == session.id).count() == 2
+        db.refresh(session)
+        assert session.readings_first_at <= session.readings_last_at
+
+    def test_running_statistics_match_raw_trials(self, client, operator_token, db, test_operator):
+        """Test batches are merged into session_stimulus_stats exactly once and verify/rebuild agree"""
+        import random
+        from app.database.models import Respondent, Session, SessionStimulusStats
+        from app.services.stimulus_stats import rebuild, verify
+        
+        respondent = Respondent(guest_name="Running Stats Test", created_by=test_operator.id)
+        db.add(respondent)
+        db.commit()
+        
+        session = Session(
+            session_code="STATS-002",
+            operator_id=test_operator.id,
+            respondent_id=respondent.id,
+            test_type="reaction_time",
+            status="active"
+        )
+        db.add(session)
+        db.commit()
+        
+        rng = random.Random(7)
+        stimuli = [("red", "led"), ("blue", "led"), ("siren", "sound")]
+        def trials(numbers):
+            return [
+                {"stimulus_type": stimuli[number % 3][0], "stimulus_category": stimuli[number % 3][1],
+                 "response_time": rng.randint(150, 900), "trial_number": number,
+                 "reaction_type": rng.choice(["correct", "incorrect", "timeout"])}
+                for number in numbers
+            ]
+        
+        url = f"/api/v1/mobile/sessions/{session.id}/trials/batch"
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        for start in range(1, 61, 20):
+            client.post(url, headers=headers, json={"trials": trials(range(start, start + 20))})
+        # Re-sent trials must not be merged a second time
+        client.post(url, headers=headers, json={"trials": trials(range(41, 61))})
+        
+        assert verify(db.connection(), [session.id]) == []
+        db.rollback()
+        
+        running = client.get(f"{url.rsplit('/trials', 1)[0]}/statistics", headers=headers,
+                             params={"percentiles": "false"}).json()
+        assert running["overall"]["total_trials"] == 60
+        assert running["overall"]["median_response_time"] is None
+        assert sum(stats["total_trials"] for stats in running["by_stimulus"].values()) == 60
+        
+        # Drift is detected and repaired from the raw trials
+        summary = db.query(SessionStimulusStats).filter(SessionStimulusStats.session_id == session.id).first()
+        summary.trial_count += 1
+        db.commit()
+        conn = db.connection()
+        assert verify(conn, [session.id]) == [session.id]
+        assert rebuild(conn, [session.id]) == 3
+        assert verify(conn, [session.id]) == []
+        db.commit()
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import uuid
+import pytest
+from fastapi import status
+from starlette.websockets import WebSocketDisconnect
+
+class FakeSocket:
+    """Stands in for a WebSocket; ``delay`` None never completes a send"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.received = []
+        self.closed_with = None
+    
+    async def accept(self):
+        pass
+    
+    async def send_text(self, text):
+        if self.delay is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.delay)
+        self.received.append(json.loads(text))
+    
+    async def close(self, code):
+        self.closed_with = code
+
+def create_sessions(db, operator, codes):
+    from app.database.models import Respondent, Session
+    
+    respondent = Respondent(guest_name="Live Test", created_by=operator.id)
+    db.add(respondent)
+    db.commit()
+    
+    sessions = [
+        Session(session_code=code, operator_id=operator.id, respondent_id=respondent.id, test_type="reaction_time")
+        for code in codes
+    ]
+    db.add_all(sessions)
+    db.commit()
+    return sessions
+
+class TestLiveChannel:
+    def test_rejects_missing_or_invalid_token(self, client):
+        """Test the live channel only accepts authenticated connections"""
+        for url in ("/api/v1/ws", "/api/v1/ws?token=not-a-token"):
+            with pytest.raises(WebSocketDisconnect) as closed:
+                with client.websocket_connect(url) as websocket:
+                    websocket.receive_text()
+            assert closed.value.code == status.WS_1008_POLICY_VIOLATION
+
+    def test_trials_published_to_session_room(self, client, admin_token, operator_token, db, test_operator):
+        """Test ingest reaches the subscribers of its session and no one else"""
+        from app.api.v1.websocket import manager
+        
+        watched, other = create_sessions(db, test_operator, ["LIVE-001", "LIVE-002"])
+        headers = {"Authorization": f"Bearer {operator_token}"}
+        
+        with client.websocket_connect(f"/api/v1/ws?token={admin_token}") as websocket:
+            websocket.send_json({"action": "subscribe", "session_id": str(watched.id)})
+            assert websocket.receive_json() == {"type": "subscribed", "session_id": str(watched.id)}
+            websocket.send_json({"action": "subscribe", "session_id": "00000000-0000-0000-0000-000000000000"})
+            assert websocket.receive_json()["type"] == "error"
+            
+            client.post(
+                f"/api/v1/mobile/sessions/{other.id}/trials/batch",
+                headers=headers,
+                json={"trials": [{"stimulus_type": "red", "stimulus_category": "led", "response_time": 180, "trial_number": 1}]}
+            )
+            client.post(
+                f"/api/v1/mobile/sessions/{watched.id}/trials/batch",
+                headers=headers,
+                json={"trials": [
+                    {"stimulus_type": "blue", "stimulus_category": "led", "response_time": 200 + number, "trial_number": number}
+                    for number in (1, 2)
+                ]}
+            )
+            message = websocket.receive_json()
+            assert message["type"] == "trial_data"
+            assert message["session_id"] == str(watched.id)
+            assert [item["trial_number"] for item in message["items"]] == [1, 2]
+            
+            # Only stored rows go out: not the duplicate, not the rejected item
+            client.post(
+                f"/api/v1/mobile/sessions/{watched.id}/trials/batch",
+                headers=headers,
+                json={"trials": [
+                    {"stimulus_type": "blue", "stimulus_category": "led", "response_time": 210, "trial_number": number}
+                    for number in (2, 3, 0)
+                ]}
+            )
+            message = websocket.receive_json()
+            assert [item["trial_number"] for item in message["items"]] == [3]
+            assert message["items"][0]["id"]
+            
+            client.post(
+                f"/api/v1/mobile/sessions/{watched.id}/tympani-readings",
+                headers=headers,
+                json={"temperature": 36.55, "reading_number": 1}
+            )
+            message = websocket.receive_json()
+            assert (message["stream"], message["items"][0]["temperature"]) == ("tympani_readings", 36.55)
+            client.post(
+                f"/api/v1/mobile/sessions/{watched.id}/tympani-readings",
+                headers=headers,
+                json={"temperature": 36.55, "reading_number": 1}
+            )
+            
+            client.patch(f"/api/v1/mobile/sessions/{watched.id}/start", headers=headers)
+            message = websocket.receive_json()
+            assert (message["type"], message["update_type"]) == ("session_update", "started")
+            
+            websocket.send_json({"action": "unsubscribe", "session_id": str(watched.id)})
+            assert websocket.receive_json()["type"] == "unsubscribed"
+            assert not manager.has_subscribers(watched.id)
+        
+        assert not manager.active_connections
+
+    def test_fan_out_isolates_stalled_subscribers(self):
+        """Test 1,000 subscribers get every message while stalled ones are closed"""
+        from app.api.v1.websocket import ConnectionManager
+        
+        async def scenario():
+            manager = ConnectionManager(queue_size=64, send_timeout=0.2)
+            session_id = uuid.uuid4()
+            sockets = [FakeSocket(None if index % 100 == 0 else 0.0) for index in range(1000)]
+            for socket in sockets:
+                await manager.connect(socket)
+                manager.subscribe(socket, session_id)
+            
+            fast = [socket for socket in sockets if socket.delay is not None]
+            stalled = [socket for socket in sockets if socket.delay is None]
+            stalled_senders = [manager.active_connections[socket].sender for socket in stalled]
+            
+            # Publishing never waits on a socket: each message is queued for
+            # every subscriber before any sender has run
+            assert [manager.broadcast(session_id, {"number": number}) for number in range(20)] == [1000] * 20
+            assert manager.stats() == {**manager.stats(), "queued": 1000 * 20, "dropped": 0, "sent": 0}
+            
+            async def drained():
+                while manager.sent < 990 * 20:
+                    await asyncio.sleep(0.01)
+            
+            await asyncio.wait_for(asyncio.gather(drained(), *stalled_senders), 10)
+            
+            assert all([message["number"] for message in socket.received] == list(range(20)) for socket in fast)
+            assert all(socket.closed_with == status.WS_1013_TRY_AGAIN_LATER and not socket.received for socket in stalled)
+            assert manager.stats() == {
+                **manager.stats(), "connections": 990, "queued": 0, "dropped": 0, "stalled": 10, "sent": 990 * 20
+            }
+            for socket in fast:
+                manager.disconnect(socket)
+        
+        asyncio.run(scenario())
+
+    def test_full_queue_drops_oldest_and_coalesces_status(self):
+        """Test a lagging socket is told what it missed and gets only the latest status"""
+        from app.api.v1.websocket import ConnectionManager, LiveConnection
+        
+        async def scenario():
+            manager = ConnectionManager(queue_size=8, send_timeout=1.0)
+            session_id, socket = uuid.uuid4(), FakeSocket()
+            # Queue before the sender starts, as if the socket had fallen behind
+            connection = LiveConnection(socket, manager)
+            manager.active_connections[socket] = connection
+            manager.subscriptions[socket] = set()
+            manager.subscribe(socket, session_id)
+            
+            for number in range(10):
+                manager.broadcast(session_id, {"type": "trial_data", "number": number})
+            for update in ("started", "paused", "completed"):
+                manager.broadcast(session_id, {"type": "session_update", "update_type": update}, ("status", session_id))
+            
+            connection.sender = asyncio.create_task(connection.run())
+            await asyncio.sleep(0.05)
+            manager.disconnect(socket)
+            
+            messages = socket.received
+            assert messages[0] == {"type": "dropped", "count": 3}
+            assert [message.get("number") for message in messages[1:-1]] == list(range(3, 10))
+            assert messages[-1] == {"type": "session_update", "update_type": "completed"}
+            assert (manager.dropped, manager.coalesced) == (3, 2)
+        
+        asyncio.run(scenario())